@@ -0,0 +1,76 @@
+"""Throughput of `pmb convert` when every identifier is in the local map.
+
+Usage:
+    python -m benchmarks.bench_convert [--rows 100000 1000000]
+
+A temporary cache is filled with synthetic PMID/PMCID/DOI triples, then an
+input list of the same size, mixing the three kinds, is converted offline as
+`pmb convert` does: identified, resolved from the map and written as TSV to a
+sink that discards the output. Each stage is timed on its own.
+"""
+
+import argparse
+import io
+import tempfile
+import time
+from pathlib import Path
+
+from pmbuddy.cache import ArticleCache
+from pmbuddy.cache.ids import IdentifierMap, Identifiers, identify_all
+from pmbuddy.util.output import ArticleWriter
+
+
+def synthetic_ids(n: int):
+    return [
+        Identifiers(
+            str(10_000_000 + i), f"PMC{20_000_000 + i}", f"10.1000/Bench.{i:08d}"
+        )
+        for i in range(n)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000])
+    args = parser.parse_args()
+
+    for n in args.rows:
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = ArticleCache(Path(tmp) / "cache.sqlite3")
+            id_map = IdentifierMap(cache)
+            records = synthetic_ids(n)
+            start = time.perf_counter()
+            id_map.add(records)
+            fill = time.perf_counter() - start
+            lines = [f"{r[i % 3]}\n" for i, r in enumerate(records)]
+
+            timings = {}
+            start = time.perf_counter()
+            identified = identify_all(lines)
+            timings["identify"] = time.perf_counter() - start
+            start = time.perf_counter()
+            resolved = id_map.resolve(identified, offline=True)
+            timings["resolve"] = time.perf_counter() - start
+            start = time.perf_counter()
+            writer = ArticleWriter(
+                io.StringIO(), "tsv", fields=["input", "pmid", "pmcid", "doi"]
+            )
+            writer.flush = False
+            for pair in identified:
+                pmid, pmcid, doi = resolved[pair]
+                writer.write_row(
+                    {"input": pair[1], "pmid": pmid, "pmcid": pmcid, "doi": doi}
+                )
+            timings["write"] = time.perf_counter() - start
+            cache.close()
+
+        total = sum(timings.values())
+        stages = ", ".join(f"{k} {v:.2f}s" for k, v in timings.items())
+        print(
+            f"{n:>9} ids: {total:.2f}s ({n / total:,.0f} ids/s; {stages}); "
+            f"map filled in {fill:.2f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Render time of the article table at 100, 1k and 10k rows.
+
+Usage:
+    python -m benchmarks.bench_display [--rows 100 1000 10000] [--repeat 3]
+
+Compares the previous per-row implementation (`apply` + `iterrows`) with the
+vectorized one. "build" is the time to format authors and fill the Rich table,
+"render" adds laying out every row, and "page" renders only the first page as
+the paginated renderer does. Output goes to an in-memory console.
+"""
+
+import argparse
+import io
+import time
+
+import pandas as pd
+from rich import box
+from rich.console import Console
+from rich.table import Table
+
+from pmbuddy.config import CONFIG
+from pmbuddy.util import format_name
+from pmbuddy.util.display import build_table, display_table, format_authors
+
+SUBSET = ["pmid", "title", "authors", "journal"]
+
+
+def legacy_build_table(df, subset) -> Table:
+    df["authors"] = df["authors"].apply(
+        lambda names: ", ".join(map(format_name, names))
+    )
+    table = Table(title="PubMed Articles", box=box.SIMPLE_HEAVY, expand=True)
+    table.add_column(justify="center")
+    df = df[subset]
+    for col in df.columns:
+        table.add_column(col, justify="left")
+    for idx, row in df.iterrows():
+        pmid, title, authors, journal, *remaining = row.values
+        table.add_row(
+            str(idx + 1),
+            f"[cyan link={CONFIG['urls']['PMID_ROOT']}/{pmid}]{pmid}",
+            f"[b]{title}",
+            authors,
+            f"[i]{journal}",
+        )
+    return table
+
+
+def vectorized_build_table(df, subset) -> Table:
+    return build_table(df.assign(authors=format_authors(df["authors"])), subset)
+
+
+def first_page(df, subset, console) -> None:
+    display_table(df.iloc[: CONFIG["display"]["page_size"]], subset, console)
+
+
+def frame(n: int) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "pmid": [str(30_000_000 + i) for i in range(n)],
+            "title": [
+                f"Synthetic article number {i} about retinal cells" for i in range(n)
+            ],
+            "authors": [
+                [f"Author{j} Middle Surname{i}" for j in range(8)] for i in range(n)
+            ],
+            "journal": ["Nat Commun" if i % 2 else "Cell Rep" for i in range(n)],
+        }
+    )
+
+
+def timed(render, df, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        console = Console(file=io.StringIO(), width=160)
+        data = df.copy()
+        start = time.perf_counter()
+        render(data, SUBSET, console)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    header = ["legacy build", "build", "legacy render", "render", "page"]
+    print(f"{'rows':<8}" + "".join(f"{h:>15}" for h in header))
+    for n in args.rows:
+        df = frame(n)
+        timings = [
+            timed(lambda d, s, c: legacy_build_table(d, s), df, args.repeat),
+            timed(lambda d, s, c: vectorized_build_table(d, s), df, args.repeat),
+            timed(lambda d, s, c: c.print(legacy_build_table(d, s)), df, args.repeat),
+            timed(lambda d, s, c: display_table(d, s, c, page_rows=n), df, args.repeat),
+            timed(first_page, df, args.repeat),
+        ]
+        print(f"{n:<8}" + "".join(f"{t:>14.3f}s" for t in timings))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Throughput and memory of the streaming exporters.
+
+Usage:
+    python -m benchmarks.bench_export [--rows 10000 100000] [--formats ...]
+
+Synthetic articles are copied from the fixture efetch response with distinct
+PMIDs and written with `ArticleWriter` to a sink that only counts bytes, once
+uncompressed and once through gzip, as `pmb --format F [--gzip]` does. The
+articles are built before timing starts, so the numbers cover formatting,
+escaping and compression. Peak memory is what tracemalloc sees allocated
+while writing; it should not grow with the number of rows.
+"""
+
+import argparse
+import io
+import time
+import tracemalloc
+from pathlib import Path
+from typing import List
+
+from pmbuddy.models import PubmedArticle
+from pmbuddy.parsers import EutilsParser
+from pmbuddy.util.output import FORMATS, ArticleWriter, gzip_text
+
+FIXTURES = Path(__file__).parents[1] / "tests" / "fixtures"
+
+
+class CountingSink(io.RawIOBase):
+    """A binary stream that discards what is written and counts the bytes."""
+
+    def __init__(self) -> None:
+        self.bytes = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.bytes += len(data)
+        return len(data)
+
+
+def synthetic_articles(n: int) -> List[PubmedArticle]:
+    templates = EutilsParser().parse_efetch(
+        (FIXTURES / "efetch_pubmed.xml").read_bytes()
+    )
+    return [
+        templates[i % len(templates)].model_copy(
+            update={"pmid": str(10_000_000 + i), "pmcid": f"PMC{20_000_000 + i}"}
+        )
+        for i in range(n)
+    ]
+
+
+def export(articles: List[PubmedArticle], format: str, compress: bool) -> int:
+    """Write `articles` like the CLI does; returns the bytes written."""
+    sink = CountingSink()
+    buffered = io.BufferedWriter(sink)
+    if compress:
+        handle = gzip_text(buffered)
+    else:
+        handle = io.TextIOWrapper(buffered, encoding="utf-8")
+    # Like stdout redirected to a file: flushed by the buffer, not per record.
+    writer = ArticleWriter(handle, format, flush=False)
+    for article in articles:
+        writer.write(article)
+    writer.close()
+    handle.close()
+    return sink.bytes
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--formats", nargs="+", choices=FORMATS, default=FORMATS)
+    args = parser.parse_args()
+
+    for n in args.rows:
+        articles = synthetic_articles(n)
+        print(f"\n{n} articles")
+        print(
+            f"{'format':<16}{'records/s':>12}{'out MB/s':>10}{'size MB':>10}{'peak MB':>10}"
+        )
+        for format in args.formats:
+            for compress in (False, True):
+                start = time.perf_counter()
+                size = export(articles, format, compress)
+                seconds = time.perf_counter() - start
+                tracemalloc.start()
+                export(articles, format, compress)
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                name = format + (" +gzip" if compress else "")
+                print(
+                    f"{name:<16}{n / seconds:>12,.0f}{size / 2**20 / seconds:>10.1f}"
+                    f"{size / 2**20:>10.1f}{peak / 2**20:>10.2f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
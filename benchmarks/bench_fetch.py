@@ -0,0 +1,82 @@
+"""Compare the legacy spider subprocess against the in-process fetch engine.
+
+Usage:
+    python -m benchmarks.bench_fetch --file /path/to/pmids [--repeat 3]
+
+The file must contain at least 100 newline-delimited PMIDs. Both paths hit the
+live PubMed site, so results depend on network conditions. The spider path is
+skipped when Scrapy is not installed.
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List
+
+from pmbuddy.parsers import ArticleParser
+from pmbuddy.util import concat_from_file
+from pmbuddy.util.requests import fetch_articles
+
+SPIDER = Path(__file__).parents[1] / "pmbuddy" / "spider.py"
+SIZES = (1, 10, 100)
+
+
+def has_scrapy() -> bool:
+    try:
+        import scrapy  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def run_spider(pmids: List[str]) -> None:
+    """Legacy path: spawn the Scrapy spider and load its CSV feed."""
+    import pandas as pd
+
+    subprocess.call([sys.executable, str(SPIDER), ",".join(pmids)])
+    pd.read_csv("/tmp/pubmed_data.csv")
+
+
+def run_in_process(pmids: List[str]) -> None:
+    fetch_articles(ArticleParser, pmids)
+
+
+def spider_startup() -> None:
+    """Interpreter launch plus Scrapy/Twisted import, before any request is made."""
+    code = "from scrapy.crawler import CrawlerProcess; CrawlerProcess()"
+    subprocess.call([sys.executable, "-c", code])
+
+
+def timeit(func: Callable, *args, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--file", "-f", required=True, help="newline-delimited PMIDs")
+    parser.add_argument("--repeat", "-r", type=int, default=3)
+    args = parser.parse_args()
+
+    pmids = [p for p in concat_from_file(args.file) if p]
+    spider = has_scrapy()
+    print(f"{'stage':<12}{'spider (s)':>14}{'in-process (s)':>18}")
+    if spider:
+        startup = timeit(spider_startup, repeat=args.repeat)
+        print(f"{'startup':<12}{startup:>14.3f}{0.0:>18.3f}")
+    for n in SIZES:
+        batch = pmids[:n]
+        new = timeit(run_in_process, batch, repeat=args.repeat)
+        old = timeit(run_spider, batch, repeat=args.repeat) if spider else float("nan")
+        print(f"{f'{n} PMIDs':<12}{old:>14.3f}{new:>18.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Microbenchmark of the PubmedParser parsing engines over saved pages.
+
+Usage:
+    python -m benchmarks.bench_parse [--pages DIR] [--repeat 20]
+
+Pages are read from DIR (default: tests/fixtures). Files named pubmed_*.html
+are parsed as PubMed abstract pages and pmc_*.html as PMC article pages.
+Reports the median parse time per document and the peak traced memory of a
+single parse for every available engine.
+"""
+
+import argparse
+import statistics
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, List
+
+from pmbuddy.parsers import PubmedParser
+from pmbuddy.util import ENGINES
+
+FIXTURES = Path(__file__).parents[1] / "tests" / "fixtures"
+
+
+def available_engines() -> List[str]:
+    engines = list(ENGINES)
+    try:
+        import lxml  # noqa: F401
+    except ImportError:
+        engines.remove("lxml")
+    return engines
+
+
+def parse_function(parser: PubmedParser, path: Path) -> Callable[[bytes], object]:
+    if path.name.startswith("pmc_"):
+        return parser.parse_page
+    return parser.parse_overview
+
+
+def bench(engine: str, pages: List[Path], repeat: int):
+    parser = PubmedParser(engine)
+    docs = [(parse_function(parser, p), p.read_bytes()) for p in pages]
+    timings = []
+    for _ in range(repeat):
+        for parse, content in docs:
+            start = time.perf_counter()
+            parse(content)
+            timings.append(time.perf_counter() - start)
+    peak = 0
+    for parse, content in docs:
+        tracemalloc.start()
+        parse(content)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return statistics.median(timings), peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=Path, default=FIXTURES)
+    parser.add_argument("--repeat", "-r", type=int, default=20)
+    args = parser.parse_args()
+
+    pages = sorted(args.pages.glob("pubmed_*.html")) + sorted(
+        args.pages.glob("pmc_*.html")
+    )
+    print(f"{len(pages)} pages from {args.pages}")
+    print(f"{'engine':<14}{'ms/doc':>10}{'peak KiB':>12}")
+    for engine in available_engines():
+        median, peak = bench(engine, pages, args.repeat)
+        print(f"{engine:<14}{median * 1000:>10.2f}{peak / 1024:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
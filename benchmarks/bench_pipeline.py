@@ -0,0 +1,53 @@
+"""Parse throughput of the multiprocess pipeline for increasing worker counts.
+
+Usage:
+    python -m benchmarks.bench_pipeline [--pages DIR] [--copies 200] [--chunk-size 16]
+
+Saved pages from DIR (default: tests/fixtures) are replicated `--copies` times
+and parsed with 1, 2, 4, ... workers up to the number of available cores, so
+no network access is needed.
+"""
+
+import argparse
+import os
+import time
+from pathlib import Path
+
+from pmbuddy.pipeline import PipelineParser
+
+FIXTURES = Path(__file__).parents[1] / "tests" / "fixtures"
+
+
+def worker_counts(limit: int):
+    n = 1
+    while n < limit:
+        yield n
+        n *= 2
+    yield limit
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=Path, default=FIXTURES)
+    parser.add_argument("--copies", type=int, default=200)
+    parser.add_argument("--chunk-size", type=int, default=16)
+    args = parser.parse_args()
+
+    pages = [
+        (path.stem.split("_", 1)[1], path.read_bytes())
+        for path in sorted(args.pages.glob("*.html"))
+    ] * args.copies
+    print(f"{len(pages)} pages, chunk size {args.chunk_size}")
+    print(f"{'workers':<10}{'pages/s':>10}{'speedup':>10}")
+    baseline = None
+    for workers in worker_counts(os.cpu_count() or 1):
+        pipeline = PipelineParser(workers, args.chunk_size)
+        start = time.perf_counter()
+        pipeline.parse_pages(pages)
+        rate = len(pages) / (time.perf_counter() - start)
+        baseline = baseline or rate
+        print(f"{workers:<10}{rate:>10.1f}{rate / baseline:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
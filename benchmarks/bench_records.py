@@ -0,0 +1,154 @@
+"""Memory and throughput of pydantic articles versus columnar record batches.
+
+Usage:
+    python -m benchmarks.bench_records [--rows 10000 100000] [--repeat 3]
+
+Synthetic articles are copied from the fixture efetch response with distinct
+PMIDs. For every size, both representations are measured on the same data:
+
+    build      constructing n articles from their fields
+    load       reading n cached `model_dump_json()` payloads (ArticleCache)
+    flatten    producing the flat dicts written by ArticleWriter
+    serialize  encoding all n articles (JSON; msgpack too when installed)
+    decode     decoding that payload back into the representation
+    memory     bytes allocated while holding the n loaded articles
+
+Times are the best of --repeat runs; memory is measured with tracemalloc.
+"""
+
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+from pmbuddy.models import PubmedArticle
+from pmbuddy.models.records import ArticleBatch, ArticleRecord, require_msgpack
+from pmbuddy.parsers import EutilsParser
+
+FIXTURES = Path(__file__).parents[1] / "tests" / "fixtures"
+
+
+def synthetic_articles(n: int) -> List[PubmedArticle]:
+    templates = EutilsParser().parse_efetch(
+        (FIXTURES / "efetch_pubmed.xml").read_bytes()
+    )
+    return [
+        templates[i % len(templates)].model_copy(
+            update={"pmid": str(10_000_000 + i), "pmcid": f"PMC{20_000_000 + i}"}
+        )
+        for i in range(n)
+    ]
+
+
+def best_of(repeat: int, func: Callable) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def allocated(func: Callable) -> Tuple[object, int]:
+    """Call `func` and return its result with the bytes still held after it."""
+    gc.collect()
+    tracemalloc.start()
+    result = func()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current
+
+
+def msgpack_available() -> bool:
+    try:
+        require_msgpack()
+    except ImportError:
+        return False
+    return True
+
+
+def run(n: int, repeat: int) -> None:
+    articles = synthetic_articles(n)
+    dumps = [a.model_dump_json() for a in articles]
+    records = [ArticleRecord.from_model(a) for a in articles]
+    batch = ArticleBatch.from_records(records)
+    dicts = [a.model_dump() for a in articles]
+
+    rows = []
+
+    def add(stage: str, pydantic: float, batched: float, unit: str = "s") -> None:
+        rows.append((stage, pydantic, batched, unit))
+
+    add(
+        "build",
+        best_of(repeat, lambda: [PubmedArticle(**d) for d in dicts]),
+        best_of(
+            repeat,
+            lambda: ArticleBatch.from_records(ArticleRecord(*r) for r in records),
+        ),
+    )
+    add(
+        "load",
+        best_of(repeat, lambda: [PubmedArticle.model_validate_json(d) for d in dumps]),
+        best_of(repeat, lambda: ArticleBatch.from_dumps(dumps)),
+    )
+    add(
+        "flatten",
+        best_of(repeat, lambda: [a.json() for a in articles]),
+        best_of(repeat, lambda: list(batch.rows())),
+    )
+    # The pydantic side is a JSON array of model dumps for every format, the
+    # form the models serialize to without a custom encoder.
+    payload = "[" + ",".join(dumps) + "]"
+    formats = ["json"] + (["msgpack"] if msgpack_available() else [])
+    for format in formats:
+        encoded = batch.dumps(format)
+        add(
+            f"serialize/{format}",
+            best_of(
+                repeat,
+                lambda: "[" + ",".join(a.model_dump_json() for a in articles) + "]",
+            ),
+            best_of(repeat, lambda: batch.dumps(format)),
+        )
+        add(
+            f"decode/{format}",
+            best_of(
+                repeat,
+                lambda: [PubmedArticle.model_validate(d) for d in json.loads(payload)],
+            ),
+            best_of(repeat, lambda: ArticleBatch.loads(encoded, format)),
+        )
+        add(f"size/{format}", len(payload.encode()), len(encoded), "MB")
+
+    _, models_bytes = allocated(
+        lambda: [PubmedArticle.model_validate_json(d) for d in dumps]
+    )
+    _, batch_bytes = allocated(lambda: ArticleBatch.from_dumps(dumps))
+    add("memory", models_bytes, batch_bytes, "MB")
+
+    print(f"\n{n} articles")
+    print(f"{'stage':<18}{'pydantic':>12}{'records':>12}{'speedup':>10}")
+    for stage, pydantic, batched, unit in rows:
+        if unit == "MB":
+            cells = f"{pydantic / 2**20:>10.1f}MB{batched / 2**20:>10.1f}MB"
+        else:
+            cells = f"{pydantic * 1000:>10.1f}ms{batched * 1000:>10.1f}ms"
+        ratio = pydantic / batched if batched else float("inf")
+        print(f"{stage:<18}{cells}{ratio:>9.1f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--repeat", "-r", type=int, default=3)
+    args = parser.parse_args()
+    for n in args.rows:
+        run(n, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
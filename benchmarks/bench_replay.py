@@ -0,0 +1,337 @@
+"""Offline benchmark of the fetch, parse, model and display stages.
+
+Usage:
+    python -m benchmarks.bench_replay [--corpus DIR] [--requests 200]
+        [--latency 20] [--jitter 10] [--error-rate 0.02] [--concurrency 10]
+        [--engine html.parser] [--json results.json] [--compare baseline.json]
+
+Recorded pages (default: tests/fixtures) are replayed by a local stub server
+(see benchmarks/stub.py) with the given latency in milliseconds and rate of
+503 responses, so runs need no network and are comparable across commits.
+Stages are measured separately:
+
+    fetch     content_from_url, the network half of soup_from_url
+    parse     building the soup (or lxml tree) of each fetched page
+    model     extracting the fields and building the PubmedArticle
+    display   rendering the article table to an in-memory console, per run
+    pipeline  fetch_articles_async end to end, --concurrency at a time
+
+Each stage reports its throughput, p50/p95/p99 latency, failures and the peak
+RSS of the process once it has run. --json saves the results together with the
+commit and settings; --compare prints the change against a saved run and
+exits with status 1 when a stage is slower than --threshold allows.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import httpx
+from pydantic import BaseModel
+from rich.console import Console
+
+from benchmarks.stub import FIXTURES, ReplayServer, load_corpus
+from pmbuddy.cli import to_dataframe
+from pmbuddy.config import CONFIG
+from pmbuddy.parsers import ArticleParser, PubmedParser
+from pmbuddy.util import ENGINES, make_soup, ratelimit
+from pmbuddy.util.display import display_table
+from pmbuddy.util.requests import content_from_url, fetch_articles_async
+
+SUBSET = ["pmid", "title", "authors", "journal"]
+
+
+class StageResult(BaseModel):
+    name: str
+    samples: int
+    errors: int
+    seconds: float
+    throughput: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    peak_rss_mb: Optional[float] = None
+
+
+def percentiles(timings: List[float]) -> Tuple[float, float, float]:
+    """p50, p95 and p99 of `timings` in milliseconds."""
+    if not timings:
+        return (float("nan"),) * 3
+    if len(timings) == 1:
+        return (timings[0] * 1000,) * 3
+    cuts = statistics.quantiles(timings, n=100, method="inclusive")
+    return cuts[49] * 1000, cuts[94] * 1000, cuts[98] * 1000
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process so far, where `resource` exists."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS.
+    return peak / 1024 / (1024 if sys.platform == "darwin" else 1)
+
+
+def summarize(
+    name: str, timings: List[float], errors: int, seconds: float, items: int
+) -> StageResult:
+    p50, p95, p99 = percentiles(timings)
+    return StageResult(
+        name=name,
+        samples=len(timings),
+        errors=errors,
+        seconds=seconds,
+        throughput=items / seconds if seconds else 0.0,
+        p50_ms=p50,
+        p95_ms=p95,
+        p99_ms=p99,
+        peak_rss_mb=peak_rss_mb(),
+    )
+
+
+def measure(
+    name: str, items: Iterable[Any], func: Callable[[Any], Any]
+) -> Tuple[StageResult, List[Any]]:
+    """Time `func` on every item; failures are counted and dropped."""
+    outputs, timings, errors = [], [], 0
+    start = time.perf_counter()
+    for item in items:
+        t0 = time.perf_counter()
+        try:
+            outputs.append(func(item))
+        except (httpx.HTTPError, AttributeError, IndexError):
+            errors += 1
+            continue
+        timings.append(time.perf_counter() - t0)
+    seconds = time.perf_counter() - start
+    return summarize(name, timings, errors, seconds, len(timings)), outputs
+
+
+def locators(n: int, pmc_share: float) -> List[str]:
+    """Synthetic PMIDs, with about `pmc_share` of them replaced by PMCIDs."""
+    ids = []
+    for i in range(n):
+        if int((i + 1) * pmc_share) > int(i * pmc_share):
+            ids.append(f"PMC{9000000 + i}")
+        else:
+            ids.append(str(30000000 + i))
+    return ids
+
+
+def stage_functions(parser: PubmedParser, locator: str) -> Tuple[Callable, Callable]:
+    """Split `parse_page`/`parse_overview` into tree building and extraction."""
+    if locator.startswith("PMC"):
+        engine = "lxml" if parser.engine == "lxml" else "html.parser"
+        return (lambda content: make_soup(content, engine)), parser._parse_soup
+    if parser.engine == "lxml":
+        from pmbuddy.parsers import xpath
+
+        return xpath.parse_html, parser._parse_tree_overview
+    return (
+        lambda content: make_soup(content, parser.engine, root_id="article-page")
+    ), parser._parse_soup_overview
+
+
+class TimedParser:
+    """ArticleParser that records the latency of every article it fetches."""
+
+    def __init__(self) -> None:
+        self.timings: List[float] = []
+
+    async def fetch_article_async(self, locator: str, client, revalidate=False):
+        start = time.perf_counter()
+        article = await ArticleParser.fetch_article_async(locator, client, revalidate)
+        self.timings.append(time.perf_counter() - start)
+        return article
+
+
+def run(args, server: ReplayServer) -> List[StageResult]:
+    ids = locators(args.requests, args.pmc_share if server.corpus["pmc"] else 0.0)
+    parser = PubmedParser(args.engine)
+    results = []
+
+    def url(locator: str) -> str:
+        prefix = "/pmc" if locator.startswith("PMC") else ""
+        return f"{server.url}{prefix}/{locator}/"
+
+    result, pages = measure("fetch", ids, lambda i: (i, content_from_url(url(i))))
+    results.append(result)
+
+    def parse(page):
+        locator, content = page
+        return locator, stage_functions(parser, locator)[0](content)
+
+    result, trees = measure("parse", pages, parse)
+    results.append(result)
+
+    def build(tree):
+        locator, root = tree
+        return stage_functions(parser, locator)[1](root)
+
+    result, articles = measure("model", trees, build)
+    results.append(result)
+
+    timings = []
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        console = Console(file=io.StringIO(), width=120)
+        t0 = time.perf_counter()
+        display_table(to_dataframe(articles), SUBSET, console, page_rows=len(articles))
+        timings.append(time.perf_counter() - t0)
+    seconds = time.perf_counter() - start
+    results.append(
+        summarize("display", timings, 0, seconds, len(articles) * args.repeat)
+    )
+
+    timed = TimedParser()
+    start = time.perf_counter()
+    # PubmedParser logs every fetch to stderr, which would swamp the report.
+    with contextlib.redirect_stderr(io.StringIO()):
+        fetched = asyncio.run(
+            fetch_articles_async(timed, ids, concurrency=args.concurrency)
+        )
+    seconds = time.perf_counter() - start
+    results.append(
+        summarize(
+            "pipeline", timed.timings, len(ids) - len(fetched), seconds, len(fetched)
+        )
+    )
+    return results
+
+
+def git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+
+def report(results: List[StageResult]) -> None:
+    print(
+        f"{'stage':<10}{'n':>6}{'errors':>8}{'items/s':>10}"
+        f"{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'RSS MB':>9}"
+    )
+    for r in results:
+        rss = f"{r.peak_rss_mb:>9.1f}" if r.peak_rss_mb is not None else f"{'-':>9}"
+        print(
+            f"{r.name:<10}{r.samples:>6}{r.errors:>8}{r.throughput:>10.1f}"
+            f"{r.p50_ms:>9.2f}{r.p95_ms:>9.2f}{r.p99_ms:>9.2f}{rss}"
+        )
+
+
+def compare(
+    results: List[StageResult], baseline: Dict[str, Any], threshold: float
+) -> bool:
+    """Print changes against a saved run; returns whether any stage regressed."""
+    before = {s["name"]: StageResult(**s) for s in baseline["stages"]}
+    print(f"\nagainst {baseline.get('commit') or 'baseline'}:")
+    print(f"{'stage':<10}{'items/s':>10}{'p50':>9}{'p95':>9}{'p99':>9}")
+    regressed = False
+    for r in results:
+        old = before.get(r.name)
+        if old is None:
+            continue
+        changes = [
+            r.throughput / old.throughput - 1 if old.throughput else 0.0,
+            *(
+                getattr(r, key) / getattr(old, key) - 1 if getattr(old, key) else 0.0
+                for key in ("p50_ms", "p95_ms", "p99_ms")
+            ),
+        ]
+        slower = changes[0] < -threshold or changes[2] > threshold
+        regressed |= slower
+        cells = "".join(f"{change:>+9.0%}" for change in changes)
+        print(f"{r.name:<10} {cells}{'  regression' if slower else ''}")
+    return regressed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", type=Path, default=FIXTURES)
+    parser.add_argument("--requests", "-n", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=20.0, help="ms per response")
+    parser.add_argument("--jitter", type=float, default=10.0, help="ms either way")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--pmc-share", type=float, default=0.2)
+    parser.add_argument("--concurrency", "-c", type=int, default=10)
+    parser.add_argument("--engine", choices=ENGINES, default="html.parser")
+    parser.add_argument("--retries", type=int, default=2)
+    parser.add_argument("--repeat", "-r", type=int, default=5, help="display runs")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", type=Path, help="write results to this file")
+    parser.add_argument("--compare", type=Path, help="results of an earlier run")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="relative p95 or throughput change counted as a regression",
+    )
+    args = parser.parse_args()
+
+    # The stub is local, so NCBI's rate limit does not apply; retries back off
+    # quickly so injected errors cost retries rather than seconds of sleep.
+    ratelimit.LIMITER = ratelimit.TokenBucket(rate=1e6, burst=10**6)
+    ratelimit.RETRY = ratelimit.RetryPolicy(args.retries, backoff_base=0.005)
+
+    corpus = load_corpus(args.corpus)
+    server = ReplayServer(
+        corpus,
+        latency=args.latency / 1000,
+        jitter=args.jitter / 1000,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    )
+    with server:
+        CONFIG["urls"] = {
+            **CONFIG["urls"],
+            "PMID_ROOT": server.url,
+            "PMCID_ROOT": f"{server.url}/pmc",
+        }
+        results = run(args, server)
+
+    print(
+        f"{args.requests} requests over {len(corpus['pubmed'])} PubMed and "
+        f"{len(corpus['pmc'])} PMC pages, {args.latency:.0f}±{args.jitter:.0f}ms, "
+        f"{server.errors}/{server.served} responses failed"
+    )
+    report(results)
+    if args.json:
+        payload = {
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.time(),
+            "settings": {
+                k: str(v) if isinstance(v, Path) else v
+                for k, v in vars(args).items()
+                if k not in ("json", "compare")
+            },
+            "stub": {"served": server.served, "errors": server.errors},
+            "stages": [r.model_dump() for r in results],
+        }
+        args.json.write_text(json.dumps(payload, indent=2))
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        if compare(results, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Index build and query latency of the full-text search index.
+
+Usage:
+    python -m benchmarks.bench_search [--docs 10000] [--queries 200]
+
+Synthetic articles are generated from the fixture abstracts with shuffled words
+and distinct PMIDs, indexed into an in-memory cache, and then queried with
+random two-term searches, so no network access is needed.
+"""
+
+import argparse
+import random
+import statistics
+import time
+from pathlib import Path
+
+from pmbuddy.cache import ArticleCache
+from pmbuddy.cache.search import SearchIndex, tokenize
+from pmbuddy.parsers import EutilsParser
+
+FIXTURES = Path(__file__).parents[1] / "tests" / "fixtures"
+
+
+def synthetic_articles(n: int, rng: random.Random):
+    templates = EutilsParser().parse_efetch(
+        (FIXTURES / "efetch_pubmed.xml").read_bytes()
+    )
+    words = sorted({w for a in templates for w in (a.title + " " + a.abstract).split()})
+    for i in range(n):
+        template = templates[i % len(templates)]
+        yield template.model_copy(
+            update={
+                "pmid": str(10_000_000 + i),
+                "pmcid": f"PMC{20_000_000 + i}",
+                "title": " ".join(rng.sample(words, 8)),
+                "abstract": " ".join(rng.choices(words, k=150)),
+            }
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--docs", type=int, default=10000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    cache = ArticleCache(":memory:", max_entries=args.docs)
+    articles = list(synthetic_articles(args.docs, rng))
+    for article in articles:
+        cache.put(article)
+    index = SearchIndex(cache)
+    start = time.perf_counter()
+    index.sync()
+    print(f"indexed {args.docs} articles in {time.perf_counter() - start:.2f}s")
+
+    vocabulary = sorted({t for a in articles[:50] for t in tokenize(a.abstract)})
+    latencies = []
+    for _ in range(args.queries):
+        query = " ".join(rng.sample(vocabulary, 2))
+        start = time.perf_counter()
+        index.search(query)
+        latencies.append((time.perf_counter() - start) * 1000)
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(f"query p50 {statistics.median(latencies):.2f}ms  p95 {p95:.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Cold-start latency of the `pmb` entry point, measured with `-X importtime`.
+
+Usage:
+    python -m benchmarks.bench_startup [--runs 10] [--module pmbuddy.cli] [--budget-ms 150]
+
+Each run imports the module in a fresh interpreter. The median cumulative
+import time is reported together with the modules that contribute most, and
+the script exits with status 1 when the median exceeds `--budget-ms`.
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, Tuple
+
+
+def import_times(module: str) -> Tuple[Dict[str, int], Dict[str, int]]:
+    """Return (self, cumulative) import times in microseconds for one cold import."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    own, cumulative = {}, {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line.split(":", 1)[1].split("|")
+        own[name.strip()] = int(self_us)
+        cumulative[name.strip()] = int(cumulative_us)
+    return own, cumulative
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--module", default="pmbuddy.cli")
+    parser.add_argument("--budget-ms", type=float, default=150.0)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    totals, own_times = [], defaultdict(list)
+    for _ in range(args.runs):
+        own, cumulative = import_times(args.module)
+        totals.append(cumulative[args.module] / 1000)
+        for name, us in own.items():
+            own_times[name].append(us / 1000)
+
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "-c", "from pmbuddy.cli import main; main()", "--help"],
+        capture_output=True,
+        check=True,
+    )
+    help_ms = (time.perf_counter() - start) * 1000
+
+    median = statistics.median(totals)
+    print(f"import {args.module}: median {median:.1f}ms over {args.runs} runs")
+    print(f"pmb --help (wall, incl. interpreter start): {help_ms:.1f}ms")
+    print(f"\n{'module':<45}{'self ms':>10}")
+    slowest = sorted(
+        own_times.items(), key=lambda item: statistics.median(item[1]), reverse=True
+    )
+    for name, times in slowest[: args.top]:
+        print(f"{name:<45}{statistics.median(times):>10.2f}")
+    if median > args.budget_ms:
+        print(f"\nover budget: {median:.1f}ms > {args.budget_ms:.1f}ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
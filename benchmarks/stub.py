@@ -0,0 +1,108 @@
+"""Local HTTP stub that replays recorded PubMed and PMC pages.
+
+Any PMID is answered with one of the recorded abstract pages and any PMCID
+with one of the recorded PMC pages, so a corpus of a few pages can serve
+benchmarks of any size. Latency (with jitter) and error responses are
+injected at configurable rates from a seeded random generator, so runs are
+reproducible.
+"""
+
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List
+
+FIXTURES = Path(__file__).parents[1] / "tests" / "fixtures"
+
+
+def load_corpus(directory: Path) -> Dict[str, List[bytes]]:
+    """Read pubmed_*.html and pmc_*.html pages, keyed by kind."""
+    corpus = {
+        "pubmed": [p.read_bytes() for p in sorted(directory.glob("pubmed_*.html"))],
+        "pmc": [p.read_bytes() for p in sorted(directory.glob("pmc_*.html"))],
+    }
+    if not corpus["pubmed"]:
+        raise FileNotFoundError(f"No pubmed_*.html pages in {directory}")
+    return corpus
+
+
+class ReplayHandler(BaseHTTPRequestHandler):
+    server: "ReplayServer"
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        status, body = self.server.respond(self.path)
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+class ReplayServer(ThreadingHTTPServer):
+    """Serves the corpus on 127.0.0.1 from a background thread.
+
+    PubMed pages live under `/` and PMC pages under `/pmc/`, mirroring
+    `PMID_ROOT` and `PMCID_ROOT`. Each response is delayed by `latency`
+    plus or minus up to `jitter` seconds, and fails with `error_status`
+    with probability `error_rate`.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        corpus: Dict[str, List[bytes]],
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        seed: int = 0,
+    ) -> None:
+        super().__init__(("127.0.0.1", 0), ReplayHandler)
+        self.corpus = corpus
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.served = 0
+        self.errors = 0
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def page(self, path: str) -> bytes:
+        locator = path.strip("/").split("/")[-1]
+        pages = self.corpus["pmc"] if path.startswith("/pmc/") else []
+        pages = pages or self.corpus["pubmed"]
+        digits = "".join(c for c in locator if c.isdigit()) or "0"
+        return pages[int(digits) % len(pages)]
+
+    def respond(self, path: str):
+        with self.lock:
+            delay = self.latency + self.random.uniform(-self.jitter, self.jitter)
+            failed = self.random.random() < self.error_rate
+            self.served += 1
+            self.errors += failed
+        time.sleep(max(delay, 0.0))
+        if failed:
+            return self.error_status, b""
+        return 200, self.page(path)
+
+    def __enter__(self) -> "ReplayServer":
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.shutdown()
+        self.server_close()
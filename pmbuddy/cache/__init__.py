@@ -0,0 +1,264 @@
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from pydantic import BaseModel
+
+from pmbuddy.config import CONFIG
+from pmbuddy.models import PubmedArticle
+from pmbuddy.models.records import ArticleBatch
+from pmbuddy.util.profile import count
+from pmbuddy.util.requests import NotModified
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    pmid TEXT PRIMARY KEY,
+    pmcid TEXT,
+    data TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    fetch_seconds REAL NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_articles_pmcid ON articles (pmcid);
+CREATE INDEX IF NOT EXISTS idx_articles_accessed ON articles (accessed_at);
+"""
+
+
+class CacheStats(BaseModel):
+    hits: int = 0
+    misses: int = 0
+    expired: int = 0
+    revalidated: int = 0
+    evicted: int = 0
+    saved_seconds: float = 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"cache: {self.hits} hits, {self.misses} misses "
+            f"({self.hit_rate:.0%} hit rate), {self.expired} expired, "
+            f"{self.revalidated} revalidated, "
+            f"{self.evicted} evicted, ~{self.saved_seconds:.2f}s of fetching saved"
+        )
+
+
+class ArticleCache:
+    """SQLite-backed cache of parsed articles keyed by PMID and PMCID.
+
+    Entries older than `ttl` seconds are treated as misses, and the least
+    recently used entries are evicted once more than `max_entries` are stored.
+    The size is checked every `evict_interval` puts, a hundredth of
+    `max_entries` by default.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str | Path] = None,
+        ttl: Optional[float] = None,
+        max_entries: Optional[int] = None,
+        evict_interval: Optional[int] = None,
+    ) -> None:
+        cfg = CONFIG.get("cache", {})
+        self.path = Path(path or cfg.get("path", "articles.sqlite3")).expanduser()
+        self.ttl = ttl if ttl is not None else cfg.get("ttl", 604800)
+        self.max_entries = max_entries or cfg.get("max_entries", 100000)
+        self.evict_interval = evict_interval or max(1, self.max_entries // 100)
+        self._puts = 0
+        self.stats = CacheStats()
+        if str(self.path) != ":memory:":
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.executescript(SCHEMA)
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def get(self, locator: str) -> Optional[PubmedArticle]:
+        """Return the cached article for a PMID or PMCID, or None on a miss."""
+        key = "pmcid" if locator.startswith("PMC") else "pmid"
+        row = self.conn.execute(
+            f"SELECT pmid, data, fetched_at, fetch_seconds FROM articles WHERE {key} = ?",
+            (locator,),
+        ).fetchone()
+        now = time.time()
+        if row is None:
+            self.stats.misses += 1
+            count("cache.misses")
+            return None
+        pmid, data, fetched_at, fetch_seconds = row
+        if now - fetched_at > self.ttl:
+            self.stats.misses += 1
+            self.stats.expired += 1
+            count("cache.misses")
+            count("cache.expired")
+            return None
+        with self.conn:
+            self.conn.execute(
+                "UPDATE articles SET accessed_at = ? WHERE pmid = ?", (now, pmid)
+            )
+        self.stats.hits += 1
+        self.stats.saved_seconds += fetch_seconds
+        count("cache.hits")
+        return PubmedArticle.model_validate_json(data)
+
+    def peek(self, locator: str) -> Optional[PubmedArticle]:
+        """Return a cached article even if stale, without touching stats or LRU order."""
+        key = "pmcid" if locator.startswith("PMC") else "pmid"
+        row = self.conn.execute(
+            f"SELECT data FROM articles WHERE {key} = ?", (locator,)
+        ).fetchone()
+        return PubmedArticle.model_validate_json(row[0]) if row else None
+
+    def records(self, pmids: Optional[Iterable[str]] = None) -> ArticleBatch:
+        """Bulk load cached articles as a batch, without validating them again.
+
+        Returns every cached article, or those of `pmids` in the given order.
+        Like `peek`, entries are returned even if stale and stats are untouched.
+        """
+        if pmids is None:
+            rows = self.conn.execute("SELECT data FROM articles ORDER BY rowid")
+            return ArticleBatch.from_dumps(data for (data,) in rows)
+        pmids = list(pmids)
+        found = {}
+        # SQLite limits the number of bound parameters per statement.
+        for i in range(0, len(pmids), 500):
+            chunk = pmids[i : i + 500]
+            rows = self.conn.execute(
+                "SELECT pmid, data FROM articles "
+                f"WHERE pmid IN ({', '.join('?' * len(chunk))})",
+                chunk,
+            )
+            found.update(rows)
+        return ArticleBatch.from_dumps(found[pmid] for pmid in pmids if pmid in found)
+
+    def touch(self, pmid: str) -> None:
+        """Mark a cached article as fresh after the server confirmed it is unchanged."""
+        now = time.time()
+        with self.conn:
+            self.conn.execute(
+                "UPDATE articles SET fetched_at = ?, accessed_at = ? WHERE pmid = ?",
+                (now, now, pmid),
+            )
+        self.stats.revalidated += 1
+        count("cache.revalidated")
+
+    def put(self, article: PubmedArticle, fetch_seconds: float = 0.0) -> None:
+        now = time.time()
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO articles VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    article.pmid,
+                    article.pmcid,
+                    article.model_dump_json(),
+                    now,
+                    now,
+                    fetch_seconds,
+                ),
+            )
+        self._puts += 1
+        # Counting rows scans the table, so the size is only checked every
+        # `evict_interval` puts and may overshoot `max_entries` by that much.
+        if self._puts % self.evict_interval == 0:
+            self.evict()
+
+    def evict(self) -> int:
+        """Drop least recently used entries beyond `max_entries`."""
+        excess = len(self) - self.max_entries
+        if excess <= 0:
+            return 0
+        with self.conn:
+            self.conn.execute(
+                "DELETE FROM articles WHERE pmid IN "
+                "(SELECT pmid FROM articles ORDER BY accessed_at LIMIT ?)",
+                (excess,),
+            )
+        self.stats.evicted += excess
+        return excess
+
+    def clear(self) -> None:
+        with self.conn:
+            self.conn.execute("DELETE FROM articles")
+
+
+class CachedParser:
+    """Wraps a parser so that fetched articles are read from and written to a cache.
+
+    With `refresh=True` the cache is never read, but fresh results still
+    replace the cached entries. Stale or refreshed entries are revalidated:
+    when the page is unchanged (see `set_page_cache`) the stored copy is kept
+    without downloading or parsing the page again.
+    """
+
+    def __init__(self, parser, cache: ArticleCache, refresh: bool = False) -> None:
+        self.parser = parser
+        self.cache = cache
+        self.refresh = refresh
+
+    def _lookup(self, locator: str) -> Optional[PubmedArticle]:
+        if self.refresh or "http" in locator:
+            return None
+        return self.cache.get(locator)
+
+    def _stale(self, locator: str) -> Optional[PubmedArticle]:
+        return None if "http" in locator else self.cache.peek(locator)
+
+    def fetch_article(self, locator: str) -> PubmedArticle:
+        article = self._lookup(locator)
+        if article is not None:
+            return article
+        stale = self._stale(locator)
+        start = time.perf_counter()
+        try:
+            article = self.parser.fetch_article(locator, revalidate=stale is not None)
+        except NotModified:
+            self.cache.touch(stale.pmid)
+            return stale
+        self.cache.put(article, time.perf_counter() - start)
+        return article
+
+    async def fetch_article_async(self, locator: str, client) -> PubmedArticle:
+        article = self._lookup(locator)
+        if article is not None:
+            return article
+        stale = self._stale(locator)
+        start = time.perf_counter()
+        try:
+            article = await self.parser.fetch_article_async(
+                locator, client, revalidate=stale is not None
+            )
+        except NotModified:
+            self.cache.touch(stale.pmid)
+            return stale
+        self.cache.put(article, time.perf_counter() - start)
+        return article
+
+    def fetch_from_ids(self, ids: List[str]) -> List[PubmedArticle]:
+        """Batch lookup for parsers such as EutilsParser; only misses are fetched."""
+        found: Dict[str, PubmedArticle] = {}
+        misses = []
+        for id in ids:
+            article = self._lookup(id)
+            if article is None:
+                misses.append(id)
+            else:
+                found[id] = article
+        if misses:
+            start = time.perf_counter()
+            fetched = self.parser.fetch_from_ids(misses)
+            per_article = (time.perf_counter() - start) / max(len(fetched), 1)
+            for article in fetched:
+                self.cache.put(article, per_article)
+                # PMCID inputs are matched to their article by its pmcid.
+                found[article.pmid] = article
+                if article.pmcid:
+                    found[article.pmcid] = article
+        return [found[id] for id in ids if id in found]
@@ -0,0 +1,144 @@
+from typing import Iterable, List, Optional
+
+from pmbuddy.models import Author, PubmedArticle, author_key
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS author_keys (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS author_postings (
+    author_id INTEGER NOT NULL REFERENCES author_keys (id),
+    pmid TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    affiliation TEXT,
+    orcid TEXT,
+    PRIMARY KEY (author_id, pmid)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_author_postings_pmid ON author_postings (pmid);
+CREATE INDEX IF NOT EXISTS idx_author_postings_orcid ON author_postings (orcid);
+CREATE TABLE IF NOT EXISTS author_meta (
+    key TEXT PRIMARY KEY,
+    value REAL NOT NULL
+);
+CREATE TRIGGER IF NOT EXISTS author_evict AFTER DELETE ON articles BEGIN
+    DELETE FROM author_postings WHERE pmid = old.pmid;
+END;
+"""
+
+
+def records(article: PubmedArticle) -> List[Author]:
+    """Structured authors of an article, derived from names for older cache entries."""
+    if article.author_records is not None:
+        return article.author_records
+    return [Author.from_name(name) for name in article.authors or []]
+
+
+def query_key(query: str) -> str:
+    """Normalize "Reyes MA", "Maria A Reyes" or "Reyes" to an author key."""
+    *last, initials = query.replace(",", " ").split() or [""]
+    if last and initials.isupper() and len(initials) <= 3:
+        return author_key(" ".join(last), initials)
+    if not last:
+        return author_key(initials)
+    return Author.from_name(query).key
+
+
+class AuthorIndex:
+    """Maps normalized author keys ("reyes ma") to the PMIDs of cached articles.
+
+    Each distinct key is stored once in `author_keys` and postings refer to it
+    by integer id, so a prolific author costs one string however many papers
+    they have. Like `SearchIndex`, `sync` only reads articles fetched since
+    the previous sync and evicted articles are dropped by a trigger.
+    """
+
+    def __init__(self, cache) -> None:
+        self.cache = cache
+        self.conn = cache.conn
+        self.conn.executescript(SCHEMA)
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM author_keys").fetchone()[0]
+
+    @property
+    def watermark(self) -> float:
+        row = self.conn.execute(
+            "SELECT value FROM author_meta WHERE key = 'watermark'"
+        ).fetchone()
+        return row[0] if row else 0.0
+
+    def _key_id(self, key: str) -> int:
+        self.conn.execute("INSERT OR IGNORE INTO author_keys (key) VALUES (?)", (key,))
+        return self.conn.execute(
+            "SELECT id FROM author_keys WHERE key = ?", (key,)
+        ).fetchone()[0]
+
+    def _index(self, article: PubmedArticle) -> None:
+        self.conn.execute("DELETE FROM author_postings WHERE pmid = ?", (article.pmid,))
+        for position, author in enumerate(records(article)):
+            self.conn.execute(
+                "INSERT OR IGNORE INTO author_postings VALUES (?, ?, ?, ?, ?)",
+                (
+                    self._key_id(author.key),
+                    article.pmid,
+                    position,
+                    author.affiliation,
+                    author.orcid,
+                ),
+            )
+
+    def add(self, articles: Iterable[PubmedArticle]) -> int:
+        """Index (or re-index) the authors of articles; returns the number indexed."""
+        count = 0
+        with self.conn:
+            for article in articles:
+                self._index(article)
+                count += 1
+        return count
+
+    def sync(self) -> int:
+        """Index cached articles fetched since the last sync."""
+        rows = self.conn.execute(
+            "SELECT data, fetched_at FROM articles WHERE fetched_at > ? "
+            "ORDER BY fetched_at",
+            (self.watermark,),
+        ).fetchall()
+        if not rows:
+            return 0
+        with self.conn:
+            for data, _ in rows:
+                self._index(PubmedArticle.model_validate_json(data))
+            self.conn.execute(
+                "INSERT OR REPLACE INTO author_meta VALUES ('watermark', ?)",
+                (rows[-1][1],),
+            )
+        return len(rows)
+
+    def lookup(self, query: str, limit: Optional[int] = None) -> List[str]:
+        """PMIDs of cached articles by an author, most recent PMIDs first.
+
+        Initials match by prefix as on PubMed, so "Reyes M" finds "Reyes MA",
+        and a bare last name ("Reyes") matches every set of initials.
+        Collective names ("Mangrove Microbiome Consortium") match as a whole.
+        """
+        key = query_key(query)
+        # Range scans over the unique index on author_keys.key.
+        low, high = (key, key + "\uffff") if " " in key else (key + " ", key + "!")
+        rows = self.conn.execute(
+            "SELECT DISTINCT p.pmid FROM author_keys k "
+            "JOIN author_postings p ON p.author_id = k.id "
+            "WHERE k.key IN (?, ?) OR (k.key >= ? AND k.key < ?) "
+            "ORDER BY CAST(p.pmid AS INTEGER) DESC LIMIT ?",
+            (key, author_key(query), low, high, limit or -1),
+        ).fetchall()
+        return [pmid for (pmid,) in rows]
+
+    def by_orcid(self, orcid: str, limit: Optional[int] = None) -> List[str]:
+        """PMIDs of cached articles whose author list carries this ORCID iD."""
+        rows = self.conn.execute(
+            "SELECT DISTINCT pmid FROM author_postings WHERE orcid = ? "
+            "ORDER BY CAST(pmid AS INTEGER) DESC LIMIT ?",
+            (orcid, limit or -1),
+        ).fetchall()
+        return [pmid for (pmid,) in rows]
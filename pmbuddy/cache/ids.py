@@ -0,0 +1,339 @@
+import asyncio
+import json
+import time
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+import httpx
+from pydantic import BaseModel
+
+from pmbuddy.config import CONFIG
+from pmbuddy.util import NOT_AVAILABLE
+from pmbuddy.util.export import present
+from pmbuddy.util.requests import (
+    async_client,
+    batched,
+    esummary_async,
+    idconv_async,
+)
+from pmbuddy.util.validation import FormatError, canonical_doi, canonical_id
+
+# Articles store NOT_AVAILABLE for a missing PMCID or DOI; the map stores NULL,
+# so the placeholder never overwrites or is returned as an identifier. Maps
+# built before are cleaned up, and their trigger is replaced.
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS id_map (
+    pmid TEXT PRIMARY KEY,
+    pmcid TEXT,
+    doi TEXT,
+    doi_key TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_id_map_pmcid ON id_map (pmcid);
+CREATE INDEX IF NOT EXISTS idx_id_map_doi ON id_map (doi_key);
+CREATE TABLE IF NOT EXISTS id_unknown (
+    id TEXT PRIMARY KEY,
+    checked_at REAL NOT NULL
+);
+UPDATE id_map SET pmcid = NULL WHERE pmcid = '{NOT_AVAILABLE}';
+UPDATE id_map SET doi = NULL, doi_key = NULL
+    WHERE doi_key = '{NOT_AVAILABLE.lower()}';
+DROP TRIGGER IF EXISTS id_map_add;
+CREATE TRIGGER id_map_add AFTER INSERT ON articles BEGIN
+    INSERT INTO id_map SELECT new.pmid, pmcid, doi, lower(doi) FROM (SELECT
+        nullif(new.pmcid, '{NOT_AVAILABLE}') AS pmcid,
+        nullif(nullif(json_extract(new.data, '$.citation.doi'), ''),
+            '{NOT_AVAILABLE}') AS doi
+    ) WHERE true ON CONFLICT (pmid) DO UPDATE SET
+        pmcid = coalesce(excluded.pmcid, pmcid),
+        doi = coalesce(excluded.doi, doi),
+        doi_key = coalesce(excluded.doi_key, doi_key);
+END;
+"""
+
+UPSERT = (
+    "INSERT INTO id_map VALUES (?, ?, ?, ?) ON CONFLICT (pmid) DO UPDATE SET "
+    "pmcid = coalesce(excluded.pmcid, pmcid), doi = coalesce(excluded.doi, doi), "
+    "doi_key = coalesce(excluded.doi_key, doi_key)"
+)
+
+# Identifier kinds, and the id_map column each is looked up by.
+KINDS = ("pmid", "pmcid", "doi")
+COLUMNS = {"pmid": "pmid", "pmcid": "pmcid", "doi": "doi_key"}
+
+
+class Identifiers(NamedTuple):
+    pmid: str
+    pmcid: Optional[str] = None
+    doi: Optional[str] = None
+
+
+class ConvertStats(BaseModel):
+    local: int = 0
+    fetched: int = 0
+    unknown: int = 0
+    requests: int = 0
+
+    def summary(self) -> str:
+        return (
+            f"convert: {self.local} local, {self.fetched} fetched, "
+            f"{self.unknown} unknown ({self.requests} requests)"
+        )
+
+
+def identify(locator: str) -> Tuple[str, str]:
+    """The kind ("pmid", "pmcid" or "doi") and canonical form of an identifier."""
+    locator = locator.strip()
+    # Most lines of a bulk list are plain PMIDs, which need no regex.
+    if locator.isdigit() and len(locator) <= 8 and locator[0] != "0":
+        return "pmid", locator
+    try:
+        return "doi", canonical_doi(locator)
+    except FormatError:
+        pass
+    key = canonical_id(locator)
+    if "http" in key:
+        raise FormatError(f"Invalid PMID, PMCID or DOI: {locator!r}")
+    return ("pmcid" if key.startswith("PMC") else "pmid"), key
+
+
+def identify_all(locators: Iterable[str]) -> List[Tuple[str, str]]:
+    """Identify every non-blank line, keeping order and duplicates.
+
+    Like `normalize_ids`, every malformed identifier is reported in a single
+    FormatError before anything is looked up.
+    """
+    identified: List[Tuple[str, str]] = []
+    invalid: List[str] = []
+    for number, locator in enumerate(locators, 1):
+        if not locator.strip():
+            continue
+        try:
+            identified.append(identify(locator))
+        except FormatError:
+            invalid.append(f"line {number}: {locator.strip()!r}")
+    if invalid:
+        shown = ", ".join(invalid[:5])
+        more = f" and {len(invalid) - 5} more" if len(invalid) > 5 else ""
+        raise FormatError(f"Invalid PMID, PMCID or DOI on {shown}{more}")
+    return identified
+
+
+def parse_idconv(content: bytes) -> List[Identifiers]:
+    """Identifiers of the records a PMC ID Converter response resolved."""
+    found = []
+    for record in json.loads(content).get("records", []):
+        if record.get("status") == "error" or not record.get("pmid"):
+            continue
+        found.append(
+            Identifiers(
+                str(record["pmid"]),
+                record.get("pmcid") or None,
+                record.get("doi") or None,
+            )
+        )
+    return found
+
+
+def parse_esummary(content: bytes) -> List[Identifiers]:
+    """Identifiers of the PMIDs an esummary response describes."""
+    result = json.loads(content).get("result", {})
+    found = []
+    for uid in result.get("uids", []):
+        summary = result.get(uid, {})
+        if "error" in summary:
+            continue
+        ids = {i.get("idtype"): i.get("value") for i in summary.get("articleids", [])}
+        found.append(Identifiers(uid, ids.get("pmc") or None, ids.get("doi") or None))
+    return found
+
+
+class IdentifierMap:
+    """Resolves PMIDs, PMCIDs and DOIs into one another from a local table.
+
+    The table lives in the cache database. A trigger adds the identifiers of
+    every article the cache stores, and `resolve` adds those the PMC ID
+    Converter and esummary return for local misses. Unlike the search and
+    author indexes it outlives evicted articles: identifiers do not change
+    and a row costs a few dozen bytes. Identifiers no service knows are
+    remembered for `unknown_ttl` seconds, so reruns do not ask for them again.
+    """
+
+    def __init__(
+        self,
+        cache,
+        batch_size: Optional[int] = None,
+        unknown_ttl: Optional[float] = None,
+    ) -> None:
+        cfg = CONFIG.get("ids", {})
+        self.cache = cache
+        self.conn = cache.conn
+        self.batch_size = batch_size or cfg.get("batch_size", 200)
+        self.unknown_ttl = (
+            unknown_ttl if unknown_ttl is not None else cfg.get("unknown_ttl", 604800)
+        )
+        self.stats = ConvertStats()
+        created = not self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'id_map'"
+        ).fetchone()
+        self.conn.executescript(SCHEMA)
+        if created:
+            self.sync()
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM id_map").fetchone()[0]
+
+    def sync(self) -> int:
+        """Add the identifiers of every cached article; the trigger keeps them current."""
+        with self.conn:
+            return self.conn.execute(
+                "INSERT INTO id_map SELECT pmid, pmcid, doi, lower(doi) FROM "
+                "(SELECT pmid, nullif(pmcid, ?) AS pmcid, "
+                "nullif(nullif(json_extract(data, '$.citation.doi'), ''), ?) AS doi "
+                "FROM articles) WHERE true ON CONFLICT (pmid) DO UPDATE SET "
+                "pmcid = coalesce(excluded.pmcid, pmcid), "
+                "doi = coalesce(excluded.doi, doi), "
+                "doi_key = coalesce(excluded.doi_key, doi_key)",
+                (NOT_AVAILABLE, NOT_AVAILABLE),
+            ).rowcount
+
+    def add(self, records: Iterable[Identifiers]) -> int:
+        """Store resolved identifiers; known IDs are completed, never erased."""
+        with self.conn:
+            return self.conn.executemany(
+                UPSERT,
+                (
+                    (pmid, present(pmcid), present(doi), present(doi) and doi.lower())
+                    for pmid, pmcid, doi in records
+                ),
+            ).rowcount
+
+    def lookup(self, kind: str, ids: Iterable[str]) -> Dict[str, Identifiers]:
+        """The stored identifiers of `ids`, all of one kind, keyed by the given ID."""
+        column = COLUMNS[kind]
+        # DOIs are case-insensitive, so they are stored and matched lowercased.
+        fold = kind == "doi"
+        ids = list(ids)
+        pending = list(dict.fromkeys(id.lower() for id in ids) if fold else ids)
+        stored: Dict[str, Identifiers] = {}
+        # SQLite limits the number of bound parameters per statement.
+        for i in range(0, len(pending), 500):
+            chunk = pending[i : i + 500]
+            rows = self.conn.execute(
+                f"SELECT {column}, pmid, pmcid, doi FROM id_map "
+                f"WHERE {column} IN ({', '.join('?' * len(chunk))})",
+                chunk,
+            )
+            stored.update({row[0]: Identifiers(*row[1:]) for row in rows})
+        if not fold:
+            return stored
+        return {id: stored[id.lower()] for id in ids if id.lower() in stored}
+
+    def known_unknown(self, ids: Iterable[str]) -> Set[str]:
+        """IDs among `ids` no service could resolve within the last `unknown_ttl`."""
+        ids = list(ids)
+        pending = list(dict.fromkeys(id.lower() for id in ids))
+        since = time.time() - self.unknown_ttl
+        unknown: Set[str] = set()
+        for i in range(0, len(pending), 500):
+            chunk = pending[i : i + 500]
+            rows = self.conn.execute(
+                "SELECT id FROM id_unknown WHERE checked_at > ? "
+                f"AND id IN ({', '.join('?' * len(chunk))})",
+                [since, *chunk],
+            )
+            unknown.update(id for (id,) in rows)
+        return {id for id in ids if id.lower() in unknown}
+
+    async def fetch(
+        self,
+        misses: Dict[str, List[str]],
+        client: httpx.AsyncClient,
+        concurrency: Optional[int] = None,
+    ) -> None:
+        """Ask the PMC ID Converter, then esummary for PMIDs outside PMC.
+
+        Each response is stored as it arrives, so an interrupted conversion
+        keeps what it already resolved.
+        """
+        limits = CONFIG.get("request", {}).get("limits", {})
+        semaphore = asyncio.Semaphore(concurrency or limits.get("concurrency", 10))
+
+        async def request(fetcher, parse, batch, *args) -> List[Identifiers]:
+            async with semaphore:
+                content = await fetcher(batch, client, *args)
+            self.stats.requests += 1
+            return parse(content)
+
+        jobs = [
+            request(idconv_async, parse_idconv, batch, kind)
+            for kind, ids in misses.items()
+            for batch in batched(ids, self.batch_size)
+        ]
+        for job in asyncio.as_completed(jobs):
+            self.add(await job)
+        found = self.lookup("pmid", misses.get("pmid", []))
+        outside_pmc = [pmid for pmid in misses.get("pmid", []) if pmid not in found]
+        jobs = [
+            request(esummary_async, parse_esummary, batch)
+            for batch in batched(outside_pmc, self.batch_size)
+        ]
+        for job in asyncio.as_completed(jobs):
+            self.add(await job)
+
+    async def resolve_async(
+        self,
+        identified: Iterable[Tuple[str, str]],
+        client: Optional[httpx.AsyncClient] = None,
+        offline: bool = False,
+        concurrency: Optional[int] = None,
+    ) -> Dict[Tuple[str, str], Identifiers]:
+        """Resolve (kind, id) pairs, from the table first and the network for misses.
+
+        Returns the resolved pairs only; each distinct pair is counted once in
+        `stats`. With `offline`, misses are left unresolved.
+        """
+        wanted: Dict[str, List[str]] = {kind: [] for kind in KINDS}
+        for kind, id in dict.fromkeys(identified):
+            wanted[kind].append(id)
+        resolved: Dict[Tuple[str, str], Identifiers] = {}
+        misses: Dict[str, List[str]] = {}
+        for kind, ids in wanted.items():
+            found = self.lookup(kind, ids)
+            resolved.update(((kind, id), record) for id, record in found.items())
+            missing = [id for id in ids if id not in found]
+            if missing and not offline:
+                skip = self.known_unknown(missing)
+                missing = [id for id in missing if id not in skip]
+            if missing:
+                misses[kind] = missing
+        self.stats.local += len(resolved)
+        if misses and not offline:
+            if client is None:
+                async with async_client(concurrency) as client:
+                    await self.fetch(misses, client, concurrency)
+            else:
+                await self.fetch(misses, client, concurrency)
+            unknown = []
+            for kind, ids in misses.items():
+                found = self.lookup(kind, ids)
+                resolved.update(((kind, id), record) for id, record in found.items())
+                self.stats.fetched += len(found)
+                unknown.extend(id.lower() for id in ids if id not in found)
+            now = time.time()
+            with self.conn:
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO id_unknown VALUES (?, ?)",
+                    ((id, now) for id in unknown),
+                )
+        self.stats.unknown += sum(len(ids) for ids in wanted.values()) - len(resolved)
+        return resolved
+
+    def resolve(
+        self,
+        identified: Iterable[Tuple[str, str]],
+        offline: bool = False,
+        concurrency: Optional[int] = None,
+    ) -> Dict[Tuple[str, str], Identifiers]:
+        """Blocking version of `resolve_async`."""
+        return asyncio.run(
+            self.resolve_async(identified, offline=offline, concurrency=concurrency)
+        )
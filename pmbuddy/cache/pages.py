@@ -0,0 +1,117 @@
+import sqlite3
+import time
+import zlib
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from pmbuddy.config import CONFIG
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    url TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    body BLOB NOT NULL,
+    fetched_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_pages_fetched_at ON pages (fetched_at);
+"""
+
+
+class PageCache:
+    """Stores raw response bodies together with their ETag/Last-Modified validators.
+
+    Bodies are zlib-compressed; a PubMed page shrinks to roughly a fifth of its size.
+    Like the article cache, at most `max_entries` pages are kept, dropping those
+    least recently fetched or revalidated first, checked every `evict_interval`
+    puts. Pages do not expire after a TTL: an old page is exactly the one
+    whose validators save a download.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str | Path] = None,
+        max_entries: Optional[int] = None,
+        evict_interval: Optional[int] = None,
+    ) -> None:
+        cfg = CONFIG.get("cache", {})
+        self.path = Path(path or cfg.get("path", "articles.sqlite3")).expanduser()
+        self.max_entries = max_entries or cfg.get("max_entries", 100000)
+        self.evict_interval = evict_interval or max(1, self.max_entries // 100)
+        self._puts = 0
+        self.revalidated = 0
+        self.evicted = 0
+        if str(self.path) != ":memory:":
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.executescript(SCHEMA)
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def get(self, url: str) -> Optional[Tuple[Optional[str], Optional[str], bytes]]:
+        """Return (etag, last_modified, body) for a stored URL."""
+        row = self.conn.execute(
+            "SELECT etag, last_modified, body FROM pages WHERE url = ?", (url,)
+        ).fetchone()
+        if row is None:
+            return None
+        etag, last_modified, body = row
+        return etag, last_modified, zlib.decompress(body)
+
+    def validators(self, url: str) -> Dict[str, str]:
+        """Return conditional request headers for a stored URL."""
+        row = self.conn.execute(
+            "SELECT etag, last_modified FROM pages WHERE url = ?", (url,)
+        ).fetchone()
+        if row is None:
+            return {}
+        etag, last_modified = row
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        return headers
+
+    def put(self, url: str, headers, body: bytes) -> None:
+        """Store a 200 response if it carries at least one validator."""
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        if not (etag or last_modified):
+            return
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?)",
+                (url, etag, last_modified, zlib.compress(body), time.time()),
+            )
+        self._puts += 1
+        # Counting rows scans the table, so the size is only checked every
+        # `evict_interval` puts and may overshoot `max_entries` by that much.
+        if self._puts % self.evict_interval == 0:
+            self.evict()
+
+    def evict(self) -> int:
+        """Drop the least recently fetched pages beyond `max_entries`."""
+        excess = len(self) - self.max_entries
+        if excess <= 0:
+            return 0
+        with self.conn:
+            self.conn.execute(
+                "DELETE FROM pages WHERE url IN "
+                "(SELECT url FROM pages ORDER BY fetched_at LIMIT ?)",
+                (excess,),
+            )
+        self.evicted += excess
+        return excess
+
+    def touch(self, url: str) -> None:
+        """Record a successful revalidation."""
+        self.revalidated += 1
+        with self.conn:
+            self.conn.execute(
+                "UPDATE pages SET fetched_at = ? WHERE url = ?", (time.time(), url)
+            )
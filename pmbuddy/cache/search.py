@@ -0,0 +1,143 @@
+import math
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from pmbuddy.config import CONFIG
+from pmbuddy.models import PubmedArticle
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS search_postings (
+    term TEXT NOT NULL,
+    pmid TEXT NOT NULL,
+    tf INTEGER NOT NULL,
+    PRIMARY KEY (term, pmid)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_search_postings_pmid ON search_postings (pmid);
+CREATE TABLE IF NOT EXISTS search_docs (
+    pmid TEXT PRIMARY KEY,
+    length INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS search_meta (
+    key TEXT PRIMARY KEY,
+    value REAL NOT NULL
+);
+CREATE TRIGGER IF NOT EXISTS search_evict AFTER DELETE ON articles BEGIN
+    DELETE FROM search_postings WHERE pmid = old.pmid;
+    DELETE FROM search_docs WHERE pmid = old.pmid;
+END;
+"""
+
+TOKEN = re.compile(r"[^\W_]+")
+
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in into is it its of on or "
+    "that the their these this to was were which with".split()
+)
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Lowercase word tokens, without stopwords and single letters."""
+    if not text:
+        return []
+    return [
+        token
+        for token in TOKEN.findall(text.lower())
+        if token not in STOPWORDS and (len(token) > 1 or token.isdigit())
+    ]
+
+
+class SearchIndex:
+    """BM25-ranked inverted index over the titles and abstracts of cached articles.
+
+    Postings live in the cache database next to the articles they describe.
+    `sync` only indexes articles fetched since the previous sync, and articles
+    evicted from the cache are dropped from the index by a trigger.
+    """
+
+    def __init__(self, cache, k1: Optional[float] = None, b: Optional[float] = None):
+        cfg = CONFIG.get("search", {})
+        self.cache = cache
+        self.conn = cache.conn
+        self.k1 = k1 if k1 is not None else cfg.get("k1", 1.2)
+        self.b = b if b is not None else cfg.get("b", 0.75)
+        self.conn.executescript(SCHEMA)
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM search_docs").fetchone()[0]
+
+    @property
+    def watermark(self) -> float:
+        row = self.conn.execute(
+            "SELECT value FROM search_meta WHERE key = 'watermark'"
+        ).fetchone()
+        return row[0] if row else 0.0
+
+    def _index(self, article: PubmedArticle) -> None:
+        tokens = tokenize(article.title) + tokenize(article.abstract)
+        self.conn.execute("DELETE FROM search_postings WHERE pmid = ?", (article.pmid,))
+        self.conn.executemany(
+            "INSERT INTO search_postings VALUES (?, ?, ?)",
+            ((term, article.pmid, tf) for term, tf in Counter(tokens).items()),
+        )
+        self.conn.execute(
+            "INSERT OR REPLACE INTO search_docs VALUES (?, ?)",
+            (article.pmid, len(tokens)),
+        )
+
+    def add(self, articles: Iterable[PubmedArticle]) -> int:
+        """Index (or re-index) articles; returns the number indexed."""
+        count = 0
+        with self.conn:
+            for article in articles:
+                self._index(article)
+                count += 1
+        return count
+
+    def sync(self) -> int:
+        """Index cached articles fetched since the last sync."""
+        rows = self.conn.execute(
+            "SELECT data, fetched_at FROM articles WHERE fetched_at > ? "
+            "ORDER BY fetched_at",
+            (self.watermark,),
+        ).fetchall()
+        if not rows:
+            return 0
+        with self.conn:
+            for data, _ in rows:
+                self._index(PubmedArticle.model_validate_json(data))
+            self.conn.execute(
+                "INSERT OR REPLACE INTO search_meta VALUES ('watermark', ?)",
+                (rows[-1][1],),
+            )
+        return len(rows)
+
+    def search(
+        self, query: str, limit: Optional[int] = None
+    ) -> List[Tuple[str, float]]:
+        """Return (pmid, score) pairs for the best matches, highest score first."""
+        limit = limit or CONFIG.get("search", {}).get("limit", 20)
+        terms = set(tokenize(query))
+        n_docs, avg_length = self.conn.execute(
+            "SELECT COUNT(*), AVG(length) FROM search_docs"
+        ).fetchone()
+        if not terms or not n_docs:
+            return []
+        scores: Dict[str, float] = {}
+        for term in terms:
+            postings = self.conn.execute(
+                "SELECT p.pmid, p.tf, d.length FROM search_postings p "
+                "JOIN search_docs d USING (pmid) WHERE p.term = ?",
+                (term,),
+            ).fetchall()
+            if not postings:
+                continue
+            df = len(postings)
+            idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+            for pmid, tf, length in postings:
+                norm = self.k1 * (1 - self.b + self.b * length / (avg_length or 1))
+                scores[pmid] = scores.get(pmid, 0.0) + idf * tf * (self.k1 + 1) / (
+                    tf + norm
+                )
+        ranked = sorted(scores.items(), key=lambda hit: (-hit[1], hit[0]))
+        return ranked[:limit]
@@ -1,24 +1,27 @@
 import argparse
-import subprocess
 import sys
-from pathlib import Path
-from typing import List
+from typing import TYPE_CHECKING, Any, Iterable, List, Optional, Tuple
 
-import pandas as pd
-from rich.console import Console
+from pmbuddy.config import CONFIG
+from pmbuddy.store import DEFAULT_COLUMNS, ArticleStore
+from pmbuddy.util.output import FORMATS, ROW_FORMATS, ArticleWriter, gzip_text
 
-from pmbuddy.models import PubmedArticle
-from pmbuddy.util import concat_from_file, concat_from_stdin
-from pmbuddy.util.display import (
-    display_multiple_abstracts,
-    display_single_abstract,
-    display_table,
-)
+# Everything else (pydantic models, httpx, asyncio, pandas, rich, the process
+# pool) is imported by the code path that needs it, so `pmb --help` and the
+# local subcommands do not pay for the fetching stack at startup.
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from pmbuddy.cache import ArticleCache
+    from pmbuddy.client import DaemonClient
+    from pmbuddy.models import PubmedArticle
+    from pmbuddy.models.records import ArticleBatch
 
 
-def to_dataframe(articles: List[PubmedArticle]) -> pd.DataFrame:
-    data = [a.json() for a in articles]
-    return pd.DataFrame(data)
+def to_dataframe(articles: List["PubmedArticle"]) -> "pd.DataFrame":
+    from pmbuddy.models.records import ArticleBatch
+
+    return ArticleBatch.from_models(articles).to_dataframe()
 
 
 parser = argparse.ArgumentParser(
@@ -33,38 +36,894 @@ parser.add_argument(
     "--file", "-f", help="provide filepath containing PMIDs separated by newlines"
 )
 
+parser.add_argument(
+    "--format",
+    choices=FORMATS,
+    default=None,
+    help="stream articles to stdout in this format as they are fetched",
+)
 
-def main() -> None:
-    args = parser.parse_args()
+parser.add_argument(
+    "--output",
+    "-o",
+    default=None,
+    help="run as a resumable job, appending records to this file",
+)
+
+parser.add_argument(
+    "--gzip",
+    action="store_true",
+    help="gzip-compress --format output (implied by an --output ending in .gz)",
+)
+
+parser.add_argument(
+    "--resume",
+    action="store_true",
+    help="continue a job, fetching only missing PMIDs and retrying failures",
+)
+
+parser.add_argument(
+    "--max-attempts",
+    type=int,
+    default=None,
+    help="stop retrying a PMID after this many failed attempts",
+)
+
+parser.add_argument(
+    "--concurrency",
+    "-c",
+    type=int,
+    default=None,
+    help="maximum number of articles fetched at once",
+)
+
+parser.add_argument(
+    "--backend",
+    "-b",
+    choices=["html", "eutils"],
+    default="html",
+    help="scrape article pages or fetch batched records from NCBI E-utilities",
+)
+
+parser.add_argument(
+    "--workers",
+    "-w",
+    type=int,
+    default=None,
+    help="parse pages on this many worker processes (html backend only)",
+)
+
+parser.add_argument(
+    "--chunk-size",
+    type=int,
+    default=None,
+    help="pages handed to a worker process at once",
+)
+
+parser.add_argument(
+    "--no-cache", action="store_true", help="bypass the local article cache"
+)
+
+parser.add_argument(
+    "--refresh",
+    action="store_true",
+    help="refetch articles and overwrite their cached copies",
+)
+
+parser.add_argument(
+    "--cache-stats", action="store_true", help="report cache hits and misses"
+)
+
+parser.add_argument(
+    "--store",
+    action="store_true",
+    help="also save fetched articles to the local columnar store",
+)
+
+parser.add_argument(
+    "--profile",
+    action="store_true",
+    help="print time spent per stage (fetch, parse, model, display) to stderr",
+)
+
+parser.add_argument(
+    "--trace",
+    default=None,
+    help="write a Chrome trace (JSON) of the profile to this file; implies --profile",
+)
+
+parser.add_argument(
+    "--no-daemon",
+    action="store_true",
+    help="fetch in this process even when `pmb serve` is running",
+)
+
+subparsers = parser.add_subparsers(dest="command")
+
+query_parser = subparsers.add_parser(
+    "query", help="filter articles saved in the local columnar store"
+)
+query_parser.add_argument(
+    "--journal", "-j", help="journal abbreviation, e.g. Nat Commun"
+)
+query_parser.add_argument(
+    "--year", "-y", help="publication year or range, e.g. 2019-2024"
+)
+query_parser.add_argument("--author", "-a", help="full author name or last name")
+query_parser.add_argument(
+    "--columns", help=f"comma-separated columns (default: {','.join(DEFAULT_COLUMNS)})"
+)
+query_parser.add_argument("--limit", "-n", type=int, help="maximum number of rows")
+query_parser.add_argument(
+    "--format", choices=ROW_FORMATS, default=None, help="write rows instead of a table"
+)
+
+search_parser = subparsers.add_parser(
+    "search", help="rank cached articles by relevance to free-text terms"
+)
+search_parser.add_argument("terms", help='search terms, e.g. "tau phosphorylation"')
+search_parser.add_argument("--limit", "-n", type=int, help="maximum number of hits")
+search_parser.add_argument(
+    "--format", choices=FORMATS, default=None, help="write hits instead of a table"
+)
+
+author_parser = subparsers.add_parser(
+    "author", help="list cached articles by an author"
+)
+author_parser.add_argument(
+    "name", nargs="?", help='"Last Initials", e.g. "Reyes MA", or a full name'
+)
+author_parser.add_argument("--orcid", help="look up by ORCID iD instead of name")
+author_parser.add_argument("--limit", "-n", type=int, help="maximum number of articles")
+author_parser.add_argument(
+    "--format", choices=FORMATS, default=None, help="write articles instead of a table"
+)
+
+graph_parser = subparsers.add_parser(
+    "graph", help="expand the citation graph around seed PMIDs"
+)
+graph_parser.add_argument("seeds", nargs="*", help="seed PMIDs")
+graph_parser.add_argument("--file", "-f", help="file of newline-separated seed PMIDs")
+graph_parser.add_argument(
+    "--depth", "-d", type=int, default=1, help="levels of citations to follow"
+)
+graph_parser.add_argument(
+    "--direction",
+    choices=("references", "cited_by", "both"),
+    default="both",
+    help="follow references, citing articles, or both",
+)
+graph_parser.add_argument(
+    "--concurrency", "-c", type=int, default=None, help="elink requests in flight"
+)
+graph_parser.add_argument(
+    "--max-nodes", type=int, default=None, help="stop adding PMIDs beyond this many"
+)
+graph_parser.add_argument(
+    "--output",
+    "-o",
+    default=None,
+    help="save the graph in compact binary form instead of printing edges",
+)
+
+serve_parser = subparsers.add_parser(
+    "serve", help="keep a warm fetcher and cache running behind a local JSON API"
+)
+serve_parser.add_argument("--host", help="address to listen on (default: 127.0.0.1)")
+serve_parser.add_argument("--port", "-p", type=int, help="port (default: 8765)")
+serve_parser.add_argument(
+    "--verbose", "-v", action="store_true", help="log every request to stderr"
+)
+
+watch_parser = subparsers.add_parser(
+    "watch", help="saved PubMed searches that only fetch new and modified hits"
+)
+watch_actions = watch_parser.add_subparsers(dest="action", required=True)
+watch_add = watch_actions.add_parser("add", help="save a named PubMed query")
+watch_add.add_argument("name", help="name of the saved search")
+watch_add.add_argument("query", help='PubMed query, e.g. "zebrafish[mh] AND retina"')
+watch_add.add_argument(
+    "--since", help="only sync records entered or modified since YYYY/MM/DD"
+)
+watch_actions.add_parser("list", help="list saved searches and their last sync")
+watch_remove = watch_actions.add_parser("remove", help="delete a saved search")
+watch_remove.add_argument("name", help="name of the saved search")
+watch_run = watch_actions.add_parser(
+    "run", help="fetch the new and modified hits of saved searches"
+)
+watch_run.add_argument("names", nargs="*", help="searches to sync (default: all)")
+watch_run.add_argument(
+    "--format",
+    choices=FORMATS,
+    default=None,
+    help="write the fetched articles to stdout in this format",
+)
+
+queue_parser = subparsers.add_parser(
+    "queue", help="shard PMIDs into a work queue fetched by `pmb worker` processes"
+)
+queue_actions = queue_parser.add_subparsers(dest="action", required=True)
+queue_create = queue_actions.add_parser(
+    "create", help="split PMIDs from stdin, --file or --pmid into shards"
+)
+queue_create.add_argument("queue", help="path of the queue file to create")
+queue_create.add_argument(
+    "--shard-size", type=int, default=None, help="PMIDs per shard (default: 1000)"
+)
+queue_create.add_argument(
+    "--format",
+    choices=[format for format in FORMATS if format != "csl-json"],
+    default="jsonl",
+    help="format workers write shards in",
+)
+queue_create.add_argument(
+    "--rate",
+    type=float,
+    default=None,
+    help="requests per second shared by all workers (default: NCBI's limit)",
+)
+queue_status = queue_actions.add_parser("status", help="show the progress of a queue")
+queue_status.add_argument("queue", help="path of the queue file")
+queue_status.add_argument(
+    "--failed",
+    action="store_true",
+    help="print the PMIDs that failed in finished shards",
+)
+queue_merge = queue_actions.add_parser(
+    "merge", help="concatenate the finished shards into one file"
+)
+queue_merge.add_argument("queue", help="path of the queue file")
+queue_merge.add_argument(
+    "output", help="merged file, gzip-compressed if it ends in .gz"
+)
+queue_merge.add_argument(
+    "--partial", action="store_true", help="merge even if some shards are unfinished"
+)
+
+worker_parser = subparsers.add_parser(
+    "worker", help="fetch shards leased from a `pmb queue` until none are left"
+)
+worker_parser.add_argument("queue", help="path of the queue file")
+worker_parser.add_argument(
+    "--id", dest="worker_id", default=None, help="name in leases (default: host:pid)"
+)
+worker_parser.add_argument(
+    "--lease",
+    type=float,
+    default=None,
+    help="seconds a lease lasts without renewal (default: 300)",
+)
+worker_parser.add_argument(
+    "--max-shards", type=int, default=None, help="stop after this many shards"
+)
+worker_parser.add_argument(
+    "--wait",
+    action="store_true",
+    help="keep polling while other workers hold leases, to take over expired ones",
+)
+
+
+convert_parser = subparsers.add_parser(
+    "convert", help="map PMIDs, PMCIDs and DOIs to each other, locally where possible"
+)
+convert_parser.add_argument(
+    "ids", nargs="*", help="identifiers (default: stdin, --file or --pmid)"
+)
+convert_output = convert_parser.add_mutually_exclusive_group()
+convert_output.add_argument(
+    "--to",
+    choices=["pmid", "pmcid", "doi"],
+    default=None,
+    help="print only this identifier, one line per input (blank if unknown)",
+)
+convert_output.add_argument(
+    "--format",
+    choices=ROW_FORMATS,
+    default="tsv",
+    help="rows of input, pmid, pmcid and doi (default: tsv)",
+)
+convert_parser.add_argument(
+    "--offline", action="store_true", help="only use the local identifier map"
+)
+
+
+def read_pmids(args) -> List[str]:
+    """Read PMIDs from standard input, a file or the --pmid option.
+
+    IDs are validated, canonicalized and deduplicated up front, so malformed
+    input is rejected before any request is sent.
+    """
+    from pmbuddy.util import concat_from_file, concat_from_stdin
+    from pmbuddy.util.validation import normalize_ids
 
     # First check if PMIDs are piped from standard input.
     if not sys.stdin.isatty():
-        pmid_list = concat_from_stdin(sys.stdin)
-        n_articles = len(pmid_list)
-        pmid_str = ",".join(pmid_list)
+        return concat_from_stdin(sys.stdin)
     elif args.file:
-        pmid_list = concat_from_file(args.file)
-        n_articles = len(pmid_list)
-        pmid_str = ",".join(pmid_list)
+        return concat_from_file(args.file)
     elif args.pmid:
-        pmid_str = args.pmid
-        n_articles = len(pmid_str.split(","))
+        return normalize_ids(args.pmid.split(","))
+    raise ValueError
+
+
+def connect_daemon(args) -> Optional["DaemonClient"]:
+    """Return a client for a running `pmb serve`, if this fetch can use it.
+
+    Options that only apply to an in-process fetch (another backend, worker
+    processes, --no-cache or --refresh) keep the fetch local.
+    """
+    if args.no_daemon or args.backend != "html" or args.workers:
+        return None
+    if args.no_cache or args.refresh:
+        return None
+    from pmbuddy.client import DaemonClient
+
+    client = DaemonClient()
+    return client if client.running() else None
+
+
+def build_article_parser(args) -> Tuple[Any, Optional["ArticleCache"]]:
+    from pmbuddy.cache import ArticleCache, CachedParser
+    from pmbuddy.cache.pages import PageCache
+    from pmbuddy.parsers import ArticleParser, EutilsParser
+    from pmbuddy.util.requests import set_page_cache
+
+    if args.backend == "eutils":
+        article_parser = EutilsParser()
+    elif args.workers:
+        from pmbuddy.pipeline import PipelineParser
+
+        article_parser = PipelineParser(
+            args.workers, args.chunk_size, concurrency=args.concurrency
+        )
+    else:
+        article_parser = ArticleParser
+    cache = None if args.no_cache else ArticleCache()
+    if cache is not None:
+        article_parser = CachedParser(article_parser, cache, refresh=args.refresh)
+        set_page_cache(PageCache(cache.path))
+    # Input IDs are deduplicated, so a one-shot run never fetches an article
+    # twice at once; only the daemon coalesces concurrent requests.
+    return article_parser, cache
+
+
+def is_batched(args) -> bool:
+    """Whether the selected backend fetches whole batches through `fetch_from_ids`.
+
+    The "daemon" backend is set by `main` when a running `pmb serve` is used.
+    """
+    return args.backend in ("eutils", "daemon") or bool(args.workers)
+
+
+def report_daemon_errors(args, article_parser) -> None:
+    """Print the PMIDs of the last batch the daemon failed to fetch."""
+    if args.backend != "daemon":
+        return
+    for pmid, error in article_parser.errors.items():
+        print(f"Failed to fetch {pmid} ({error.category}: {error})", file=sys.stderr)
+
+
+def batch_size(args) -> int:
+    return CONFIG["request"]["eutils"]["batch_size"]
+
+
+def run_job(args, article_parser, pmids: Iterable[str]) -> int:
+    """Fetch into --output with a checkpoint journal; returns the number of failures."""
+    from pmbuddy.jobs import BatchJob
+
+    job = BatchJob(
+        args.output,
+        args.format or "jsonl",
+        resume=args.resume,
+        max_attempts=args.max_attempts,
+        compress=args.gzip or None,
+    )
+    if is_batched(args):
+        summary = job.run_batched(article_parser, pmids, batch_size(args))
+    else:
+        summary = job.run(article_parser, pmids, concurrency=args.concurrency)
+    print(summary.summary(), file=sys.stderr)
+    return summary.failed
+
+
+def stdout_writer(args, fields: Optional[List[str]] = None) -> ArticleWriter:
+    """ArticleWriter for --format on stdout, gzip-compressed with --gzip."""
+    if not args.gzip:
+        return ArticleWriter(sys.stdout, args.format, fields=fields)
+    # Flushing every record would fragment the gzip stream into tiny blocks.
+    handle = gzip_text(sys.stdout.buffer)
+    return ArticleWriter(handle, args.format, fields=fields, flush=False)
+
+
+def close_writer(writer: ArticleWriter) -> None:
+    writer.close()
+    if writer.handle is not sys.stdout:
+        # Ends the gzip stream; stdout itself stays open.
+        writer.handle.close()
+
+
+def stream(args, article_parser, pmids: Iterable[str]) -> int:
+    """Write articles to stdout as they arrive; returns the number written."""
+    import asyncio
+
+    from pmbuddy.util.requests import batched, stream_articles_async
+
+    writer = stdout_writer(args)
+    kept: List["PubmedArticle"] = []
+
+    def emit(article: "PubmedArticle") -> None:
+        writer.write(article)
+        if args.store:
+            kept.append(article)
+
+    if is_batched(args):
+        for batch in batched(pmids, batch_size(args)):
+            for article in article_parser.fetch_from_ids(batch):
+                emit(article)
+            report_daemon_errors(args, article_parser)
+    else:
+
+        async def consume():
+            async for article in stream_articles_async(
+                article_parser, pmids, concurrency=args.concurrency
+            ):
+                emit(article)
+
+        asyncio.run(consume())
+    close_writer(writer)
+    if kept:
+        ArticleStore().append(kept)
+    return writer.count
+
+
+def parse_year(year: str) -> Tuple[int, int]:
+    first, _, last = year.partition("-")
+    return int(first), int(last or first)
+
+
+def run_query(args) -> int:
+    """Answer a `pmb query` from the local store; returns the number of rows."""
+    columns = args.columns.split(",") if args.columns else None
+    table = ArticleStore().query(
+        columns=columns,
+        journal=args.journal,
+        year=parse_year(args.year) if args.year else None,
+        author=args.author,
+        limit=args.limit,
+    )
+    if args.format:
+        writer = stdout_writer(args, fields=table.column_names)
+        for row in table.to_pylist():
+            writer.write_row(row)
+        close_writer(writer)
     else:
-        raise ValueError
-
-    tmp_data = Path("/tmp/pubmed_data.csv")
-    spider = Path(__file__).parent / "spider.py"
-    subprocess.call(f"python {str(spider)} {pmid_str}", shell=True)
-    # Load scraped data into a dataframe.
-    df = pd.read_csv(tmp_data)
-    df[["pub_year", "pub_month"]] = df["pubdate"].str.split(",", n=1, expand=True)
+        from rich.console import Console
+
+        from pmbuddy.util.display import display_table
+
+        df = table.to_pandas()
+        if "journal" in df.columns:
+            df["journal"] = df["journal"].astype(str)
+        subset = [c for c in ["pmid", "title", "authors", "journal"] if c in df]
+        display_table(df, subset, Console())
+    return table.num_rows
+
+
+def run_search(args) -> int:
+    """Answer a `pmb search` from the cache's full-text index; returns the hit count."""
+    from pmbuddy.cache import ArticleCache
+    from pmbuddy.cache.search import SearchIndex
+
+    cache = ArticleCache()
+    index = SearchIndex(cache)
+    index.sync()
+    hits = index.search(args.terms, limit=args.limit)
+    articles = cache.records(pmid for pmid, _ in hits)
+    if not articles:
+        print(f"No cached articles match {args.terms!r}.", file=sys.stderr)
+    show(args, articles)
+    return len(articles)
+
+
+def run_author(args) -> int:
+    """Answer a `pmb author` from the cache's author index; returns the article count."""
+    from pmbuddy.cache import ArticleCache
+    from pmbuddy.cache.authors import AuthorIndex
+    from pmbuddy.util.validation import validate_orcid
+
+    if not (args.name or args.orcid):
+        author_parser.error("give an author name or --orcid")
+    cache = ArticleCache()
+    index = AuthorIndex(cache)
+    index.sync()
+    if args.orcid:
+        pmids = index.by_orcid(validate_orcid(args.orcid), limit=args.limit)
+    else:
+        pmids = index.lookup(args.name, limit=args.limit)
+    articles = cache.records(pmids)
+    if not articles:
+        print(f"No cached articles by {args.orcid or args.name!r}.", file=sys.stderr)
+    show(args, articles)
+    return len(articles)
+
+
+def run_graph(args) -> int:
+    """Crawl the citation graph; prints tab-separated edges or saves --output."""
+    import asyncio
+
+    from pmbuddy.graph import GraphCrawler, seed_pmids
+    from pmbuddy.util import stream_from_file, stream_from_stdin
+    from pmbuddy.util.validation import FormatError
+
+    if args.seeds:
+        seeds = args.seeds
+    elif args.file:
+        seeds = list(stream_from_file(args.file))
+    elif not sys.stdin.isatty():
+        seeds = list(stream_from_stdin(sys.stdin))
+    else:
+        graph_parser.error("give seed PMIDs, --file or PMIDs on standard input")
+    try:
+        seeds = seed_pmids(seeds)
+    except FormatError as e:
+        graph_parser.error(str(e))
+    crawler = GraphCrawler(args.direction, args.concurrency, max_nodes=args.max_nodes)
+    graph = asyncio.run(crawler.expand(seeds, args.depth))
+    if args.output:
+        graph.save(args.output)
+    else:
+        for source, target in graph.edges():
+            sys.stdout.write(f"{source}\t{target}\n")
+    print(
+        f"graph: {len(graph)} PMIDs, {graph.n_edges} edges, "
+        f"{crawler.requests} requests, {len(crawler.failed)} PMIDs failed",
+        file=sys.stderr,
+    )
+    return graph.n_edges
+
+
+def run_watch(args) -> int:
+    """Manage or sync saved searches; returns the exit status."""
+    import asyncio
+    from datetime import datetime
+
+    from pmbuddy.watch import SavedSearches
+
+    searches = SavedSearches()
+    if args.action == "add":
+        since = None
+        if args.since:
+            try:
+                since = datetime.strptime(args.since, "%Y/%m/%d").date()
+            except ValueError:
+                watch_add.error(f"--since must be YYYY/MM/DD, not {args.since!r}")
+        searches.add(args.name, args.query, since)
+        return 0
+    if args.action == "remove":
+        if searches.remove(args.name):
+            return 0
+        print(f"No saved search named {args.name!r}", file=sys.stderr)
+        return 1
+    if args.action == "list":
+        for search in searches.list():
+            sys.stdout.write(
+                f"{search.name}\t{search.query}\t{search.synced_on or 'never'}"
+                f"\t{search.hits}\n"
+            )
+        return 0
+
+    if is_batched(args):
+        watch_run.error("saved searches fetch articles with the html backend")
+    names = args.names or [search.name for search in searches.list()]
+    for name in names:
+        try:
+            searches.get(name)
+        except KeyError as e:
+            watch_run.error(e.args[0])
+    article_parser, cache = build_article_parser(args)
+    refresh_parser = article_parser
+    if cache is not None:
+        from pmbuddy.cache import CachedParser
+
+        # Modified records bypass the cached copy but still update it.
+        refresh_parser = CachedParser(article_parser.parser, cache, refresh=True)
+    writer = stdout_writer(args) if args.format else None
+
+    async def sync_all():
+        from pmbuddy.util.requests import async_client
+
+        results = []
+        async with async_client(args.concurrency) as client:
+            for name in names:
+                results.append(
+                    await searches.sync(
+                        name,
+                        article_parser,
+                        refresh_parser,
+                        client,
+                        on_article=writer.write if writer else None,
+                    )
+                )
+        return results
+
+    results = asyncio.run(sync_all())
+    if writer is not None:
+        close_writer(writer)
+    for result in results:
+        print(result.summary(), file=sys.stderr)
+    return 1 if any(result.failed for result in results) else 0
+
+
+def run_queue(args) -> int:
+    """Create, inspect or merge a sharded work queue; returns the exit status."""
+    from pathlib import Path
+
+    from pmbuddy.shards import ShardQueue
+    from pmbuddy.util.validation import FormatError
+
+    if args.action == "create":
+        try:
+            pmids = read_pmids(args)
+        except FormatError as e:
+            queue_create.error(str(e))
+        except ValueError:
+            queue_create.error("no PMIDs given on stdin, with --file or with --pmid")
+        try:
+            queue = ShardQueue.create(
+                args.queue, pmids, args.shard_size, args.format, args.rate
+            )
+        except FileExistsError as e:
+            queue_create.error(str(e))
+        print(queue.status().summary(), file=sys.stderr)
+        return 0
+    if not Path(args.queue).expanduser().is_file():
+        queue_parser.error(f"no queue at {args.queue}")
+    queue = ShardQueue(args.queue)
+    if args.action == "status":
+        print(queue.status().summary(), file=sys.stderr)
+        if args.failed:
+            for pmid in queue.failed_pmids():
+                sys.stdout.write(pmid + "\n")
+        return 0
+    try:
+        merged = queue.merge(args.output, partial=args.partial)
+    except ValueError as e:
+        print(f"{e}; run more workers or merge with --partial", file=sys.stderr)
+        return 1
+    print(f"merged {merged} shards into {args.output}", file=sys.stderr)
+    return 0
+
+
+def run_worker(args) -> int:
+    """Fetch leased shards until the queue is drained; returns the exit status."""
+    from pathlib import Path
+
+    from pmbuddy.shards import ShardQueue
+
+    if is_batched(args):
+        worker_parser.error("workers fetch articles with the html backend")
+    if not Path(args.queue).expanduser().is_file():
+        worker_parser.error(f"no queue at {args.queue}")
+    article_parser, cache = build_article_parser(args)
+    queue = ShardQueue(args.queue, lease_seconds=args.lease)
+    summary = queue.work(
+        article_parser,
+        args.worker_id,
+        concurrency=args.concurrency,
+        max_shards=args.max_shards,
+        wait=args.wait,
+    )
+    print(summary.summary(), file=sys.stderr)
+    if cache is not None and args.cache_stats:
+        print(cache.stats.summary(), file=sys.stderr)
+    return 1 if summary.failed else 0
+
+
+def run_convert(args) -> int:
+    """Convert identifiers in input order; returns the exit status."""
+    import httpx
+
+    from pmbuddy.cache import ArticleCache
+    from pmbuddy.cache.ids import IdentifierMap, identify_all
+    from pmbuddy.util.validation import FormatError
+
+    try:
+        if args.ids:
+            identified = identify_all(args.ids)
+        elif not sys.stdin.isatty():
+            identified = identify_all(sys.stdin)
+        elif args.file:
+            with open(args.file) as handle:
+                identified = identify_all(handle)
+        elif args.pmid:
+            identified = identify_all(args.pmid.split(","))
+        else:
+            convert_parser.error(
+                "no identifiers given as arguments, on stdin or --file"
+            )
+    except FormatError as e:
+        convert_parser.error(str(e))
+    # Without the cache, identifiers are only kept for this conversion.
+    cache = ArticleCache(":memory:" if args.no_cache else None)
+    id_map = IdentifierMap(cache)
+    try:
+        resolved = id_map.resolve(
+            identified, offline=args.offline, concurrency=args.concurrency
+        )
+    except httpx.HTTPError as e:
+        # Responses that arrived are already stored, so a rerun picks up here.
+        print(f"Conversion interrupted: {e}", file=sys.stderr)
+        return 1
+    print(id_map.stats.summary(), file=sys.stderr)
+    # Long lists are written through the buffer, not flushed line by line.
+    handle = gzip_text(sys.stdout.buffer) if args.gzip else sys.stdout
+    fields = ["input", "pmid", "pmcid", "doi"]
+    writer = ArticleWriter(handle, args.format, fields=fields, flush=False)
+    for pair in identified:
+        ids = resolved.get(pair)
+        if args.to:
+            handle.write(((getattr(ids, args.to) if ids else None) or "") + "\n")
+        else:
+            pmid, pmcid, doi = ids or (None, None, None)
+            writer.write_row(
+                {"input": pair[1], "pmid": pmid, "pmcid": pmcid, "doi": doi}
+            )
+    close_writer(writer)
+    return 0 if len(resolved) == len(set(identified)) else 1
+
+
+def run_serve(args) -> None:
+    """Serve articles until interrupted."""
+    from pmbuddy.server import ArticleService, serve
+
+    if args.backend != "html" or args.workers:
+        serve_parser.error("the daemon only runs the html backend in-process")
+    article_parser, cache = build_article_parser(args)
+    serve(ArticleService(article_parser, cache), args.host, args.port, args.verbose)
+
+
+def show(args, articles: "List[PubmedArticle] | ArticleBatch") -> None:
+    """Write articles with --format, or render them as a table.
+
+    A batch loaded from the cache is only validated into models for the
+    BibTeX, RIS and CSL-JSON exporters.
+    """
+    from pmbuddy.models.records import ArticleBatch
+
+    batch = isinstance(articles, ArticleBatch)
+    if args.format:
+        writer = stdout_writer(args)
+        if batch and args.format in ROW_FORMATS:
+            for row in articles.rows():
+                writer.write_row(row)
+        else:
+            for article in articles.to_models() if batch else articles:
+                writer.write(article)
+        close_writer(writer)
+    elif articles:
+        from rich.console import Console
+
+        from pmbuddy.util.display import display_table
+
+        df = articles.to_dataframe() if batch else to_dataframe(articles)
+        display_table(df, ["pmid", "title", "authors", "journal"], Console())
+
+
+def main() -> None:
+    args = parser.parse_args()
+    if not (args.profile or args.trace):
+        return run(args)
+    from pmbuddy.util.profile import Profiler, set_profiler
+
+    profiler = Profiler()
+    set_profiler(profiler)
+    try:
+        run(args)
+    finally:
+        set_profiler(None)
+        print(profiler.summary(), file=sys.stderr)
+        if args.trace:
+            profiler.write_trace(args.trace)
+            print(f"trace written to {args.trace}", file=sys.stderr)
+
+
+def run(args) -> None:
+    if args.gzip and not (args.format or args.output):
+        parser.error("--gzip compresses --format or --output records")
+    if args.gzip and not args.output and sys.stdout.isatty():
+        parser.error("refusing to write gzip-compressed output to a terminal")
+    if args.output and args.format == "csl-json" and args.command is None:
+        parser.error("csl-json cannot be appended to a job --output; use jsonl")
+    if args.command == "query":
+        exit(0 if run_query(args) else 1)
+    if args.command == "search":
+        exit(0 if run_search(args) else 1)
+    if args.command == "author":
+        exit(0 if run_author(args) else 1)
+    if args.command == "graph":
+        exit(0 if run_graph(args) else 1)
+    if args.command == "serve":
+        run_serve(args)
+        exit(0)
+    if args.command == "watch":
+        exit(run_watch(args))
+    if args.command == "convert":
+        exit(run_convert(args))
+    if args.command == "queue":
+        exit(run_queue(args))
+    if args.command == "worker":
+        exit(run_worker(args))
+
+    from pmbuddy.util.validation import FormatError
+
+    try:
+        pmids = read_pmids(args)
+    except FormatError as e:
+        parser.error(str(e))
+    daemon = connect_daemon(args)
+    if daemon is not None:
+        # A running `pmb serve` already has a warm cache and connection pool.
+        article_parser, cache = daemon, None
+        args.backend = "daemon"
+    else:
+        article_parser, cache = build_article_parser(args)
+
+    # Job mode: append to --output and checkpoint progress in a journal.
+    if args.output:
+        n_failed = run_job(args, article_parser, pmids)
+        if cache is not None and args.cache_stats:
+            print(cache.stats.summary(), file=sys.stderr)
+        exit(1 if n_failed else 0)
+
+    # Streaming mode: emit records incrementally instead of rendering a table.
+    if args.format:
+        n_written = stream(args, article_parser, pmids)
+        if cache is not None and args.cache_stats:
+            print(cache.stats.summary(), file=sys.stderr)
+        exit(0 if n_written else 1)
+
+    # Fetch and parse articles in-process.
+    import asyncio
+
+    from pmbuddy.util.requests import fetch_articles_async
+
+    pmid_list = list(pmids)
+    if is_batched(args):
+        articles = article_parser.fetch_from_ids(pmid_list)
+        report_daemon_errors(args, article_parser)
+    else:
+        articles = asyncio.run(
+            fetch_articles_async(
+                article_parser, pmid_list, concurrency=args.concurrency
+            )
+        )
+    if cache is not None and args.cache_stats:
+        print(cache.stats.summary(), file=sys.stderr)
+    if not articles:
+        print("No articles retrieved.", file=sys.stderr)
+        exit(1)
+    if args.store:
+        ArticleStore().append(articles)
+    display(args, articles)
+    exit(0)
+
+
+def display(args, articles: List["PubmedArticle"]) -> None:
+    from rich.console import Console
+
+    from pmbuddy.util.display import (
+        display_multiple_abstracts,
+        display_single_abstract,
+        display_table,
+    )
+
+    df = to_dataframe(articles)
     subset = ["pmid", "title", "authors", "journal"]
     console = Console()
     if args.abstract:
-        if n_articles > 1:
+        if len(articles) > 1:
             display_multiple_abstracts(df, console)
         else:
             display_single_abstract(df, console)
     else:
         display_table(df, subset, console)
-    exit(0)
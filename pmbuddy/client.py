@@ -0,0 +1,117 @@
+import http.client
+import json
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+from urllib.parse import quote
+
+from pmbuddy.config import CONFIG
+
+if TYPE_CHECKING:
+    from pmbuddy.models import PubmedArticle
+
+
+class DaemonError(Exception):
+    """Raised when the daemon reports a failed fetch."""
+
+    def __init__(self, status: int, error: str, category: str = "other") -> None:
+        super().__init__(error)
+        self.status = status
+        self.category = category
+
+
+class DaemonClient:
+    """Client for a running `pmb serve` daemon.
+
+    Only uses the standard library, so looking up articles through the daemon
+    does not import httpx. It also acts as a batch parser (`fetch_from_ids`)
+    for the CLI; failures of the last batch are kept in `errors`, as
+    DaemonErrors carrying the category the daemon reported.
+    """
+
+    def __init__(
+        self,
+        host: Optional[str] = None,
+        port: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> None:
+        cfg = CONFIG.get("server", {})
+        self.host = host or cfg.get("host", "127.0.0.1")
+        self.port = port or cfg.get("port", 8765)
+        self.timeout = timeout or cfg.get("timeout", 600.0)
+        self.probe_timeout = cfg.get("probe_timeout", 0.25)
+        self.errors: Dict[str, DaemonError] = {}
+        self._conn: Optional[http.client.HTTPConnection] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _request(
+        self,
+        method: str,
+        path: str,
+        body: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+    ) -> Tuple[int, bytes]:
+        if self._conn is None:
+            self._conn = http.client.HTTPConnection(
+                self.host, self.port, timeout=timeout or self.timeout
+            )
+        self._conn.timeout = timeout or self.timeout
+        headers = {"Content-Type": "application/json"}
+        payload = json.dumps(body).encode() if body is not None else None
+        try:
+            self._conn.request(method, path, body=payload, headers=headers)
+            res = self._conn.getresponse()
+            return res.status, res.read()
+        except OSError:
+            self.close()
+            raise
+
+    def running(self) -> bool:
+        """Whether a daemon answers at this address."""
+        try:
+            status, _ = self._request("GET", "/health", timeout=self.probe_timeout)
+        except (OSError, http.client.HTTPException):
+            return False
+        return status == 200
+
+    def health(self) -> Dict[str, Any]:
+        return json.loads(self._request("GET", "/health")[1])
+
+    def article(self, pmid: str) -> "PubmedArticle":
+        """Fetch one article; raises DaemonError when the daemon cannot."""
+        from pmbuddy.models import PubmedArticle
+
+        status, content = self._request("GET", f"/article/{quote(pmid, safe='')}")
+        if status != 200:
+            raise DaemonError(status, **json.loads(content))
+        return PubmedArticle.model_validate_json(content)
+
+    def articles(
+        self, pmids: List[str]
+    ) -> Tuple[List["PubmedArticle"], Dict[str, Dict[str, str]]]:
+        """Fetch a batch of articles; returns the articles and the failed PMIDs."""
+        from pmbuddy.models import PubmedArticle
+
+        status, content = self._request("POST", "/articles", {"pmids": pmids})
+        data = json.loads(content)
+        if status != 200:
+            raise DaemonError(status, **data)
+        articles = [PubmedArticle.model_validate(a) for a in data["articles"]]
+        return articles, data["errors"]
+
+    def fetch_article(self, locator: str) -> "PubmedArticle":
+        return self.article(locator)
+
+    def fetch_from_ids(self, ids: List[str]) -> List["PubmedArticle"]:
+        articles, errors = self.articles(ids)
+        # The daemon answered, but could not fetch these PMIDs upstream.
+        self.errors = {
+            pmid: DaemonError(502, **error) for pmid, error in errors.items()
+        }
+        return articles
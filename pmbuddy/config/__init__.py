@@ -5,14 +5,40 @@ from typing import Dict, Any
 DATA_DIR = Path(__file__).parent
 
 
+def load_toml(path: Path) -> Dict[str, Any]:
+    with open(path, "rb") as toml:
+        return tomllib.load(toml, parse_float=float)
+
+
 def load_toml_files() -> Dict[str, Any]:
     global DATA_DIR
     config = {}
     for toml_file in DATA_DIR.glob("*.toml"):
-        with open(toml_file, "rb") as toml:
-            cfg = tomllib.load(toml, parse_float=float)
-            config[toml_file.stem] = cfg
+        config[toml_file.stem] = load_toml(toml_file)
     return config
 
 
-CONFIG = load_toml_files()
+class Config(dict):
+    """Configuration keyed by TOML file stem, each file parsed on first access.
+
+    Startup only pays for the files a command actually reads.
+    """
+
+    def __missing__(self, key: str) -> Dict[str, Any]:
+        path = DATA_DIR / f"{key}.toml"
+        if not path.is_file():
+            raise KeyError(key)
+        self[key] = cfg = load_toml(path)
+        return cfg
+
+    def __contains__(self, key: object) -> bool:
+        return super().__contains__(key) or (DATA_DIR / f"{key}.toml").is_file()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+
+CONFIG = Config()
@@ -0,0 +1,294 @@
+import asyncio
+import struct
+import sys
+import xml.etree.ElementTree as ET
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    BinaryIO,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+
+import httpx
+import numpy as np
+
+from pmbuddy.config import CONFIG
+from pmbuddy.util.requests import async_client, elink_from_pmids_async
+from pmbuddy.util.validation import FormatError, normalize_ids
+
+if TYPE_CHECKING:
+    from pmbuddy.models import PubmedArticle
+
+# elink link names for each direction of the citation graph.
+LINKNAMES = {
+    "references": "pubmed_pubmed_refs",
+    "cited_by": "pubmed_pubmed_citedin",
+}
+DIRECTIONS = ("references", "cited_by", "both")
+
+MAGIC = b"PMBG\x01"
+
+
+def parse_elink(content: bytes) -> Dict[int, List[int]]:
+    """Map each source PMID of an elink response to the PMIDs it links to."""
+    links = {}
+    for linkset in ET.fromstring(content).iter("LinkSet"):
+        source = linkset.findtext("IdList/Id")
+        if source is None:
+            continue
+        links[int(source)] = [
+            int(node.text) for node in linkset.iterfind("LinkSetDb/Link/Id")
+        ]
+    return links
+
+
+def seed_pmids(seeds: Iterable[str | int]) -> List[int]:
+    """Validate and deduplicate seeds, which must be PMIDs.
+
+    elink only links PMIDs, so PMCIDs and URLs are rejected along with
+    malformed identifiers in a single FormatError.
+    """
+    pmids = normalize_ids(str(seed) for seed in seeds)
+    others = [pmid for pmid in pmids if not pmid.isdigit()]
+    if others:
+        shown = ", ".join(others[:5])
+        more = f" and {len(others) - 5} more" if len(others) > 5 else ""
+        raise FormatError(
+            f"Seeds must be PMIDs, not {shown}{more}; "
+            "convert them with `pmb convert --to pmid`"
+        )
+    return [int(pmid) for pmid in pmids]
+
+
+def as_int64(values: Iterable[int]) -> np.ndarray:
+    if isinstance(values, array) and values.typecode == "q":
+        return np.frombuffer(values, dtype=np.int64)
+    return np.fromiter(values, dtype=np.int64)
+
+
+def sorted_unique(values: np.ndarray) -> np.ndarray:
+    """Sorted distinct values; a plain sort beats np.unique's hashing here."""
+    values = np.sort(values)
+    if len(values) == 0:
+        return values
+    return values[np.concatenate(([True], values[1:] != values[:-1]))]
+
+
+def linknames(direction: str) -> List[str]:
+    if direction not in DIRECTIONS:
+        raise ValueError(
+            f"Unknown direction {direction!r}, expected one of {DIRECTIONS}"
+        )
+    if direction == "both":
+        return list(LINKNAMES.values())
+    return [LINKNAMES[direction]]
+
+
+class CitationGraph:
+    """Citation edges (citing PMID -> cited PMID) in compressed sparse row form.
+
+    `nodes` holds the sorted PMIDs, and the successors of `nodes[i]` are the
+    node indices `targets[offsets[i]:offsets[i + 1]]`. A million edges take
+    about 4 MB instead of the ~100 MB of a list of string pairs.
+    """
+
+    def __init__(self, nodes: array, offsets: array, targets: array) -> None:
+        self.nodes = nodes
+        self.offsets = offsets
+        self.targets = targets
+
+    @classmethod
+    def from_edges(
+        cls, sources: array, targets: array, nodes: Iterable[int] = ()
+    ) -> "CitationGraph":
+        """Build a graph from parallel arrays of citing and cited PMIDs.
+
+        Duplicate edges are dropped; `nodes` adds PMIDs without any edges.
+        Nodes and edges are deduplicated by sorting, without building a
+        Python object per edge.
+        """
+        sources, targets = as_int64(sources), as_int64(targets)
+        all_nodes = sorted_unique(np.concatenate([sources, targets, as_int64(nodes)]))
+        # Node indices fit in 32 bits, so an edge packs into one sortable int64.
+        edges = sorted_unique(
+            (np.searchsorted(all_nodes, sources) << 32)
+            | np.searchsorted(all_nodes, targets)
+        )
+        offsets = np.zeros(len(all_nodes) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(edges >> 32, minlength=len(all_nodes)), out=offsets[1:])
+        return cls(
+            array("q", all_nodes.tobytes()),
+            array("q", offsets.tobytes()),
+            array("i", (edges & 0xFFFFFFFF).astype(np.int32).tobytes()),
+        )
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    @property
+    def n_edges(self) -> int:
+        return len(self.targets)
+
+    def __contains__(self, pmid: int) -> bool:
+        i = bisect_left(self.nodes, pmid)
+        return i < len(self.nodes) and self.nodes[i] == pmid
+
+    def successors(self, pmid: int) -> List[int]:
+        """PMIDs cited by `pmid`."""
+        i = bisect_left(self.nodes, pmid)
+        if i == len(self.nodes) or self.nodes[i] != pmid:
+            return []
+        span = self.targets[self.offsets[i] : self.offsets[i + 1]]
+        return [self.nodes[t] for t in span]
+
+    def edges(self) -> Iterator[Tuple[int, int]]:
+        for i, source in enumerate(self.nodes):
+            for t in self.targets[self.offsets[i] : self.offsets[i + 1]]:
+                yield source, self.nodes[t]
+
+    def write(self, handle: BinaryIO) -> None:
+        handle.write(MAGIC)
+        handle.write(struct.pack("<qq", len(self.nodes), len(self.targets)))
+        for values in (self.nodes, self.offsets, self.targets):
+            if sys.byteorder == "big":
+                values = array(values.typecode, values)
+                values.byteswap()
+            values.tofile(handle)
+
+    @classmethod
+    def read(cls, handle: BinaryIO) -> "CitationGraph":
+        if handle.read(len(MAGIC)) != MAGIC:
+            raise ValueError("Not a citation graph file")
+        n_nodes, n_edges = struct.unpack("<qq", handle.read(16))
+        arrays = []
+        for typecode, length in (("q", n_nodes), ("q", n_nodes + 1), ("i", n_edges)):
+            values = array(typecode)
+            values.fromfile(handle, length)
+            if sys.byteorder == "big":
+                values.byteswap()
+            arrays.append(values)
+        return cls(*arrays)
+
+    def save(self, path: str | Path) -> None:
+        with open(path, "wb") as handle:
+            self.write(handle)
+
+    @classmethod
+    def load(cls, path: str | Path) -> "CitationGraph":
+        with open(path, "rb") as handle:
+            return cls.read(handle)
+
+
+class GraphCrawler:
+    """Breadth-first expansion of the citation graph through E-utilities elink.
+
+    Each level of the frontier is split into batches of `batch_size` PMIDs and
+    fetched by at most `concurrency` requests at a time. PMIDs are visited at
+    most once, and the crawl stops adding nodes after `max_nodes`, which
+    bounds both the frontier and the visited set.
+    """
+
+    def __init__(
+        self,
+        direction: str = "both",
+        concurrency: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        max_nodes: Optional[int] = None,
+    ) -> None:
+        cfg = CONFIG.get("graph", {})
+        self.linknames = linknames(direction)
+        self.concurrency = concurrency or cfg.get("concurrency", 3)
+        self.batch_size = batch_size or cfg.get("batch_size", 100)
+        self.max_nodes = max_nodes or cfg.get("max_nodes", 100000)
+        self.requests = 0
+        self.failed: List[int] = []
+
+    def _batches(self, frontier: List[int]) -> Iterator[Tuple[List[int], str]]:
+        for start in range(0, len(frontier), self.batch_size):
+            for linkname in self.linknames:
+                yield frontier[start : start + self.batch_size], linkname
+
+    async def _links(
+        self, batch: List[int], linkname: str, client: httpx.AsyncClient
+    ) -> Dict[int, List[int]]:
+        self.requests += 1
+        try:
+            content = await elink_from_pmids_async(batch, linkname, client)
+            return parse_elink(content)
+        except (httpx.HTTPError, ET.ParseError, ValueError) as e:
+            # A failed or malformed response loses its batch, not the crawl.
+            print(f"Skipping links of {len(batch)} PMIDs: {e!r}", file=sys.stderr)
+            self.failed.extend(batch)
+            return {}
+
+    async def expand(
+        self,
+        seeds: Iterable[str | int],
+        depth: int = 1,
+        client: Optional[httpx.AsyncClient] = None,
+    ) -> CitationGraph:
+        """Crawl `depth` levels of citations out from `seeds`."""
+        if client is None:
+            async with async_client() as client:
+                return await self.expand(seeds, depth, client)
+        frontier = seed_pmids(seeds)
+        visited: Set[int] = set(frontier)
+        sources, targets = array("q"), array("q")
+        for _ in range(depth):
+            if not frontier:
+                break
+            next_frontier: List[int] = []
+            batches = self._batches(frontier)
+
+            async def worker() -> None:
+                # Workers share one batch iterator, so at most `concurrency`
+                # requests are pending however large the frontier is.
+                for batch, linkname in batches:
+                    links = await self._links(batch, linkname, client)
+                    cited = linkname == LINKNAMES["references"]
+                    for source, linked in links.items():
+                        for pmid in linked:
+                            if pmid not in visited:
+                                if len(visited) >= self.max_nodes:
+                                    continue
+                                visited.add(pmid)
+                                next_frontier.append(pmid)
+                            sources.append(source if cited else pmid)
+                            targets.append(pmid if cited else source)
+
+            await asyncio.gather(*(worker() for _ in range(self.concurrency)))
+            frontier = next_frontier
+        return CitationGraph.from_edges(sources, targets, nodes=visited)
+
+
+async def attach_links(
+    articles: List["PubmedArticle"],
+    direction: str = "both",
+    client: Optional[httpx.AsyncClient] = None,
+) -> List["PubmedArticle"]:
+    """Fill `citation.references` and `citation.cited_by` of fetched articles."""
+    if client is None:
+        async with async_client() as client:
+            return await attach_links(articles, direction, client)
+    crawler = GraphCrawler(direction)
+    pmids = [int(article.pmid) for article in articles]
+    found: Dict[str, Dict[int, List[int]]] = {}
+    for batch, linkname in crawler._batches(pmids):
+        links = await crawler._links(batch, linkname, client)
+        found.setdefault(linkname, {}).update(links)
+    for article in articles:
+        if isinstance(article.citation, str) or article.citation is None:
+            continue
+        for field, linkname in LINKNAMES.items():
+            if linkname in found:
+                linked = found[linkname].get(int(article.pmid), [])
+                setattr(article.citation, field, [str(pmid) for pmid in linked])
+    return articles
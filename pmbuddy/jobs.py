@@ -0,0 +1,218 @@
+import asyncio
+import json
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional
+
+import httpx
+from pydantic import BaseModel
+
+from pmbuddy.client import DaemonError
+from pmbuddy.config import CONFIG
+from pmbuddy.models import PubmedArticle
+from pmbuddy.util.output import ArticleWriter, open_output
+from pmbuddy.util.requests import batched, stream_results_async
+from pmbuddy.util.validation import FormatError
+
+
+def error_category(error: Exception) -> str:
+    """Classify a fetch failure for the journal."""
+    if isinstance(error, DaemonError):
+        # Already classified by the daemon that fetched the PMID.
+        return error.category
+    if isinstance(error, FormatError):
+        return "invalid_id"
+    if isinstance(error, (AttributeError, IndexError, KeyError, ValueError)):
+        # Unexpected page or record layouts; pydantic errors are ValueErrors.
+        return "parse"
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+        return "rate_limited" if status == 429 else f"http_{status // 100}xx"
+    if isinstance(error, httpx.TimeoutException):
+        return "timeout"
+    if isinstance(error, httpx.HTTPError):
+        return "network"
+    if isinstance(error, LookupError):
+        return "not_found"
+    return "other"
+
+
+class JournalEntry(BaseModel):
+    status: str
+    attempts: int = 0
+    error: Optional[str] = None
+
+
+class JobSummary(BaseModel):
+    done: int = 0
+    failed: int = 0
+    skipped: int = 0
+    exhausted: int = 0
+
+    def summary(self) -> str:
+        return (
+            f"job: {self.done} done, {self.failed} failed, "
+            f"{self.skipped} already done, {self.exhausted} out of retries"
+        )
+
+
+class Journal:
+    """Append-only checkpoint log of completed and failed PMIDs.
+
+    Each line is a JSON object such as {"pmid": "...", "status": "done"} or
+    {"pmid": "...", "status": "failed", "error": "http_5xx", "message": "..."}.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+
+    def load(self) -> Dict[str, JournalEntry]:
+        entries: Dict[str, JournalEntry] = {}
+        if not self.path.exists():
+            return entries
+        with open(self.path) as handle:
+            for line in handle:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # A crash can leave a truncated last line behind.
+                    continue
+                entry = entries.setdefault(record["pmid"], JournalEntry(status="new"))
+                entry.status = record["status"]
+                if record["status"] == "failed":
+                    entry.attempts += 1
+                    entry.error = record.get("error")
+        return entries
+
+    def start(self, mode: str = "a") -> None:
+        self.handle = open(self.path, mode)
+
+    def close(self) -> None:
+        self.handle.close()
+
+    def record(self, pmid: str, error: Optional[Exception] = None) -> None:
+        record = {"pmid": pmid, "status": "done"}
+        if error is not None:
+            record.update(
+                status="failed", error=error_category(error), message=str(error)
+            )
+        self.handle.write(json.dumps(record) + "\n")
+        self.handle.flush()
+
+
+class BatchJob:
+    """Fetches PMIDs into an append-only output file next to a checkpoint journal.
+
+    With `resume=True`, PMIDs already in the journal as done are skipped and
+    failed ones are retried until they have failed `max_attempts` times.
+    Articles are written to the output before being journaled, so a crash
+    can at worst duplicate a record, never lose one. Output is gzip-compressed
+    with `compress`, by default when the file name ends in .gz.
+    """
+
+    def __init__(
+        self,
+        output: str | Path,
+        format: str = "jsonl",
+        resume: bool = False,
+        max_attempts: Optional[int] = None,
+        compress: Optional[bool] = None,
+    ) -> None:
+        if format == "csl-json":
+            raise ValueError(
+                "csl-json is a single JSON array and cannot be appended to"
+            )
+        self.output = Path(output)
+        self.format = format
+        self.compress = self.output.suffix == ".gz" if compress is None else compress
+        self.resume = resume
+        self.max_attempts = max_attempts or CONFIG.get("jobs", {}).get(
+            "max_attempts", 3
+        )
+        self.journal = Journal(self.output.with_name(self.output.name + ".journal"))
+        self.summary = JobSummary()
+
+    def pending(self, pmids: Iterable[str]) -> Iterator[str]:
+        """Yield the PMIDs that still need to be fetched."""
+        entries = self.journal.load() if self.resume else {}
+        for pmid in pmids:
+            entry = entries.get(pmid)
+            if entry is None:
+                yield pmid
+            elif entry.status == "done":
+                self.summary.skipped += 1
+            elif entry.attempts >= self.max_attempts:
+                self.summary.exhausted += 1
+            else:
+                yield pmid
+
+    def _open(self) -> ArticleWriter:
+        mode = "a" if self.resume else "w"
+        has_header = self.resume and self.output.exists() and self.output.stat().st_size
+        self.handle = open_output(self.output, mode, self.compress)
+        self.journal.start(mode)
+        return ArticleWriter(self.handle, self.format, header=not has_header)
+
+    def _close(self) -> None:
+        self.handle.close()
+        self.journal.close()
+
+    def _done(self, writer: ArticleWriter, pmid: str, article: PubmedArticle) -> None:
+        writer.write(article)
+        self.journal.record(pmid)
+        self.summary.done += 1
+
+    def _failed(self, pmid: str, error: Exception) -> None:
+        print(f"Failed to fetch {pmid} ({error_category(error)})", file=sys.stderr)
+        self.journal.record(pmid, error)
+        self.summary.failed += 1
+
+    def run(self, parser, pmids: Iterable[str], concurrency: Optional[int] = None):
+        """Fetch with a per-article parser such as ArticleParser or CachedParser."""
+
+        async def consume(writer: ArticleWriter):
+            results = stream_results_async(parser, self.pending(pmids), concurrency)
+            async for pmid, article, error in results:
+                if error is None:
+                    self._done(writer, pmid, article)
+                else:
+                    self._failed(pmid, error)
+
+        writer = self._open()
+        try:
+            asyncio.run(consume(writer))
+        finally:
+            self._close()
+        return self.summary
+
+    def run_batched(self, parser, pmids: Iterable[str], batch_size: int):
+        """Fetch with a batch parser such as EutilsParser or PipelineParser.
+
+        A PMID missing from a batch is journaled with the parser's own error
+        for it when the parser keeps them in `errors`, like DaemonClient.
+        """
+        writer = self._open()
+        try:
+            for batch in batched(self.pending(pmids), batch_size):
+                try:
+                    articles = parser.fetch_from_ids(batch)
+                except Exception as e:
+                    # One malformed record fails its batch, not the whole job.
+                    for pmid in batch:
+                        self._failed(pmid, e)
+                    continue
+                found = {}
+                for article in articles:
+                    found[article.pmid] = article
+                    found[article.pmcid] = article
+                for pmid in batch:
+                    if pmid in found:
+                        self._done(writer, pmid, found[pmid])
+                    else:
+                        error = getattr(parser, "errors", {}).get(pmid)
+                        self._failed(
+                            pmid, error or LookupError(f"{pmid} missing from response")
+                        )
+        finally:
+            self._close()
+        return self.summary
@@ -1,11 +1,32 @@
+import sys
+import unicodedata
 from typing import List, Dict, Any, Optional
 from pydantic import BaseModel, Field
 from pmbuddy.config import CONFIG
 
 
+def fold(text: str) -> str:
+    """Lowercase alphanumerics of `text` with accents removed."""
+    text = unicodedata.normalize("NFKD", text)
+    return "".join(
+        c for c in text if c.isalnum() and not unicodedata.combining(c)
+    ).lower()
+
+
+def author_key(last_name: str, initials: Optional[str] = None) -> str:
+    """Normalized, interned lookup key for an author, e.g. "reyes ma".
+
+    Accents, punctuation and case are dropped so that "Núñez-Ruiz, J." and
+    "Nunez Ruiz J" share a key. Keys are interned because the same few
+    authors recur across many articles.
+    """
+    key = f"{fold(last_name)} {fold(initials or '')}".strip()
+    return sys.intern(key)
+
+
 class PublicationDate(BaseModel):
     year: int
-    month: int | str
+    month: Optional[int | str] = None
     day: Optional[int] = None
 
 
@@ -25,11 +46,45 @@ class Citation(BaseModel):
     issue_num: Optional[int] = None
     article_num: Optional[str] = None
     pages: Optional[PageRange] = None
+    # PMIDs linked through E-utilities, see `pmbuddy.graph.attach_links`.
+    references: Optional[List[str]] = None
+    cited_by: Optional[List[str]] = None
+
+
+class Author(BaseModel):
+    last_name: str
+    fore_name: Optional[str] = None
+    initials: Optional[str] = None
+    affiliation: Optional[str] = None
+    orcid: Optional[str] = None
+    collective: bool = False
+
+    @classmethod
+    def from_name(cls, name: str, **fields) -> "Author":
+        """Split a display name such as "Maria A Reyes" into its parts."""
+        *fore, last = name.split() or [name]
+        fore_name = " ".join(fore) or None
+        initials = "".join(part[0] for part in fore).upper() or None
+        fields = {"fore_name": fore_name, "initials": initials, **fields}
+        return cls(last_name=last, **fields)
+
+    @property
+    def name(self) -> str:
+        if self.collective or not self.fore_name:
+            return self.last_name
+        return f"{self.fore_name} {self.last_name}"
+
+    @property
+    def key(self) -> str:
+        if self.collective:
+            return author_key(self.last_name)
+        return author_key(self.last_name, self.initials)
 
 
 class Article(BaseModel):
     title: Optional[str] = Field(default=None)
     authors: Optional[List[str]] = Field(default=None)
+    author_records: Optional[List[Author]] = Field(default=None)
     citation: Optional[Citation | str] = Field(default=None)
     abstract: Optional[str] = Field(default=None)
 
@@ -68,5 +123,6 @@ class PubmedArticle(Article):
             "article_num": self.citation.article_num,
             "issue_num": self.citation.issue_num,
             "doi": self.citation.doi,
+            "abstract": self.abstract,
             "url": f"{CONFIG['urls']['PMID_ROOT']}/{self.pmid}/",
         }
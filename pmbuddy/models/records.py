@@ -0,0 +1,232 @@
+import json
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+)
+
+from pmbuddy.config import CONFIG
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from pmbuddy.models import PubmedArticle
+
+# msgpack is optional; it is loaded by `require_msgpack`.
+msgpack = None
+
+# Serialization formats accepted by `ArticleBatch.dumps` and `loads`.
+SERIALIZERS = ("json", "msgpack")
+
+
+def require_msgpack() -> None:
+    global msgpack
+    if msgpack is not None:
+        return
+    try:
+        import msgpack as _msgpack
+    except ImportError:
+        raise ImportError(
+            "msgpack serialization requires msgpack: pip install pmbuddy[msgpack]"
+        ) from None
+    msgpack = _msgpack
+
+
+class ArticleRecord(NamedTuple):
+    """The flat fields of `PubmedArticle.json()` as a tuple.
+
+    Records are built without validation, so they should only be made from
+    trusted data such as validated models or the article cache. Nested
+    details that the flat form drops (pages, author records, links) are
+    only available on the pydantic models.
+    """
+
+    title: Optional[str]
+    authors: Optional[List[str]]
+    pmcid: str
+    pmid: str
+    journal: Optional[str]
+    pub_month: Optional[int | str]
+    pub_year: Optional[int]
+    article_num: Optional[str]
+    issue_num: Optional[int]
+    doi: Optional[str]
+    abstract: Optional[str]
+
+    @classmethod
+    def from_model(cls, article: "PubmedArticle") -> "ArticleRecord":
+        citation = article.citation
+        if not hasattr(citation, "journal"):
+            return cls(
+                article.title,
+                article.authors,
+                article.pmcid,
+                article.pmid,
+                None,
+                None,
+                None,
+                None,
+                None,
+                None,
+                article.abstract,
+            )
+        date = citation.publication_date
+        return cls(
+            article.title,
+            article.authors,
+            article.pmcid,
+            article.pmid,
+            citation.journal,
+            date.month,
+            date.year,
+            citation.article_num,
+            citation.issue_num,
+            citation.doi,
+            article.abstract,
+        )
+
+    @classmethod
+    def from_dump(cls, data: Dict[str, Any]) -> "ArticleRecord":
+        """Build a record from a decoded `PubmedArticle.model_dump_json()`."""
+        citation = data.get("citation")
+        if not isinstance(citation, dict):
+            citation = {}
+        date = citation.get("publication_date") or {}
+        return cls(
+            data.get("title"),
+            data.get("authors"),
+            data["pmcid"],
+            data["pmid"],
+            citation.get("journal"),
+            date.get("month"),
+            date.get("year"),
+            citation.get("article_num"),
+            citation.get("issue_num"),
+            citation.get("doi"),
+            data.get("abstract"),
+        )
+
+    def to_model(self) -> "PubmedArticle":
+        """Validate the record back into a `PubmedArticle`."""
+        from pmbuddy.models import Citation, PublicationDate, PubmedArticle
+
+        citation = None
+        if self.journal is not None:
+            citation = Citation(
+                journal=self.journal,
+                publication_date=PublicationDate(
+                    year=self.pub_year, month=self.pub_month
+                ),
+                doi=self.doi,
+                issue_num=self.issue_num,
+                article_num=self.article_num,
+            )
+        return PubmedArticle(
+            title=self.title,
+            authors=self.authors,
+            citation=citation,
+            abstract=self.abstract,
+            pmcid=self.pmcid,
+            pmid=self.pmid,
+        )
+
+
+FIELDS = ArticleRecord._fields
+
+
+class ArticleBatch:
+    """Column-oriented container of article records.
+
+    Each field is stored as one list, so a batch of n articles holds
+    len(FIELDS) lists instead of n nested pydantic objects, and converts to
+    a DataFrame, an Arrow table or a serialized payload without visiting
+    every object. Rows are materialized as `ArticleRecord`s on demand.
+    """
+
+    __slots__ = ("columns",)
+
+    def __init__(self, columns: Optional[Dict[str, List[Any]]] = None) -> None:
+        self.columns = columns or {name: [] for name in FIELDS}
+
+    @classmethod
+    def from_records(cls, records: Iterable[ArticleRecord]) -> "ArticleBatch":
+        records = list(records)
+        if not records:
+            return cls()
+        return cls(dict(zip(FIELDS, map(list, zip(*records)))))
+
+    @classmethod
+    def from_models(cls, articles: Iterable["PubmedArticle"]) -> "ArticleBatch":
+        return cls.from_records(map(ArticleRecord.from_model, articles))
+
+    @classmethod
+    def from_dumps(cls, dumps: Iterable[str | bytes]) -> "ArticleBatch":
+        """Load cached `model_dump_json()` payloads without revalidating them."""
+        return cls.from_records(ArticleRecord.from_dump(json.loads(d)) for d in dumps)
+
+    def __len__(self) -> int:
+        return len(self.columns["pmid"])
+
+    def __getitem__(self, index: int) -> ArticleRecord:
+        return ArticleRecord._make(self.columns[name][index] for name in FIELDS)
+
+    def __iter__(self) -> Iterator[ArticleRecord]:
+        return map(ArticleRecord._make, zip(*(self.columns[name] for name in FIELDS)))
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, ArticleBatch) and self.columns == other.columns
+
+    def append(self, record: ArticleRecord) -> None:
+        for name, value in zip(FIELDS, record):
+            self.columns[name].append(value)
+
+    def urls(self) -> List[str]:
+        root = CONFIG["urls"]["PMID_ROOT"]
+        return [f"{root}/{pmid}/" for pmid in self.columns["pmid"]]
+
+    def rows(self) -> Iterator[Dict[str, Any]]:
+        """Flat dicts in the form of `PubmedArticle.json()`, e.g. for ArticleWriter."""
+        keys = (*FIELDS, "url")
+        columns = [self.columns[name] for name in FIELDS]
+        for values in zip(*columns, self.urls()):
+            yield dict(zip(keys, values))
+
+    def to_models(self) -> List["PubmedArticle"]:
+        return [record.to_model() for record in self]
+
+    def to_dataframe(self) -> "pd.DataFrame":
+        import pandas as pd
+
+        return pd.DataFrame(
+            {**self.columns, "url": self.urls()}, columns=[*FIELDS, "url"]
+        )
+
+    def dumps(self, format: str = "json") -> bytes:
+        """Serialize the columns as JSON or msgpack."""
+        payload = {"fields": list(FIELDS), "columns": self.columns}
+        if format == "json":
+            return json.dumps(payload, ensure_ascii=False).encode()
+        if format == "msgpack":
+            require_msgpack()
+            return msgpack.packb(payload)
+        raise ValueError(f"Unknown format {format!r}, expected one of {SERIALIZERS}")
+
+    @classmethod
+    def loads(cls, data: bytes, format: str = "json") -> "ArticleBatch":
+        if format == "json":
+            payload = json.loads(data)
+        elif format == "msgpack":
+            require_msgpack()
+            payload = msgpack.unpackb(data)
+        else:
+            raise ValueError(
+                f"Unknown format {format!r}, expected one of {SERIALIZERS}"
+            )
+        if tuple(payload["fields"]) != FIELDS:
+            raise ValueError(f"Unexpected fields {payload['fields']}")
+        return cls(payload["columns"])
@@ -0,0 +1,194 @@
+import re
+import xml.etree.ElementTree as ET
+from typing import List, Optional
+
+import httpx
+
+from pmbuddy.config import CONFIG
+from pmbuddy.models import (
+    Article,
+    Author,
+    Citation,
+    PageRange,
+    PublicationDate,
+    PubmedArticle,
+)
+from pmbuddy.util import NOT_AVAILABLE
+from pmbuddy.util.profile import span
+from pmbuddy.util.requests import efetch_from_pmids
+from pmbuddy.util.validation import FormatError, validate_orcid
+
+MONTHS = (
+    "Jan",
+    "Feb",
+    "Mar",
+    "Apr",
+    "May",
+    "Jun",
+    "Jul",
+    "Aug",
+    "Sep",
+    "Oct",
+    "Nov",
+    "Dec",
+)
+# The first year of a MedlineDate, and the month right after it if there is one.
+MEDLINE_DATE_RE = re.compile(r"(\d{4})(?:\s+([A-Z][a-z]{2}))?")
+
+
+def xml_text(node: Optional[ET.Element], path: str) -> str:
+    """Return the stripped text of the first match of `path`, including inline markup."""
+    if node is None:
+        return NOT_AVAILABLE
+    child = node.find(path)
+    if child is None:
+        return NOT_AVAILABLE
+    return "".join(child.itertext()).strip()
+
+
+class EutilsParser:
+    """Builds Pubmed articles from batched E-utilities efetch responses.
+
+    A single efetch request returns up to `batch_size` records, so large PMID
+    lists need far fewer requests than fetching one HTML page per article.
+    """
+
+    def __init__(
+        self, batch_size: Optional[int] = None, client: Optional[httpx.Client] = None
+    ) -> None:
+        eutils = CONFIG.get("request", {}).get("eutils", {})
+        self.batch_size = batch_size or eutils.get("batch_size", 200)
+        self.client = client
+
+    def fetch_from_id(self, id: str) -> Article:
+        articles = self.fetch_from_ids([id])
+        if not articles:
+            raise LookupError(f"PMID {id} not found")
+        return articles[0]
+
+    def fetch_from_ids(self, ids: List[str]) -> List[PubmedArticle]:
+        articles = []
+        for start in range(0, len(ids), self.batch_size):
+            batch = ids[start : start + self.batch_size]
+            content = efetch_from_pmids(batch, client=self.client)
+            articles.extend(self.parse_efetch(content))
+        return articles
+
+    def parse_efetch(self, content: bytes) -> List[PubmedArticle]:
+        """Parse an efetch PubmedArticleSet into article models."""
+        with span("parse.tree", engine="xml"):
+            root = ET.fromstring(content)
+        return [self._parse_article(node) for node in root.iter("PubmedArticle")]
+
+    def _parse_article(self, node: ET.Element) -> PubmedArticle:
+        medline = node.find("MedlineCitation")
+        article_node = medline.find("Article")
+        ids = self._extract_ids(node)
+        authors = self._extract_authors(article_node)
+        citation = self._extract_citation(article_node, ids)
+        title = xml_text(article_node, "ArticleTitle")
+        pmid = xml_text(medline, "PMID")
+        abstract = self._extract_abstract(article_node)
+        with span("model"):
+            return PubmedArticle(
+                title=title,
+                authors=[author.name for author in authors],
+                author_records=authors,
+                citation=citation,
+                pmcid=ids.get("pmc", NOT_AVAILABLE),
+                pmid=pmid,
+                abstract=abstract,
+            )
+
+    def _extract_ids(self, node: ET.Element) -> dict:
+        """Map ArticleId types (pubmed, pmc, doi, ...) to their values."""
+        ids = {}
+        for id_node in node.iterfind("PubmedData/ArticleIdList/ArticleId"):
+            ids[id_node.get("IdType")] = (id_node.text or "").strip()
+        return ids
+
+    def _extract_citation(self, article_node: ET.Element, ids: dict) -> Citation:
+        journal_node = article_node.find("Journal")
+        journal = xml_text(journal_node, "ISOAbbreviation")
+        if journal == NOT_AVAILABLE:
+            journal = xml_text(journal_node, "Title")
+        issue = xml_text(journal_node, "JournalIssue/Issue")
+        doi = ids.get("doi")
+        if doi is None:
+            doi_node = article_node.find("ELocationID[@EIdType='doi']")
+            doi = doi_node.text.strip() if doi_node is not None else NOT_AVAILABLE
+        citation = Citation(
+            journal=journal,
+            publication_date=self._parse_pubdate(
+                journal_node.find("JournalIssue"), article_node
+            ),
+            doi=doi,
+            issue_num=int(issue) if issue.isdigit() else None,
+            article_num=None,
+            pages=self._parse_pages(xml_text(article_node, "Pagination/MedlinePgn")),
+        )
+        return citation
+
+    def _parse_pubdate(
+        self, issue_node: ET.Element, article_node: ET.Element
+    ) -> PublicationDate:
+        pubdate = issue_node.find("PubDate")
+        year = xml_text(pubdate, "Year")
+        month = xml_text(pubdate, "Month")
+        day = xml_text(pubdate, "Day")
+        if year == NOT_AVAILABLE:
+            # Seasonal or ranged dates, e.g. "2024 May-Jun", "Winter 2023" or
+            # "2023-2024", only have a MedlineDate; keep the first year.
+            medline_date = xml_text(pubdate, "MedlineDate")
+            match = MEDLINE_DATE_RE.search(medline_date)
+            if match:
+                year, month = match.groups()
+            else:
+                year = xml_text(article_node, "ArticleDate/Year")
+            if not year.isdigit():
+                raise FormatError(f"No publication year in {medline_date!r}")
+            month = month if month in MONTHS else None
+        return PublicationDate(
+            year=year,
+            month=None if month == NOT_AVAILABLE else month,
+            day=day if day.isdigit() else None,
+        )
+
+    def _parse_pages(self, pages: str) -> Optional[PageRange]:
+        """Expand MEDLINE page ranges such as 301-9 into a PageRange."""
+        match = re.fullmatch(r"(\d+)-(\d+)", pages)
+        if not match:
+            return None
+        start, end = match.groups()
+        end = start[: len(start) - len(end)] + end
+        return PageRange(start=int(start), end=int(end))
+
+    def _extract_authors(self, article_node: ET.Element) -> List[Author]:
+        authors = []
+        for author in article_node.iterfind("AuthorList/Author"):
+            collective = author.find("CollectiveName")
+            if collective is not None:
+                name = "".join(collective.itertext()).strip()
+                authors.append(Author(last_name=name, collective=True))
+                continue
+            fields = {
+                "fore_name": xml_text(author, "ForeName"),
+                "initials": xml_text(author, "Initials"),
+                "affiliation": xml_text(author, "AffiliationInfo/Affiliation"),
+            }
+            fields = {k: v for k, v in fields.items() if v != NOT_AVAILABLE}
+            orcid = author.find("Identifier[@Source='ORCID']")
+            if orcid is not None and orcid.text:
+                try:
+                    fields["orcid"] = validate_orcid(orcid.text)
+                except FormatError:
+                    pass
+            authors.append(Author(last_name=xml_text(author, "LastName"), **fields))
+        return authors
+
+    def _extract_abstract(self, article_node: ET.Element) -> str:
+        sections = [
+            "".join(section.itertext()).strip()
+            for section in article_node.iterfind("Abstract/AbstractText")
+        ]
+        return "\n".join(sections) if sections else NOT_AVAILABLE
@@ -1,37 +1,127 @@
 import re
-from typing import Tuple, List
-from bs4 import BeautifulSoup
-from pmbuddy.models import PageRange, PublicationDate, Citation, Article, PubmedArticle
+import sys
+from typing import TYPE_CHECKING, Dict, Optional, Tuple, List
+from urllib.parse import parse_qs, urlsplit
+from pmbuddy.models import (
+    PageRange,
+    PublicationDate,
+    Citation,
+    Article,
+    Author,
+    PubmedArticle,
+)
 from pmbuddy.util import (
     extract_text,
     extract_node,
     extract_nodes,
+    make_soup,
+    parsing_engine,
 )
+from pmbuddy.util.profile import span
 from pmbuddy.util.requests import (
-    soup_from_url,
-    soup_from_pmid,
-    soup_from_pmcid,
+    content_from_url,
+    content_from_pmid,
+    content_from_pmcid,
+    content_from_url_async,
+    content_from_pmid_async,
+    content_from_pmcid_async,
 )
 
+from pmbuddy.util.validation import FormatError, validate_orcid
+
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
+
+
+def author_from_listing(
+    name: str, href: str, affiliation: Optional[str], orcid: Optional[str]
+) -> Author:
+    """Build an author record from an entry of a PubMed page's author list.
+
+    The author link searches for "Last Initials" (e.g. `/?term=Reyes+MA`),
+    which is used to split the displayed name.
+    """
+    name = name.strip()
+    fields = {"affiliation": affiliation or None}
+    if orcid:
+        try:
+            fields["orcid"] = validate_orcid(orcid)
+        except FormatError:
+            pass
+    term = parse_qs(urlsplit(href).query).get("term", [""])[0].split()
+    if len(term) > 1 and term[-1].isupper() and name.endswith(" ".join(term[:-1])):
+        last_name = " ".join(term[:-1])
+        fore_name = name[: -len(last_name)].strip() or None
+        return Author(
+            last_name=last_name, fore_name=fore_name, initials=term[-1], **fields
+        )
+    return Author.from_name(name, **fields)
+
 
 class PubmedParser:
     """Contains the logic for parsing a Pubmed article."""
 
-    def fetch_from_url(self, url: str) -> Article:
-        soup = soup_from_url(url)
-        article = self._parse_soup(soup)
+    def __init__(self, engine: Optional[str] = None) -> None:
+        self.engine = engine or parsing_engine()
+
+    def fetch_from_url(self, url: str, revalidate: bool = False) -> Article:
+        with span("article", id=url):
+            content = content_from_url(url, revalidate)
+            return self.parse_page(content)
+
+    def fetch_from_id(self, id: str, revalidate: bool = False) -> Article:
+        print("Fetching:", id, file=sys.stderr)
+        with span("article", id=id):
+            if id.startswith("PMC"):
+                content = content_from_pmcid(id, revalidate)
+                article = self.parse_page(content)
+            else:
+                content = content_from_pmid(id, revalidate)
+                article = self.parse_overview(content)
         return article
 
-    def fetch_from_id(self, id: str) -> Article:
-        print("Fetching:", id)
-        if id.startswith("PMC"):
-            soup = soup_from_pmcid(id)
-            article = self._parse_soup(soup)
-        else:
-            soup = soup_from_pmid(id)
-            article = self._parse_soup_overview(soup)
+    async def fetch_from_url_async(
+        self, url: str, client, revalidate: bool = False
+    ) -> Article:
+        with span("article", id=url):
+            content = await content_from_url_async(url, client, revalidate)
+            return self.parse_page(content)
+
+    async def fetch_from_id_async(
+        self, id: str, client, revalidate: bool = False
+    ) -> Article:
+        print("Fetching:", id, file=sys.stderr)
+        with span("article", id=id):
+            if id.startswith("PMC"):
+                content = await content_from_pmcid_async(id, client, revalidate)
+                article = self.parse_page(content)
+            else:
+                content = await content_from_pmid_async(id, client, revalidate)
+                article = self.parse_overview(content)
         return article
 
+    def parse_page(self, content: bytes) -> Article:
+        """Parse a full-text PMC article page."""
+        # The strainer engine needs to know the root node up front, but PMC
+        # metadata is spread across the page, so the full tree is built.
+        engine = "lxml" if self.engine == "lxml" else "html.parser"
+        soup = make_soup(content, engine)
+        with span("parse.extract"):
+            return self._parse_soup(soup)
+
+    def parse_overview(self, content: bytes) -> Article:
+        """Parse a PubMed abstract page."""
+        if self.engine == "lxml":
+            from pmbuddy.parsers import xpath
+
+            with span("parse.tree", engine="lxml"):
+                tree = xpath.parse_html(content)
+            with span("parse.extract"):
+                return self._parse_tree_overview(tree)
+        soup = make_soup(content, self.engine, root_id="article-page")
+        with span("parse.extract"):
+            return self._parse_soup_overview(soup)
+
     def _parse_soup(self, soup) -> Article:
         """Extract metadata from a PubMed article."""
         citation = self._extract_citation(soup)
@@ -39,15 +129,16 @@ class PubmedParser:
         title = extract_text(soup, "h1", class_="content-title")
         authors = self._extract_authors(soup)
         abstract = self._extract_abstract(soup)
-        article = PubmedArticle(
-            title=title,
-            authors=authors,
-            citation=citation,
-            pmcid=pmcid,
-            pmid=pmid,
-            abstract=abstract,
-        )
-        return article
+        with span("model"):
+            return PubmedArticle(
+                title=title,
+                authors=authors,
+                author_records=[Author.from_name(name) for name in authors],
+                citation=citation,
+                pmcid=pmcid,
+                pmid=pmid,
+                abstract=abstract,
+            )
 
     def _parse_pubdate(self, citation: str) -> List[str]:
         pubdate_regex = r"(\d{4})\s(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec).+"
@@ -68,6 +159,7 @@ class PubmedParser:
         journal = extract_text(header_node, "button")
         doi = extract_text(header_node, "span", class_="citation-doi")
         authors = [a.text for a in extract_nodes(author_list, "a", class_="full-name")]
+        author_records = self._extract_author_records(root_node, author_list)
         citation_fields = extract_text(header_node, "span", class_="cit")
         pub_date = self._parse_pubdate(citation_fields)
         citation = Citation(
@@ -84,17 +176,114 @@ class PubmedParser:
         pmcid = extract_text(identifier_node, "a", class_="id-link")
         # Abstract content
         abstract = extract_text(abstract_node, "p")
-        article = PubmedArticle(
-            title=title,
-            authors=authors,
-            citation=citation,
-            pmcid=pmcid,
-            pmid=pmid,
-            abstract=abstract,
+        with span("model"):
+            return PubmedArticle(
+                title=title,
+                authors=authors,
+                author_records=author_records,
+                citation=citation,
+                pmcid=pmcid,
+                pmid=pmid,
+                abstract=abstract,
+            )
+
+    def _extract_author_records(self, root_node, author_list) -> List[Author]:
+        """Structured authors with their first listed affiliation and ORCID."""
+        affiliations: Dict[str, str] = {
+            li["data-affiliation-id"]: "".join(
+                li.find_all(string=True, recursive=False)
+            ).strip()
+            for li in root_node.find_all("li", attrs={"data-affiliation-id": True})
+        }
+        records = []
+        for item in extract_nodes(author_list, "span", class_="authors-list-item"):
+            name = extract_node(item, "a", class_="full-name")
+            if name is None:
+                continue
+            link = extract_node(item, "a", class_="affiliation-link")
+            orcid = item.find("a", href=re.compile("orcid.org/"))
+            records.append(
+                author_from_listing(
+                    name.text,
+                    name.get("href", ""),
+                    affiliations.get(link["href"].lstrip("#")) if link else None,
+                    orcid["href"] if orcid else None,
+                )
+            )
+        return records
+
+    def _parse_tree_overview(self, tree) -> Article:
+        """Same as `_parse_soup_overview`, over an lxml tree with precompiled XPath."""
+        from pmbuddy.parsers import xpath
+
+        first, every, text = xpath.first, xpath.every, xpath.text
+        # Extract key nodes
+        root_node = first(xpath.ROOT, tree)
+        abstract_node = first(xpath.ABSTRACT, root_node)
+        header_node = first(xpath.HEADER, root_node)
+        author_list = first(xpath.AUTHOR_LIST, header_node)
+        # Retrieve text from key nodes
+        title = text(xpath.TITLE, header_node)
+        # Citation data
+        journal = text(xpath.JOURNAL, header_node)
+        doi = text(xpath.DOI, header_node)
+        authors = [a.text_content() for a in every(xpath.AUTHORS, author_list)]
+        author_records = self._extract_tree_author_records(root_node, author_list)
+        citation_fields = text(xpath.CITATION, header_node)
+        pub_date = self._parse_pubdate(citation_fields)
+        citation = Citation(
+            journal=journal,
+            publication_date=pub_date,
+            article_num=None,
+            issue_num=None,
+            pages=None,
+            doi=doi,
         )
-        return article
+        # Extract identifiers
+        identifier_node = first(xpath.IDENTIFIERS, header_node)
+        pmid = text(xpath.PMID, identifier_node)
+        pmcid = text(xpath.PMCID, identifier_node)
+        # Abstract content
+        abstract = text(xpath.PARAGRAPH, abstract_node)
+        with span("model"):
+            return PubmedArticle(
+                title=title,
+                authors=authors,
+                author_records=author_records,
+                citation=citation,
+                pmcid=pmcid,
+                pmid=pmid,
+                abstract=abstract,
+            )
+
+    def _extract_tree_author_records(self, root_node, author_list) -> List[Author]:
+        """Same as `_extract_author_records`, over an lxml tree."""
+        from pmbuddy.parsers import xpath
 
-    def _extract_citation(self, soup: BeautifulSoup) -> Citation:
+        affiliations = {
+            li.get("data-affiliation-id"): "".join(li.xpath("text()")).strip()
+            for li in xpath.every(xpath.AFFILIATIONS, root_node)
+        }
+        records = []
+        for item in xpath.every(xpath.AUTHOR_ITEMS, author_list):
+            name = xpath.first(xpath.AUTHORS, item)
+            if name is None:
+                continue
+            link = xpath.first(xpath.AFFILIATION_LINK, item)
+            orcid = xpath.first(xpath.ORCID_LINK, item)
+            records.append(
+                author_from_listing(
+                    name.text_content(),
+                    name.get("href", ""),
+                    affiliations.get(link.get("href").lstrip("#"))
+                    if link is not None
+                    else None,
+                    orcid.get("href") if orcid is not None else None,
+                )
+            )
+        return records
+
+    def _extract_citation(self, soup: "BeautifulSoup") -> Citation:
         """Extract citation fields."""
         # Div containing all citation data
         main_node = soup.find("div", id="mc")
@@ -108,7 +297,7 @@ class PubmedParser:
         doi = extract_text(p2_node, "a")
 
         # Parse citation elements using regex
-        pub_date = self._parse_citation_fields(citation_fields)
+        pub_date = self._parse_pubdate(citation_fields)
         citation = Citation(
             journal=journal,
             publication_date=pub_date,
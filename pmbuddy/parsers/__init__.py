@@ -1,12 +1,22 @@
 from pmbuddy.parsers.Pubmed import PubmedParser
+from pmbuddy.parsers.Eutils import EutilsParser
 
 
 class ArticleParser:
     @staticmethod
-    def fetch_article(locator: str):
+    def fetch_article(locator: str, revalidate: bool = False):
         parser = PubmedParser()
         if "http" in locator:
-            article = parser.fetch_from_url(locator)
+            article = parser.fetch_from_url(locator, revalidate)
         else:
-            article = parser.fetch_from_id(locator)
+            article = parser.fetch_from_id(locator, revalidate)
+        return article
+
+    @staticmethod
+    async def fetch_article_async(locator: str, client, revalidate: bool = False):
+        parser = PubmedParser()
+        if "http" in locator:
+            article = await parser.fetch_from_url_async(locator, client, revalidate)
+        else:
+            article = await parser.fetch_from_id_async(locator, client, revalidate)
         return article
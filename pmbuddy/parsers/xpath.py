@@ -0,0 +1,62 @@
+"""Precompiled XPath selectors for the lxml parsing engine.
+
+Each selector mirrors a `find` call in `PubmedParser._parse_soup_overview`, and
+the helpers below reproduce the fallbacks of `extract_node` and `extract_text`
+so that both engines build identical articles. Requires lxml.
+"""
+
+from typing import List, Optional
+
+from lxml import etree, html
+
+from pmbuddy.util import NOT_AVAILABLE
+
+
+def has_class(name: str) -> str:
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+ROOT = etree.XPath("//div[@id='article-page']")
+ABSTRACT = etree.XPath(".//div[@id='abstract']")
+HEADER = etree.XPath(".//header[@id='heading']")
+AUTHOR_LIST = etree.XPath(f".//div[{has_class('authors-list')}]")
+AUTHORS = etree.XPath(f".//a[{has_class('full-name')}]")
+AUTHOR_ITEMS = etree.XPath(f".//span[{has_class('authors-list-item')}]")
+AFFILIATION_LINK = etree.XPath(f".//a[{has_class('affiliation-link')}]")
+AFFILIATIONS = etree.XPath(".//li[@data-affiliation-id]")
+ORCID_LINK = etree.XPath(".//a[contains(@href, 'orcid.org/')]")
+TITLE = etree.XPath(".//h1")
+JOURNAL = etree.XPath(".//button")
+DOI = etree.XPath(f".//span[{has_class('citation-doi')}]")
+CITATION = etree.XPath(f".//span[{has_class('cit')}]")
+IDENTIFIERS = etree.XPath(".//ul[@id='full-view-identifiers']")
+PMID = etree.XPath(f".//strong[{has_class('current-id')}]")
+PMCID = etree.XPath(f".//a[{has_class('id-link')}]")
+PARAGRAPH = etree.XPath(".//p")
+
+
+def parse_html(content: bytes) -> html.HtmlElement:
+    return html.fromstring(content)
+
+
+def first(selector: etree.XPath, parent) -> Optional[html.HtmlElement]:
+    """Like `extract_node`: raises AttributeError when the parent is missing."""
+    if parent is None:
+        raise AttributeError("parent node not found")
+    nodes = selector(parent)
+    return nodes[0] if nodes else None
+
+
+def every(selector: etree.XPath, parent) -> List[html.HtmlElement]:
+    """Like `extract_nodes`."""
+    if parent is None:
+        raise AttributeError("parent node not found")
+    return selector(parent)
+
+
+def text(selector: etree.XPath, parent) -> str:
+    """Like `extract_text`: missing nodes yield a placeholder."""
+    try:
+        return first(selector, parent).text_content().strip()
+    except AttributeError:
+        return NOT_AVAILABLE
@@ -0,0 +1,137 @@
+import asyncio
+import os
+import sys
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+import httpx
+
+from pmbuddy.config import CONFIG
+from pmbuddy.models import PubmedArticle
+from pmbuddy.parsers import PubmedParser
+from pmbuddy.util import parsing_engine
+from pmbuddy.util.validation import FormatError
+from pmbuddy.util.requests import (
+    async_client,
+    content_from_pmcid_async,
+    content_from_pmid_async,
+)
+
+Page = Tuple[str, bytes]
+
+
+def parse_chunk(engine: str, chunk: List[Page]) -> List[Optional[Dict[str, Any]]]:
+    """Parse downloaded pages into serialized articles (runs in a worker process)."""
+    parser = PubmedParser(engine)
+    articles = []
+    for locator, content in chunk:
+        try:
+            if locator.startswith("PMC"):
+                article = parser.parse_page(content)
+            else:
+                article = parser.parse_overview(content)
+            articles.append(article.model_dump())
+        except Exception as e:
+            # A malformed page must not abort the rest of the batch.
+            print(
+                f"Failed to parse {locator} ({type(e).__name__}: {e}). Skipping",
+                file=sys.stderr,
+            )
+            articles.append(None)
+    return articles
+
+
+class PipelineParser:
+    """Fetches pages concurrently and parses them on a pool of worker processes.
+
+    HTML parsing is CPU-bound, so with a single process parsing caps the
+    throughput of large batches no matter how many downloads run at once.
+    Here downloaded pages are grouped into chunks of `chunk_size` and parsed
+    by `workers` processes while the next pages are still downloading.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        chunk_size: Optional[int] = None,
+        concurrency: Optional[int] = None,
+        engine: Optional[str] = None,
+    ) -> None:
+        cfg = CONFIG.get("pipeline", {})
+        self.workers = workers or cfg.get("workers") or os.cpu_count() or 1
+        self.chunk_size = chunk_size or cfg.get("chunk_size", 16)
+        self.concurrency = concurrency
+        self.engine = engine or parsing_engine()
+
+    def fetch_from_ids(self, ids: List[str]) -> List[PubmedArticle]:
+        return asyncio.run(self.fetch_from_ids_async(ids))
+
+    async def fetch_from_ids_async(
+        self, ids: List[str], client: Optional[httpx.AsyncClient] = None
+    ) -> List[PubmedArticle]:
+        with ProcessPoolExecutor(self.workers) as pool:
+            if client is None:
+                async with async_client(self.concurrency) as client:
+                    return await self._run(ids, client, pool)
+            return await self._run(ids, client, pool)
+
+    def parse_pages(self, pages: List[Page]) -> List[Optional[PubmedArticle]]:
+        """Parse already downloaded pages on the worker pool."""
+        chunks = [
+            pages[i : i + self.chunk_size]
+            for i in range(0, len(pages), self.chunk_size)
+        ]
+        with ProcessPoolExecutor(self.workers) as pool:
+            results = pool.map(parse_chunk, [self.engine] * len(chunks), chunks)
+            return [
+                PubmedArticle.model_validate(a) if a else None
+                for chunk in results
+                for a in chunk
+            ]
+
+    async def _run(
+        self, ids: List[str], client: httpx.AsyncClient, pool: Executor
+    ) -> List[PubmedArticle]:
+        loop = asyncio.get_running_loop()
+        # Only the locators are kept per chunk, so page bodies can be freed
+        # as soon as a worker has received them.
+        submitted = []
+        chunk: List[Page] = []
+        async for page in self._download(ids, client):
+            chunk.append(page)
+            if len(chunk) >= self.chunk_size:
+                future = loop.run_in_executor(pool, parse_chunk, self.engine, chunk)
+                submitted.append(([locator for locator, _ in chunk], future))
+                chunk = []
+        if chunk:
+            future = loop.run_in_executor(pool, parse_chunk, self.engine, chunk)
+            submitted.append(([locator for locator, _ in chunk], future))
+        parsed = {}
+        for locators, future in submitted:
+            for locator, data in zip(locators, await future):
+                if data is not None:
+                    parsed[locator] = PubmedArticle.model_validate(data)
+        return [parsed[id] for id in ids if id in parsed]
+
+    async def _download(
+        self, ids: List[str], client: httpx.AsyncClient
+    ) -> AsyncIterator[Page]:
+        """Yield (locator, content) pairs in completion order."""
+        limits = CONFIG.get("request", {}).get("limits", {})
+        semaphore = asyncio.Semaphore(self.concurrency or limits.get("concurrency", 10))
+
+        async def download(id: str) -> Optional[Page]:
+            async with semaphore:
+                print("Fetching:", id, file=sys.stderr)
+                try:
+                    if id.startswith("PMC"):
+                        return id, await content_from_pmcid_async(id, client)
+                    return id, await content_from_pmid_async(id, client)
+                except (httpx.HTTPError, FormatError) as e:
+                    print(f"Failed to fetch {id} ({e}). Skipping", file=sys.stderr)
+                    return None
+
+        for task in asyncio.as_completed([download(id) for id in dict.fromkeys(ids)]):
+            page = await task
+            if page is not None:
+                yield page
@@ -0,0 +1,227 @@
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+from urllib.parse import unquote
+
+import httpx
+
+from pmbuddy.config import CONFIG
+from pmbuddy.jobs import error_category
+from pmbuddy.models import PubmedArticle
+from pmbuddy.util.inflight import InFlight
+from pmbuddy.util.requests import async_client
+from pmbuddy.util.validation import FormatError, canonical_id, normalize_ids
+
+if TYPE_CHECKING:
+    from pmbuddy.cache import ArticleCache
+
+Result = Tuple[str, Optional[PubmedArticle], Optional[Exception]]
+
+
+def server_address() -> Tuple[str, int]:
+    """Host and port of the daemon, from `config/server.toml`."""
+    cfg = CONFIG.get("server", {})
+    return cfg.get("host", "127.0.0.1"), cfg.get("port", 8765)
+
+
+def error_status(error: Exception) -> int:
+    """HTTP status reported to daemon clients for a failed fetch."""
+    if isinstance(error, FormatError):
+        return 400
+    if isinstance(error, httpx.HTTPStatusError):
+        return 404 if error.response.status_code == 404 else 502
+    if isinstance(error, httpx.TimeoutException):
+        return 504
+    return 502
+
+
+def error_record(error: Exception) -> Dict[str, str]:
+    return {"error": str(error) or repr(error), "category": error_category(error)}
+
+
+class ArticleService:
+    """Fetches articles on an event loop that outlives individual requests.
+
+    The parser (and the cache behind it) and a single pooled AsyncClient are
+    created once, so requests after the first skip imports, opening the cache
+    and new TLS handshakes. At most `concurrency` articles are fetched at a
+    time, and concurrent requests for the same PMID share one fetch.
+    """
+
+    def __init__(
+        self,
+        parser,
+        cache: Optional["ArticleCache"] = None,
+        concurrency: Optional[int] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ) -> None:
+        limits = CONFIG.get("request", {}).get("limits", {})
+        self.parser = parser
+        self.cache = cache
+        self.concurrency = concurrency or limits.get("concurrency", 10)
+        self.transport = transport
+        self.inflight = InFlight()
+        self.started_at = time.time()
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.client: Optional[httpx.AsyncClient] = None
+
+    def _call(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+
+    async def _open(self) -> None:
+        self.semaphore = asyncio.Semaphore(self.concurrency)
+        self.client = async_client(self.concurrency, transport=self.transport)
+
+    def start(self) -> "ArticleService":
+        self.thread.start()
+        self._call(self._open())
+        return self
+
+    def close(self) -> None:
+        if self.client is not None:
+            self._call(self.client.aclose())
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+        if self.cache is not None:
+            self.cache.close()
+
+    async def _fetch_bounded(self, pmid: str) -> PubmedArticle:
+        async with self.semaphore:
+            return await self.parser.fetch_article_async(pmid, self.client)
+
+    async def _fetch(self, pmid: str) -> Result:
+        try:
+            article = await self.inflight.run(pmid, lambda: self._fetch_bounded(pmid))
+            return pmid, article, None
+        except Exception as e:
+            # Any per-PMID failure is reported, so gather never loses the batch.
+            return pmid, None, e
+
+    async def _fetch_all(self, pmids: List[str]) -> List[Result]:
+        return await asyncio.gather(*(self._fetch(pmid) for pmid in pmids))
+
+    def fetch(self, pmids: List[str]) -> List[Result]:
+        """Fetch articles from any thread; results keep the order of `pmids`."""
+        return self._call(self._fetch_all(pmids))
+
+    def health(self) -> Dict[str, Any]:
+        status = {
+            "status": "ok",
+            "pid": os.getpid(),
+            "uptime": round(time.time() - self.started_at, 3),
+            "fetches": self.inflight.started,
+            "coalesced": self.inflight.coalesced,
+        }
+        if self.cache is not None:
+            status["cache"] = self.cache.stats.model_dump()
+        return status
+
+
+class ArticleHandler(BaseHTTPRequestHandler):
+    """JSON API of the daemon.
+
+    GET /article/{pmid}  one PubmedArticle
+    POST /articles       {"pmids": [...]} -> {"articles": [...], "errors": {...}}
+    GET /health          daemon and cache statistics
+    """
+
+    server: "ArticleServer"
+    protocol_version = "HTTP/1.1"
+
+    def _send(self, status: int, body: str) -> None:
+        payload = body.encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _send_error(self, status: int, error: Exception) -> None:
+        self._send(status, json.dumps(error_record(error)))
+
+    def do_GET(self) -> None:
+        service = self.server.service
+        if self.path == "/health":
+            return self._send(200, json.dumps(service.health()))
+        if not self.path.startswith("/article/"):
+            return self._send_error(404, LookupError(f"No route for {self.path}"))
+        try:
+            pmid = canonical_id(unquote(self.path[len("/article/") :]))
+        except FormatError as e:
+            return self._send_error(400, e)
+        [(_, article, error)] = service.fetch([pmid])
+        if error is not None:
+            return self._send_error(error_status(error), error)
+        self._send(200, article.model_dump_json())
+
+    def do_POST(self) -> None:
+        if self.path != "/articles":
+            return self._send_error(404, LookupError(f"No route for {self.path}"))
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+            pmids = normalize_ids(body.get("pmids", []))
+        except (FormatError, ValueError, AttributeError, TypeError) as e:
+            return self._send_error(400, e)
+        articles, errors = [], {}
+        for pmid, article, error in self.server.service.fetch(pmids):
+            if error is None:
+                articles.append(article.model_dump_json())
+            else:
+                errors[pmid] = error_record(error)
+        self._send(
+            200,
+            f'{{"articles": [{", ".join(articles)}], "errors": {json.dumps(errors)}}}',
+        )
+
+    def log_message(self, format: str, *args) -> None:
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class ArticleServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: Tuple[str, int],
+        service: ArticleService,
+        verbose: bool = False,
+    ) -> None:
+        super().__init__(address, ArticleHandler)
+        self.service = service
+        self.verbose = verbose
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+def serve(
+    service: ArticleService,
+    host: Optional[str] = None,
+    port: Optional[int] = None,
+    verbose: bool = False,
+) -> None:
+    """Run the daemon in the foreground until interrupted."""
+    default_host, default_port = server_address()
+    service.start()
+    server = ArticleServer(
+        (host or default_host, port or default_port), service, verbose
+    )
+    print(f"Serving articles on {server.url}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
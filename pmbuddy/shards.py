@@ -0,0 +1,455 @@
+import asyncio
+import os
+import shutil
+import socket
+import sqlite3
+import sys
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional
+
+from pydantic import BaseModel
+
+from pmbuddy.config import CONFIG
+from pmbuddy.jobs import error_category
+from pmbuddy.util.output import ArticleWriter, open_output
+from pmbuddy.util.ratelimit import configured_rate, get_limiter
+from pmbuddy.util.requests import async_client, batched, stream_results_async
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS shards (
+    id INTEGER PRIMARY KEY,
+    pmids TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    worker TEXT,
+    token TEXT,
+    lease_expires REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    written INTEGER,
+    failed TEXT,
+    done_at REAL
+);
+CREATE INDEX IF NOT EXISTS shards_status ON shards (status, lease_expires);
+"""
+
+# File extension of a shard's output per format.
+EXTENSIONS = {
+    "jsonl": ".jsonl",
+    "csv": ".csv",
+    "tsv": ".tsv",
+    "bibtex": ".bib",
+    "ris": ".ris",
+}
+
+
+class Lease(BaseModel):
+    shard: int
+    pmids: List[str]
+    worker: str
+    # Changes every time the shard is leased, so a worker whose lease expired
+    # and was re-issued can no longer renew or complete it.
+    token: str
+
+
+class QueueStatus(BaseModel):
+    shards: int = 0
+    pending: int = 0
+    leased: int = 0
+    expired: int = 0
+    abandoned: int = 0
+    done: int = 0
+    pmids: int = 0
+    written: int = 0
+    failed: int = 0
+
+    def summary(self) -> str:
+        return (
+            f"queue: {self.done}/{self.shards} shards done, {self.leased} leased, "
+            f"{self.expired} expired, {self.pending} pending, "
+            f"{self.abandoned} abandoned; {self.written} of {self.pmids} PMIDs "
+            f"written, {self.failed} failed"
+        )
+
+
+class WorkerSummary(BaseModel):
+    worker: str
+    shards: int = 0
+    done: int = 0
+    failed: int = 0
+    lost: int = 0
+
+    def summary(self) -> str:
+        return (
+            f"worker {self.worker}: {self.shards} shards, {self.done} done, "
+            f"{self.failed} failed, {self.lost} leases lost"
+        )
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class ShardQueue:
+    """A durable queue of PMID shards leased to `pmb worker` processes.
+
+    The coordinator splits a PMID list into shards in a SQLite file. Workers
+    on one host, or on several hosts sharing the file and its shard directory,
+    claim a shard at a time under a lease, renew the lease while fetching,
+    and write the shard's articles to a part file that is renamed into place
+    only if the lease is still theirs. A shard whose worker stopped renewing
+    is re-issued once its lease expires, so each shard ends up written by
+    exactly one worker and no PMID is fetched twice by live workers. `merge`
+    concatenates the finished shards in order.
+
+    The queue also holds the request rate its workers share. Each worker
+    limits itself to that rate divided by the number of live leases, so
+    adding workers does not multiply the load on NCBI.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        lease_seconds: Optional[float] = None,
+        max_attempts: Optional[int] = None,
+    ) -> None:
+        cfg = CONFIG.get("shards", {})
+        self.path = Path(path).expanduser()
+        self.lease_seconds = lease_seconds or cfg.get("lease_seconds", 300.0)
+        self.max_attempts = max_attempts or cfg.get("max_attempts", 5)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Transactions are begun explicitly, see `_transaction`.
+        self.conn = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+        self.conn.executescript(SCHEMA)
+        meta = dict(self.conn.execute("SELECT key, value FROM meta"))
+        self.format = meta.get("format", "jsonl")
+        # Queues created before the rate was stored leave each worker at its own.
+        self.rate = float(meta["rate"]) if "rate" in meta else None
+        # Next to the queue, so hosts may mount the pair at different paths.
+        self.shard_dir = self.path.with_name(self.path.name + ".shards")
+
+    @classmethod
+    def create(
+        cls,
+        path: str | Path,
+        pmids: Iterable[str],
+        shard_size: Optional[int] = None,
+        format: str = "jsonl",
+        rate: Optional[float] = None,
+        **kwargs,
+    ) -> "ShardQueue":
+        """Split `pmids` into shards of `shard_size` in a new queue at `path`.
+
+        `rate` is the requests per second all workers share, by default
+        NCBI's limit from request.toml.
+        """
+        if format not in EXTENSIONS:
+            raise ValueError(
+                f"Shards of {format!r} output cannot be merged, "
+                f"expected one of {tuple(EXTENSIONS)}"
+            )
+        if Path(path).expanduser().exists():
+            raise FileExistsError(f"{path} already exists")
+        shard_size = shard_size or CONFIG.get("shards", {}).get("shard_size", 1000)
+        queue = cls(path, **kwargs)
+        queue.format = format
+        queue.rate = rate or configured_rate()
+        queue.shard_dir.mkdir(parents=True, exist_ok=True)
+        with queue._transaction():
+            queue.conn.executemany(
+                "INSERT INTO meta VALUES (?, ?)",
+                [("format", format), ("rate", str(queue.rate))],
+            )
+            queue.conn.executemany(
+                "INSERT INTO shards (pmids, size) VALUES (?, ?)",
+                (
+                    ("\n".join(shard), len(shard))
+                    for shard in batched(pmids, shard_size)
+                ),
+            )
+        return queue
+
+    def close(self) -> None:
+        self.conn.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[None]:
+        # BEGIN IMMEDIATE takes the write lock before the first read, so two
+        # workers can never both see a shard as claimable.
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.conn.execute("COMMIT")
+
+    def shard_path(self, shard: int) -> Path:
+        return self.shard_dir / f"shard-{shard:06d}{EXTENSIONS[self.format]}"
+
+    def part_path(self, lease: Lease) -> Path:
+        return self.shard_dir / f"shard-{lease.shard:06d}.{lease.token}.part"
+
+    def claim(self, worker: str, now: Optional[float] = None) -> Optional[Lease]:
+        """Lease the first pending or expired shard to `worker`, if any."""
+        now = time.time() if now is None else now
+        with self._transaction():
+            row = self.conn.execute(
+                "SELECT id, pmids FROM shards WHERE attempts < ? AND (status = "
+                "'pending' OR (status = 'leased' AND lease_expires < ?)) "
+                "ORDER BY id LIMIT 1",
+                (self.max_attempts, now),
+            ).fetchone()
+            if row is None:
+                return None
+            token = uuid.uuid4().hex
+            self.conn.execute(
+                "UPDATE shards SET status = 'leased', worker = ?, token = ?, "
+                "lease_expires = ?, attempts = attempts + 1 WHERE id = ?",
+                (worker, token, now + self.lease_seconds, row[0]),
+            )
+        return Lease(shard=row[0], pmids=row[1].split("\n"), worker=worker, token=token)
+
+    def renew(self, lease: Lease, now: Optional[float] = None) -> bool:
+        """Extend a lease; False if it expired and was re-issued meanwhile."""
+        now = time.time() if now is None else now
+        with self._transaction():
+            renewed = self.conn.execute(
+                "UPDATE shards SET lease_expires = ? "
+                "WHERE id = ? AND token = ? AND status = 'leased'",
+                (now + self.lease_seconds, lease.shard, lease.token),
+            ).rowcount
+        return bool(renewed)
+
+    def release(self, lease: Lease, refund: bool = True) -> None:
+        """Give a shard back unfinished, e.g. when its worker is interrupted.
+
+        With `refund` the attempt is handed back too. A shard that failed is
+        released without it, so one that keeps failing is abandoned after
+        `max_attempts`.
+        """
+        with self._transaction():
+            self.conn.execute(
+                "UPDATE shards SET status = 'pending', token = NULL, "
+                "attempts = attempts - ? WHERE id = ? AND token = ? "
+                "AND status = 'leased'",
+                (int(refund), lease.shard, lease.token),
+            )
+        self.part_path(lease).unlink(missing_ok=True)
+
+    def complete(self, lease: Lease, written: int, failed: List[str]) -> bool:
+        """Move a shard's part file into place; False if the lease was lost."""
+        part = self.part_path(lease)
+        with self._transaction():
+            row = self.conn.execute(
+                "SELECT token, status FROM shards WHERE id = ?", (lease.shard,)
+            ).fetchone()
+            if row != (lease.token, "leased"):
+                part.unlink(missing_ok=True)
+                return False
+            # Renamed while holding the write lock, so a re-issued lease
+            # cannot complete the same shard in between.
+            os.replace(part, self.shard_path(lease.shard))
+            self.conn.execute(
+                "UPDATE shards SET status = 'done', written = ?, failed = ?, "
+                "done_at = ? WHERE id = ?",
+                (written, "\n".join(failed), time.time(), lease.shard),
+            )
+        return True
+
+    def worker_rate(self, now: Optional[float] = None) -> Optional[float]:
+        """This worker's share of the queue's rate, split over the live leases."""
+        if self.rate is None:
+            return None
+        now = time.time() if now is None else now
+        (live,) = self.conn.execute(
+            "SELECT COUNT(*) FROM shards WHERE status = 'leased' AND lease_expires >= ?",
+            (now,),
+        ).fetchone()
+        return self.rate / max(1, live)
+
+    def share_rate(self) -> None:
+        """Limit this process to its share of the queue's rate."""
+        rate = self.worker_rate()
+        if rate is not None:
+            get_limiter().set_rate(rate)
+
+    def status(self, now: Optional[float] = None) -> QueueStatus:
+        now = time.time() if now is None else now
+        status = QueueStatus()
+        rows = self.conn.execute(
+            "SELECT status, lease_expires, attempts, size, written, failed FROM shards"
+        )
+        for state, expires, attempts, size, written, failed in rows:
+            status.shards += 1
+            status.pmids += size
+            if state == "done":
+                status.done += 1
+                status.written += written
+                status.failed += len(failed.split("\n")) if failed else 0
+            elif state == "leased" and expires >= now:
+                status.leased += 1
+            elif attempts >= self.max_attempts:
+                status.abandoned += 1
+            elif state == "pending":
+                status.pending += 1
+            else:
+                status.expired += 1
+        return status
+
+    def failed_pmids(self) -> List[str]:
+        """PMIDs that failed to fetch in finished shards, in shard order."""
+        rows = self.conn.execute(
+            "SELECT failed FROM shards WHERE status = 'done' AND failed != '' "
+            "ORDER BY id"
+        )
+        return [pmid for (failed,) in rows for pmid in failed.split("\n")]
+
+    def merge(
+        self,
+        output: str | Path,
+        compress: Optional[bool] = None,
+        partial: bool = False,
+    ) -> int:
+        """Concatenate finished shards into `output`; returns the shard count.
+
+        Raises ValueError if some shards are unfinished, unless `partial`.
+        CSV and TSV keep only the first shard's header. Output is
+        gzip-compressed with `compress`, by default when it ends in .gz.
+        """
+        output = Path(output)
+        status = self.status()
+        if status.done < status.shards and not partial:
+            raise ValueError(
+                f"{status.shards - status.done} of {status.shards} shards "
+                "are not finished"
+            )
+        compress = output.suffix == ".gz" if compress is None else compress
+        has_header = self.format in ("csv", "tsv")
+        header_written = False
+        shards = [
+            shard
+            for (shard,) in self.conn.execute(
+                "SELECT id FROM shards WHERE status = 'done' ORDER BY id"
+            )
+        ]
+        with open_output(output, "w", compress) as merged:
+            for shard in shards:
+                with open(self.shard_path(shard)) as handle:
+                    if has_header:
+                        header = handle.readline()
+                        if not header_written and header:
+                            merged.write(header)
+                            header_written = True
+                    shutil.copyfileobj(handle, merged)
+        return len(shards)
+
+    async def run_shard(
+        self,
+        lease: Lease,
+        parser,
+        client,
+        summary: WorkerSummary,
+        concurrency: Optional[int] = None,
+    ) -> None:
+        """Fetch one leased shard into its part file and complete it."""
+        lost = asyncio.Event()
+        poll = CONFIG.get("shards", {}).get("poll_seconds", 10.0)
+
+        async def keep_alive():
+            while True:
+                await asyncio.sleep(self.lease_seconds / 3)
+                if not self.renew(lease):
+                    lost.set()
+                    return
+
+        async def rebalance():
+            # Workers joining or leaving change everyone's share of the rate.
+            while True:
+                self.share_rate()
+                await asyncio.sleep(poll)
+
+        renewer = asyncio.create_task(keep_alive())
+        balancer = asyncio.create_task(rebalance())
+        failed: List[str] = []
+        done = 0
+        try:
+            with open(self.part_path(lease), "w") as handle:
+                writer = ArticleWriter(handle, self.format, flush=False)
+                results = stream_results_async(
+                    parser, lease.pmids, concurrency, client=client
+                )
+                async for pmid, article, error in results:
+                    if lost.is_set():
+                        # Another worker owns the shard now; stop fetching it.
+                        await results.aclose()
+                        break
+                    if error is None:
+                        try:
+                            writer.write(article)
+                            done += 1
+                            continue
+                        except Exception as e:
+                            error = e
+                    print(
+                        f"Failed to fetch {pmid} ({error_category(error)})",
+                        file=sys.stderr,
+                    )
+                    failed.append(pmid)
+                writer.close()
+        except (KeyboardInterrupt, asyncio.CancelledError):
+            self.release(lease)
+            raise
+        except BaseException:
+            # Counted as an attempt, so a shard that always fails is abandoned.
+            self.release(lease, refund=False)
+            raise
+        finally:
+            renewer.cancel()
+            balancer.cancel()
+        summary.shards += 1
+        if lost.is_set() or not self.complete(lease, done, failed):
+            self.part_path(lease).unlink(missing_ok=True)
+            summary.lost += 1
+            return
+        summary.done += done
+        summary.failed += len(failed)
+
+    def work(
+        self,
+        parser,
+        worker: Optional[str] = None,
+        concurrency: Optional[int] = None,
+        max_shards: Optional[int] = None,
+        wait: bool = False,
+    ) -> WorkerSummary:
+        """Claim and fetch shards until none is left to claim.
+
+        With `wait`, keep polling while other workers hold leases, so shards
+        of workers that die are picked up once their leases expire.
+        """
+        poll = CONFIG.get("shards", {}).get("poll_seconds", 10.0)
+        summary = WorkerSummary(worker=worker or default_worker_id())
+
+        async def consume():
+            async with async_client(concurrency) as client:
+                while max_shards is None or summary.shards < max_shards:
+                    lease = self.claim(summary.worker)
+                    if lease is not None:
+                        await self.run_shard(
+                            lease, parser, client, summary, concurrency
+                        )
+                        continue
+                    status = self.status()
+                    if not wait or not (status.leased or status.expired):
+                        return
+                    await asyncio.sleep(poll)
+
+        asyncio.run(consume())
+        return summary
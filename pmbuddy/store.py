@@ -0,0 +1,162 @@
+import uuid
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, List, Optional, Tuple
+
+from pmbuddy.config import CONFIG
+
+if TYPE_CHECKING:
+    from pmbuddy.models import PubmedArticle
+
+# pyarrow is optional and slow to import; it is loaded by `require_pyarrow`.
+pa = pc = ds = None
+
+# Columns returned by `ArticleStore.query` unless others are requested.
+DEFAULT_COLUMNS = ["pmid", "title", "authors", "journal", "pub_year"]
+
+
+def require_pyarrow() -> None:
+    global pa, pc, ds
+    if pa is not None:
+        return
+    try:
+        import pyarrow
+        import pyarrow.compute
+        import pyarrow.dataset
+    except ImportError:
+        raise ImportError(
+            "The article store requires pyarrow: pip install pmbuddy[store]"
+        ) from None
+    pa, pc, ds = pyarrow, pyarrow.compute, pyarrow.dataset
+
+
+def schema() -> "pa.Schema":
+    require_pyarrow()
+    return pa.schema(
+        [
+            ("pmid", pa.string()),
+            ("pmcid", pa.string()),
+            ("title", pa.string()),
+            ("authors", pa.list_(pa.string())),
+            # Few distinct journals across millions of rows.
+            ("journal", pa.dictionary(pa.int32(), pa.string())),
+            ("pub_year", pa.int32()),
+            ("pub_month", pa.string()),
+            ("issue_num", pa.int32()),
+            ("doi", pa.string()),
+            ("abstract", pa.string()),
+        ]
+    )
+
+
+def to_table(articles: Iterable["PubmedArticle"]) -> "pa.Table":
+    """Convert articles into an Arrow table with list-typed authors."""
+    from pmbuddy.models.records import ArticleBatch
+
+    article_schema = schema()
+    batch = ArticleBatch.from_models(articles)
+    columns = {name: batch.columns[name] for name in article_schema.names}
+    columns["pub_month"] = [None if m is None else str(m) for m in columns["pub_month"]]
+    return pa.table(columns, schema=article_schema)
+
+
+class ArticleStore:
+    """Parquet dataset of fetched articles, partitioned by publication year.
+
+    Queries only read the requested columns, and filters on journal and
+    year are pushed down to the scan, so whole partitions and row groups
+    are skipped without being decoded.
+    """
+
+    def __init__(self, path: Optional[str | Path] = None) -> None:
+        require_pyarrow()
+        cfg = CONFIG.get("store", {})
+        self.path = Path(path or cfg.get("path", "store")).expanduser()
+        self.row_group_size = cfg.get("row_group_size", 65536)
+        self.partitioning = ds.partitioning(
+            pa.schema([("pub_year", pa.int32())]), flavor="hive"
+        )
+
+    def dataset(self) -> Optional["ds.Dataset"]:
+        if not self.path.exists():
+            return None
+        return ds.dataset(
+            self.path, schema=schema(), format="parquet", partitioning=self.partitioning
+        )
+
+    def pmids(self) -> set:
+        dataset = self.dataset()
+        if dataset is None:
+            return set()
+        return set(dataset.to_table(columns=["pmid"]).column("pmid").to_pylist())
+
+    def append(self, articles: Iterable["PubmedArticle"]) -> int:
+        """Add articles that are not stored yet; returns how many were written."""
+        known = self.pmids()
+        new = {}
+        for article in articles:
+            if article.pmid not in known:
+                new[article.pmid] = article
+        if not new:
+            return 0
+        ds.write_dataset(
+            to_table(new.values()),
+            self.path,
+            format="parquet",
+            partitioning=self.partitioning,
+            basename_template=f"part-{uuid.uuid4().hex}-{{i}}.parquet",
+            existing_data_behavior="overwrite_or_ignore",
+            max_rows_per_group=self.row_group_size,
+        )
+        return len(new)
+
+    def query(
+        self,
+        columns: Optional[List[str]] = None,
+        journal: Optional[str] = None,
+        year: Optional[Tuple[int, int]] = None,
+        author: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> "pa.Table":
+        """Return matching articles, reading only `columns`.
+
+        `year` is an inclusive (first, last) range. `author` matches either a
+        full author name or a last name.
+        """
+        columns = columns or DEFAULT_COLUMNS
+        dataset = self.dataset()
+        if dataset is None:
+            return schema().empty_table().select(columns)
+        condition = None
+        if journal:
+            condition = ds.field("journal") == journal
+        if year:
+            first, last = year
+            in_range = (ds.field("pub_year") >= first) & (ds.field("pub_year") <= last)
+            condition = in_range if condition is None else condition & in_range
+        scan_columns = list(columns)
+        if author and "authors" not in scan_columns:
+            scan_columns.append("authors")
+        scanner = dataset.scanner(columns=scan_columns, filter=condition)
+        batches, n_rows = [], 0
+        for batch in scanner.to_batches():
+            if author:
+                batch = self._filter_author(batch, author)
+            if batch.num_rows == 0:
+                continue
+            batches.append(batch)
+            n_rows += batch.num_rows
+            if limit and n_rows >= limit:
+                break
+        table = pa.Table.from_batches(batches, schema=scanner.projected_schema)
+        if limit:
+            table = table.slice(0, limit)
+        return table.select(columns)
+
+    def _filter_author(self, batch: "pa.RecordBatch", author: str) -> "pa.RecordBatch":
+        authors = batch.column("authors")
+        names = pc.list_flatten(authors)
+        matches = pc.or_(
+            pc.equal(names, author), pc.ends_with(names, pattern=" " + author)
+        )
+        rows = pc.unique(pc.filter(pc.list_parent_indices(authors), matches))
+        return batch.take(rows)
@@ -1,10 +1,18 @@
 from pathlib import Path
-from typing import List, Optional, TextIO
-
-from bs4.element import Tag
+from typing import TYPE_CHECKING, Iterator, List, Optional, TextIO
 
 from pmbuddy.config import CONFIG
-from pmbuddy.models import PubmedArticle
+from pmbuddy.util.profile import span
+from pmbuddy.util.validation import normalize_ids
+
+# Placeholder the parsers store for text a page or record does not have.
+NOT_AVAILABLE = "Text not available"
+
+# bs4 is imported by `make_soup`, so code paths that never parse a page
+# (cache hits, E-utilities batches) do not pay for it at startup.
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
+    from bs4.element import Tag
 
 
 def detect_article_source(url: str) -> Optional[str]:
@@ -20,32 +28,66 @@ def detect_article_source(url: str) -> Optional[str]:
 
 
 def generate_urls_from_ids(pmid_list: List[str | int]):
-    return [f"{CONFIG["urls"]["PMID_ROOT"]}/{id}" for id in pmid_list]
+    return [f"{CONFIG['urls']['PMID_ROOT']}/{id}" for id in pmid_list]
+
+
+# Parsing engines accepted by `make_soup` and `PubmedParser`.
+ENGINES = ("html.parser", "strainer", "lxml")
+
+
+def parsing_engine() -> str:
+    """Return the parsing engine set in `config/request.toml`."""
+    return CONFIG.get("request", {}).get("parsing", {}).get("engine", "html.parser")
+
+
+def make_soup(
+    content: bytes, engine: str = "html.parser", root_id: Optional[str] = None
+) -> "BeautifulSoup":
+    """Build a soup object with the given parsing engine.
+
+    The "strainer" engine only builds the subtree of the element with
+    `root_id`, which skips navigation, scripts and footers entirely. The
+    "lxml" engine uses lxml's tree builder and requires lxml to be installed.
+    """
+    if engine not in ENGINES:
+        raise ValueError(
+            f"Unknown parsing engine {engine!r}, expected one of {ENGINES}"
+        )
+    from bs4 import BeautifulSoup, SoupStrainer
+
+    with span("parse.tree", engine=engine):
+        if engine == "strainer" and root_id:
+            return BeautifulSoup(
+                content, "html.parser", parse_only=SoupStrainer(id=root_id)
+            )
+        if engine == "lxml":
+            return BeautifulSoup(content, "lxml")
+        return BeautifulSoup(content, "html.parser")
 
 
 def extract_text(
-    parent: Tag, tag: str, class_: Optional[str] = None, id: Optional[str] = None
+    parent: "Tag", tag: str, class_: Optional[str] = None, id: Optional[str] = None
 ) -> str:
     if id:
         try:
             text = parent.find(tag, id=id).text.strip()
         except AttributeError:
-            text = "Text not available"
+            text = NOT_AVAILABLE
     elif class_:
         try:
             text = parent.find(tag, class_=class_).text.strip()
         except AttributeError:
-            text = "Text not available"
+            text = NOT_AVAILABLE
     else:
         try:
             text = parent.find(tag).text.strip()
         except AttributeError:
-            text = "Text not available"
+            text = NOT_AVAILABLE
     return text
 
 
 def extract_node(
-    parent: Tag, tag: str, class_: Optional[str] = None, id: Optional[str] = None
+    parent: "Tag", tag: str, class_: Optional[str] = None, id: Optional[str] = None
 ):
     """Find the first child node of given parent, tag, and identifier."""
     if id:
@@ -56,7 +98,7 @@ def extract_node(
 
 
 def extract_nodes(
-    parent: Tag, tag: str, class_: Optional[str] = None, id: Optional[str] = None
+    parent: "Tag", tag: str, class_: Optional[str] = None, id: Optional[str] = None
 ):
     """Find a list of children nodes from a given parent, tag, and identifier."""
     if id:
@@ -67,20 +109,33 @@ def extract_nodes(
 
 
 def concat_from_stdin(stdin: TextIO) -> List[str]:
-    """Reads a sequence of PMIDs from TextIOWrapper."""
-    return [line.strip() for line in stdin]
+    """Reads a sequence of PMIDs from TextIOWrapper.
+
+    IDs are validated, canonicalized and deduplicated (see `normalize_ids`).
+    """
+    return normalize_ids(stdin)
 
 
 def concat_from_file(filepath) -> List[str]:
-    """Reads a sequence of PMIDs from a newline-delimited text file."""
-    pmid_list = []
-    try:
-        with open(filepath, "r") as handle:
-            for pmid in handle.readlines():
-                pmid_list.append(pmid.strip())
-        return pmid_list
-    except FileNotFoundError as e:
-        raise e
+    """Reads a sequence of PMIDs from a newline-delimited text file.
+
+    IDs are validated, canonicalized and deduplicated (see `normalize_ids`).
+    """
+    with open(filepath, "r") as handle:
+        return normalize_ids(handle)
+
+
+def stream_from_stdin(stdin: TextIO) -> Iterator[str]:
+    """Lazily yields PMIDs from TextIOWrapper, skipping blank lines."""
+    for line in stdin:
+        if line.strip():
+            yield line.strip()
+
+
+def stream_from_file(filepath) -> Iterator[str]:
+    """Lazily yields PMIDs from a newline-delimited text file, skipping blank lines."""
+    with open(filepath, "r") as handle:
+        yield from stream_from_stdin(handle)
 
 
 def format_name(name: str) -> str:
@@ -1,93 +1,153 @@
-from typing import List
+from typing import Iterator, List, Optional
 
 import pandas as pd
 from rich import box
 from rich.align import Align
 from rich.console import Console
-from rich.layout import Layout
 from rich.panel import Panel
 from rich.table import Table
 from rich.text import Text
 
 from pmbuddy.config import CONFIG
-from pmbuddy.models import PubmedArticle
-from pmbuddy.util import format_name
+from pmbuddy.util.profile import span
 
 
-def display_table(df: pd.DataFrame, subset: List[str], console: Console) -> None:
-    # Tidy up fields and filter columns
-    df["authors"] = df["authors"].apply(
-        lambda names: map(format_name, names.split(","))
-    )
-    df["authors"] = df["authors"].apply(lambda l: ", ".join(map(str, l)))
-    # Create Rich table
+def format_authors(authors: pd.Series) -> pd.Series:
+    """Vectorized `format_name` over a column of author lists.
+
+    Each list becomes a single "Last F, Last F" string; rows without authors
+    become empty strings.
+    """
+    names = authors.explode().dropna().astype(str)
+    if names.empty:
+        return pd.Series("", index=authors.index)
+    short = names.str.replace(r"^.* ", "", regex=True) + " " + names.str[0] + ", "
+    joined = short.groupby(level=0).sum().str[:-2]
+    return joined.reindex(authors.index, fill_value="")
+
+
+def byline(names, et_al: bool = False) -> str:
+    """All names joined, or the first followed by "et al."; "Unknown authors" if none."""
+    if names is None or len(names) == 0:
+        return "Unknown authors"
+    return f"{names[0]} et al." if et_al else ", ".join(names)
+
+
+def page_size() -> int:
+    return CONFIG.get("display", {}).get("page_size", 50)
+
+
+def pages(n_rows: int, size: Optional[int]) -> Iterator[slice]:
+    """Row slices of at most `size` rows; a single slice when `size` is falsy."""
+    size = size or max(n_rows, 1)
+    for start in range(0, max(n_rows, 1), size):
+        yield slice(start, start + size)
+
+
+def next_page(console: Console, shown: int, total: int) -> bool:
+    """Ask whether to render another page; only pages on an interactive terminal."""
+    if not console.is_terminal:
+        return True
+    reply = console.input(f"[dim]{shown}/{total} rows, Enter for more, q to quit: ")
+    return reply.strip().lower() != "q"
+
+
+def build_table(df: pd.DataFrame, subset: List[str], offset: int = 0) -> Table:
+    """Build a Rich table for the rows of `df`, numbered from `offset + 1`."""
     table = Table(title="PubMed Articles", box=box.SIMPLE_HEAVY, expand=True)
     table.add_column(justify="center")
-    df = df[subset]
-    for col in df.columns:
+    for col in subset:
         table.add_column(col, justify="left")
-    for idx, row in df.iterrows():
-        pmid, title, authors, journal, *remaining = row.values
-        table.add_row(
-            str(idx + 1),
-            f"[cyan link={CONFIG['urls']['PMID_ROOT']}/{pmid}]{pmid}",
-            f"[b]{title}",
-            authors,
-            f"[i]{journal}",
-        )
-    console.print(table)
+    root = CONFIG["urls"]["PMID_ROOT"]
+    styles = {
+        "pmid": lambda pmid: f"[cyan link={root}/{pmid}]{pmid}",
+        "title": lambda title: f"[b]{title}",
+        "journal": lambda journal: f"[i]{journal}",
+    }
+    columns = [list(map(styles.get(col, str), df[col].to_numpy())) for col in subset]
+    numbers = range(offset + 1, offset + len(df) + 1)
+    for number, *cells in zip(numbers, *columns):
+        table.add_row(str(number), *cells)
+    return table
+
+
+def display_table(
+    df: pd.DataFrame,
+    subset: List[str],
+    console: Console,
+    page_rows: Optional[int] = None,
+) -> None:
+    """Print `subset` columns of `df` as a table.
+
+    Tables longer than `page_rows` (default: `page_size()`) are laid out one
+    page at a time, prompting before each page on an interactive terminal.
+    """
+    with span("display.format", rows=len(df)):
+        df = df[subset].reset_index(drop=True)
+        if "authors" in df:
+            df = df.assign(authors=format_authors(df["authors"]))
+    page_rows = page_rows or page_size()
+    for i, rows in enumerate(pages(len(df), page_rows)):
+        if i and not next_page(console, rows.start, len(df)):
+            break
+        with span("display.render", rows=min(rows.stop, len(df)) - rows.start):
+            console.print(build_table(df.iloc[rows], subset, offset=rows.start))
 
 
 def display_single_abstract(df: pd.DataFrame, console: Console) -> None:
-    df = df[["title", "authors", "abstract", "doi"]]
-    for idx, row in df.iterrows():
-        abstract = Text(row.abstract, justify="full")
-        authors = row.authors
-        title = Text(row.title, justify="full")
+    columns = (df[col].to_numpy() for col in ["title", "authors", "abstract", "doi"])
+    for title, authors, abstract, doi in zip(*columns):
+        abstract = Text(abstract, justify="full")
+        title = Text(title, justify="full")
         title.stylize("bold cyan")
         title_panel = Panel(
-            Align(title, "center"), subtitle=authors, subtitle_align="center"
+            Align(title, "center"),
+            subtitle=byline(authors),
+            subtitle_align="center",
         )
         abstract.pad_left(10)
         panel = Panel(
             abstract,
             box=box.SIMPLE_HEAVY,
-            subtitle=row.doi,
+            subtitle=doi,
             subtitle_align="center",
             padding=[1, 15, 2, 15],
         )
-        console.print(title_panel)
-        console.print(panel)
+        with span("display.render", rows=1):
+            console.print(title_panel)
+            console.print(panel)
 
 
-def display_multiple_abstracts(df: pd.DataFrame, console: Console) -> None:
-    df = df[["title", "authors", "abstract"]]
+def display_multiple_abstracts(
+    df: pd.DataFrame, console: Console, page_rows: Optional[int] = None
+) -> None:
+    """Print title and abstract side by side, one page of articles at a time."""
     HEIGHT = 25
-    layouts = []
-    for idx, row in df.iterrows():
-        abstract = Align.center(Text(row.abstract, justify="full"), vertical="middle")
-        authors = Text(f"{row.authors.split(',')[0]} et al.", style="italic")
-        title = Align.center(
-            Text(row.title.upper(), justify="center", style="bold cyan"),
-            vertical="middle",
-        )
-        abstract_panel = Panel(abstract, box=box.SIMPLE_HEAVY, height=HEIGHT)
-        title_panel = Panel(
-            title, height=HEIGHT, subtitle=authors, subtitle_align="center"
-        )
-        layout = Layout()
-        left_name = f"title{idx}"
-        right_name = f"abstract{idx}"
-        layout.size = None
-        layout.minimum_size = 10
-        layout.split_row(
-            Layout(name=left_name),
-            Layout(name=right_name),
-        )
-        layout[right_name].ratio = 2
-        layout[left_name].update(title_panel)
-        layout[right_name].update(abstract_panel)
-        layouts.append(layout)
-    main_layout = Layout()
-    main_layout.split_column(*layouts)
-    console.print(main_layout)
+    titles = df["title"].to_numpy()
+    authors = df["authors"].to_numpy()
+    abstracts = df["abstract"].to_numpy()
+    page_rows = page_rows or max(page_size() // 10, 1)
+    for i, rows in enumerate(pages(len(df), page_rows)):
+        if i and not next_page(console, rows.start, len(df)):
+            break
+        grid = Table.grid(expand=True)
+        grid.add_column(ratio=1)
+        grid.add_column(ratio=2)
+        for title, names, abstract in zip(titles[rows], authors[rows], abstracts[rows]):
+            title_panel = Panel(
+                Align.center(
+                    Text(title.upper(), justify="center", style="bold cyan"),
+                    vertical="middle",
+                ),
+                height=HEIGHT,
+                subtitle=Text(byline(names, et_al=True), style="italic"),
+                subtitle_align="center",
+            )
+            abstract_panel = Panel(
+                Align.center(Text(abstract, justify="full"), vertical="middle"),
+                box=box.SIMPLE_HEAVY,
+                height=HEIGHT,
+            )
+            grid.add_row(title_panel, abstract_panel)
+        with span("display.render", rows=min(rows.stop, len(df)) - rows.start):
+            console.print(grid)
@@ -0,0 +1,225 @@
+import json
+import re
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
+
+from pmbuddy.config import CONFIG
+from pmbuddy.util import NOT_AVAILABLE
+
+if TYPE_CHECKING:
+    from pmbuddy.models import Author, PubmedArticle
+
+MONTHS = [
+    "jan",
+    "feb",
+    "mar",
+    "apr",
+    "may",
+    "jun",
+    "jul",
+    "aug",
+    "sep",
+    "oct",
+    "nov",
+    "dec",
+]
+
+# Characters with a special meaning in BibTeX values. Most values contain
+# none, and a regex scan skips those faster than `str.translate` can.
+BIBTEX_SPECIAL = re.compile(r"[\\{}$&%#_^~]")
+BIBTEX_ESCAPES = {
+    "\\": r"\textbackslash{}",
+    "{": r"\{",
+    "}": r"\}",
+    "$": r"\$",
+    "&": r"\&",
+    "%": r"\%",
+    "#": r"\#",
+    "_": r"\_",
+    "^": r"\^{}",
+    "~": r"\~{}",
+}
+NO_BRACES = str.maketrans("", "", "{}")
+
+
+def month_number(month: Optional[int | str]) -> Optional[int]:
+    """1-12 for a month given as a number or a name such as "May" or "August"."""
+    if month is None:
+        return None
+    if isinstance(month, int) or month.isdigit():
+        number = int(month)
+        return number if 1 <= number <= 12 else None
+    try:
+        return MONTHS.index(month[:3].lower()) + 1
+    except ValueError:
+        return None
+
+
+def present(value: Optional[str]) -> Optional[str]:
+    """`value`, or None if it is empty or the parsers' NOT_AVAILABLE placeholder."""
+    return None if not value or value == NOT_AVAILABLE else value
+
+
+def one_line(text: str) -> str:
+    """Collapse newlines and runs of whitespace into single spaces."""
+    return " ".join(text.split())
+
+
+def authors_of(article: "PubmedArticle") -> List["Author"]:
+    from pmbuddy.models import Author
+
+    if article.author_records:
+        return article.author_records
+    return [Author.from_name(name) for name in article.authors or []]
+
+
+def bibtex_escape(text: str) -> str:
+    return BIBTEX_SPECIAL.sub(lambda m: BIBTEX_ESCAPES[m[0]], one_line(text))
+
+
+def bibtex_name(author: "Author") -> str:
+    if author.collective:
+        # Braces keep a group name from being split into first and last names.
+        return "{" + bibtex_escape(author.last_name) + "}"
+    parts = [author.last_name, author.fore_name] if author.fore_name else [author.name]
+    escaped = []
+    for part in parts:
+        part = bibtex_escape(part)
+        # " and " separates authors, so it must not appear unbraced in a name.
+        escaped.append("{" + part + "}" if " and " in part.lower() else part)
+    return ", ".join(escaped)
+
+
+def bibtex_entry(article: "PubmedArticle") -> str:
+    """An @article entry keyed by PMID, with special characters escaped."""
+    citation = article.citation if hasattr(article.citation, "journal") else None
+    lines = [f"@article{{pmid{article.pmid},"]
+
+    def add(name: str, value: str) -> None:
+        lines.append(f"  {name} = {{{value}}},")
+
+    authors = authors_of(article)
+    if authors:
+        add("author", " and ".join(map(bibtex_name, authors)))
+    if present(article.title):
+        add("title", bibtex_escape(article.title))
+    if citation is not None:
+        date = citation.publication_date
+        if present(citation.journal):
+            add("journal", bibtex_escape(citation.journal))
+        add("year", str(date.year))
+        month = month_number(date.month)
+        if month:
+            # Month macros let styles abbreviate or translate month names.
+            lines.append(f"  month = {MONTHS[month - 1]},")
+        if citation.issue_num is not None:
+            add("number", str(citation.issue_num))
+        if present(citation.article_num):
+            add("eid", bibtex_escape(citation.article_num))
+        if citation.pages:
+            add("pages", f"{citation.pages.start}--{citation.pages.end}")
+        if present(citation.doi):
+            # doi and url are verbatim fields: only the braces need to go.
+            add("doi", one_line(citation.doi).translate(NO_BRACES))
+    add("pmid", article.pmid)
+    if present(article.pmcid):
+        add("pmcid", article.pmcid)
+    add("url", f"{CONFIG['urls']['PMID_ROOT']}/{article.pmid}/")
+    if present(article.abstract):
+        add("abstract", bibtex_escape(article.abstract))
+    lines.append("}\n\n")
+    return "\n".join(lines)
+
+
+def ris_entry(article: "PubmedArticle") -> str:
+    """A RIS record (TY to ER) with every value on a single line."""
+    citation = article.citation if hasattr(article.citation, "journal") else None
+    lines = ["TY  - JOUR"]
+    for author in authors_of(article):
+        if author.collective or not author.fore_name:
+            lines.append(f"AU  - {one_line(author.last_name)}")
+        else:
+            lines.append(
+                f"AU  - {one_line(author.last_name)}, {one_line(author.fore_name)}"
+            )
+    if present(article.title):
+        lines.append(f"TI  - {one_line(article.title)}")
+    if citation is not None:
+        date = citation.publication_date
+        if present(citation.journal):
+            lines.append(f"JO  - {one_line(citation.journal)}")
+        lines.append(f"PY  - {date.year}")
+        month = month_number(date.month)
+        if month:
+            day = f"{date.day:02d}" if date.day else ""
+            lines.append(f"DA  - {date.year}/{month:02d}/{day}/")
+        if citation.issue_num is not None:
+            lines.append(f"IS  - {citation.issue_num}")
+        if present(citation.article_num):
+            lines.append(f"C7  - {one_line(citation.article_num)}")
+        if citation.pages:
+            lines.append(f"SP  - {citation.pages.start}")
+            lines.append(f"EP  - {citation.pages.end}")
+        if present(citation.doi):
+            lines.append(f"DO  - {one_line(citation.doi)}")
+    lines.append(f"AN  - {article.pmid}")
+    if present(article.pmcid):
+        lines.append(f"C2  - {article.pmcid}")
+    lines.append(f"UR  - {CONFIG['urls']['PMID_ROOT']}/{article.pmid}/")
+    if present(article.abstract):
+        lines.append(f"AB  - {one_line(article.abstract)}")
+    lines.append("ER  - \n\n")
+    return "\n".join(lines)
+
+
+def csl_item(article: "PubmedArticle") -> Dict[str, Any]:
+    """The article as a CSL-JSON item of type article-journal."""
+    citation = article.citation if hasattr(article.citation, "journal") else None
+    item: Dict[str, Any] = {"id": article.pmid, "type": "article-journal"}
+    if present(article.title):
+        item["title"] = article.title
+    authors = []
+    for author in authors_of(article):
+        if author.collective or not author.fore_name:
+            authors.append({"literal": author.last_name})
+        else:
+            authors.append({"family": author.last_name, "given": author.fore_name})
+    if authors:
+        item["author"] = authors
+    if citation is not None:
+        date = citation.publication_date
+        parts = [date.year]
+        month = month_number(date.month)
+        if month:
+            parts.append(month)
+            if date.day:
+                parts.append(date.day)
+        if present(citation.journal):
+            item["container-title"] = citation.journal
+        item["issued"] = {"date-parts": [parts]}
+        if citation.issue_num is not None:
+            item["issue"] = str(citation.issue_num)
+        if present(citation.article_num):
+            item["number"] = citation.article_num
+        if citation.pages:
+            item["page"] = f"{citation.pages.start}-{citation.pages.end}"
+        if present(citation.doi):
+            item["DOI"] = citation.doi
+    item["PMID"] = article.pmid
+    if present(article.pmcid):
+        item["PMCID"] = article.pmcid
+    item["URL"] = f"{CONFIG['urls']['PMID_ROOT']}/{article.pmid}/"
+    if present(article.abstract):
+        item["abstract"] = article.abstract
+    return item
+
+
+def csl_json(article: "PubmedArticle") -> str:
+    return json.dumps(csl_item(article), ensure_ascii=False)
+
+
+# Reference manager formats written by `ArticleWriter`, one entry per article.
+EXPORTERS: Dict[str, Callable[["PubmedArticle"], str]] = {
+    "bibtex": bibtex_entry,
+    "ris": ris_entry,
+    "csl-json": csl_json,
+}
@@ -0,0 +1,63 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class InFlight:
+    """Coalesces concurrent calls for the same key into a single task.
+
+    The first caller for a key starts the work and later callers await the
+    same task until it finishes, sharing its result or exception. The task
+    is shielded, so a cancelled caller does not cancel the work the others
+    are waiting on. Finished keys are forgotten; this is not a cache.
+    """
+
+    def __init__(self) -> None:
+        self._tasks: Dict[Hashable, asyncio.Future] = {}
+        self.started = 0
+        self.coalesced = 0
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def _forget(self, key: Hashable, task: asyncio.Future) -> None:
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+
+    async def run(self, key: Hashable, factory: Callable[[], Awaitable[T]]) -> T:
+        """Await `factory()`, or the pending call already started for `key`."""
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._tasks[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+            self.started += 1
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+
+class CoalescingParser:
+    """Wraps a parser so that concurrent fetches of one article share a request.
+
+    In a long-running process several callers may ask for the same PMID at
+    the same time; only the first one reaches the wrapped parser (and the
+    network). Other attributes, such as `fetch_from_ids`, are passed through.
+    """
+
+    def __init__(self, parser) -> None:
+        self.parser = parser
+        self.inflight = InFlight()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.parser, name)
+
+    def fetch_article(self, locator: str, **kwargs):
+        return self.parser.fetch_article(locator, **kwargs)
+
+    async def fetch_article_async(self, locator: str, client, **kwargs):
+        key = (locator, *sorted(kwargs.items()))
+        return await self.inflight.run(
+            key, lambda: self.parser.fetch_article_async(locator, client, **kwargs)
+        )
@@ -0,0 +1,127 @@
+import csv
+import io
+import json
+from typing import TYPE_CHECKING, Any, BinaryIO, Dict, List, Optional, TextIO
+
+from pmbuddy.util.export import EXPORTERS
+
+if TYPE_CHECKING:
+    from pmbuddy.models import PubmedArticle
+
+# The default level of the gzip tool: level 9 is several times slower for
+# output that is only a few percent smaller.
+GZIP_LEVEL = 6
+
+# Formats of flat rows, such as those of an ArticleStore query.
+ROW_FORMATS = ("jsonl", "csv", "tsv")
+
+# Streaming output formats accepted by `ArticleWriter`.
+FORMATS = ROW_FORMATS + tuple(EXPORTERS)
+
+FIELDS = [
+    "pmid",
+    "pmcid",
+    "title",
+    "authors",
+    "journal",
+    "pub_year",
+    "pub_month",
+    "article_num",
+    "issue_num",
+    "doi",
+    "abstract",
+    "url",
+]
+
+
+def gzip_text(handle: BinaryIO) -> TextIO:
+    """A text stream that gzip-compresses into the binary `handle`."""
+    import gzip
+
+    return io.TextIOWrapper(
+        gzip.GzipFile(fileobj=handle, mode="wb", compresslevel=GZIP_LEVEL),
+        encoding="utf-8",
+    )
+
+
+def open_output(path: str, mode: str = "w", compress: bool = False) -> TextIO:
+    """Open `path` for text output, through gzip with `compress`.
+
+    Appending to a gzip file adds a new gzip member, which readers such as
+    `gzip -d` and `gzip.open` treat as a continuation of the same stream.
+    """
+    if compress:
+        import gzip
+
+        return gzip.open(path, mode + "t", GZIP_LEVEL, encoding="utf-8")
+    return open(path, mode)
+
+
+class ArticleWriter:
+    """Writes articles one at a time as JSON Lines, CSV, TSV, BibTeX, RIS or CSL-JSON.
+
+    Every record is flushed as soon as it is written, so output appears
+    while a batch is still being fetched and nothing is buffered in memory.
+    With `flush=False` records are left to the handle's buffering, which
+    keeps compressed output from being flushed into many tiny blocks.
+    CSL-JSON is a single array, so `close` must be called to terminate it.
+    """
+
+    def __init__(
+        self,
+        handle: TextIO,
+        format: str = "jsonl",
+        header: bool = True,
+        fields: Optional[List[str]] = None,
+        flush: bool = True,
+    ) -> None:
+        if format not in FORMATS:
+            raise ValueError(
+                f"Unknown output format {format!r}, expected one of {FORMATS}"
+            )
+        self.handle = handle
+        self.format = format
+        self.header = header
+        self.flush = flush
+        self.count = 0
+        self._csv = None
+        self._export = EXPORTERS.get(format)
+        if format in ("csv", "tsv"):
+            delimiter = "," if format == "csv" else "\t"
+            self._csv = csv.DictWriter(
+                handle, fields or FIELDS, delimiter=delimiter, lineterminator="\n"
+            )
+
+    def write(self, article: "PubmedArticle") -> None:
+        if self._export is None:
+            return self.write_row(article.json())
+        entry = self._export(article)
+        if self.format == "csl-json":
+            entry = ("[\n" if self.count == 0 else ",\n") + entry
+        self.handle.write(entry)
+        self.count += 1
+        if self.flush:
+            self.handle.flush()
+
+    def write_row(self, row: Dict[str, Any]) -> None:
+        """Write a flat record, e.g. a row returned by an ArticleStore query."""
+        if self._export is not None:
+            raise ValueError(f"{self.format} output is written from articles, not rows")
+        if self._csv is not None and isinstance(row.get("authors"), list):
+            # Authors are separated with semicolons since names may contain commas.
+            row["authors"] = "; ".join(row["authors"])
+        if self._csv is None:
+            self.handle.write(json.dumps(row, ensure_ascii=False) + "\n")
+        else:
+            if self.count == 0 and self.header:
+                self._csv.writeheader()
+            self._csv.writerow(row)
+        self.count += 1
+        if self.flush:
+            self.handle.flush()
+
+    def close(self) -> None:
+        """Finish the output; the handle itself is left open."""
+        if self.format == "csl-json":
+            self.handle.write("\n]\n" if self.count else "[]\n")
+        self.handle.flush()
@@ -0,0 +1,190 @@
+import contextlib
+import json
+import os
+import threading
+from collections import Counter
+from pathlib import Path
+from time import perf_counter_ns
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+# (name, start ns, duration ns, track, args)
+Event = Tuple[str, int, int, int, Dict[str, Any]]
+
+# httpcore trace phases, named by what they measure. DNS resolution happens
+# inside connect_tcp, and "wait" (until the response headers arrive) is
+# mostly server time.
+HTTP_PHASES = {
+    "connect_tcp": "http.connect",
+    "connect_unix_socket": "http.connect",
+    "start_tls": "http.tls",
+    "send_request_headers": "http.send",
+    "send_request_body": "http.send",
+    "receive_response_headers": "http.wait",
+    "receive_response_body": "http.receive",
+}
+
+
+class Profiler:
+    """Records timed spans and counters of the fetch, parse and display stages.
+
+    Spans are kept in memory as plain tuples and summarized per stage, or
+    exported in the Chrome trace event format (chrome://tracing, Perfetto).
+    Spans of concurrent asyncio tasks are placed on one track per task so
+    that they nest properly in the trace.
+    """
+
+    def __init__(self) -> None:
+        self.origin = perf_counter_ns()
+        self.events: List[Event] = []
+        self.counters: Counter = Counter()
+        self._tracks: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def _track(self) -> int:
+        key = threading.get_ident()
+        try:
+            import asyncio
+
+            task = asyncio.current_task()
+            if task is not None:
+                key = id(task)
+        except RuntimeError:
+            pass
+        with self._lock:
+            return self._tracks.setdefault(key, len(self._tracks) + 1)
+
+    @contextlib.contextmanager
+    def span(self, name: str, **args: Any) -> Iterator[None]:
+        track = self._track()
+        start = perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.events.append((name, start, perf_counter_ns() - start, track, args))
+
+    def count(self, name: str, n: float = 1) -> None:
+        with self._lock:
+            self.counters[name] += n
+
+    def http_trace(self, asynchronous: bool = False) -> Callable:
+        """Return an httpx `trace` extension that records connection phases."""
+        started: Dict[str, int] = {}
+        track = self._track()
+
+        def trace(event: str, info: Dict[str, Any]) -> None:
+            phase, _, state = event.rpartition(".")
+            if state == "started":
+                started[phase] = perf_counter_ns()
+                return
+            name = HTTP_PHASES.get(phase.rpartition(".")[2])
+            if name and phase in started:
+                start = started.pop(phase)
+                self.events.append((name, start, perf_counter_ns() - start, track, {}))
+
+        if not asynchronous:
+            return trace
+
+        async def trace_async(event: str, info: Dict[str, Any]) -> None:
+            trace(event, info)
+
+        return trace_async
+
+    def stages(self) -> Dict[str, Dict[str, float]]:
+        """Calls and total/mean/p50/p95/max milliseconds per stage, slowest first.
+
+        Stages nest (a fetch contains its http.* phases), so totals overlap.
+        """
+        durations: Dict[str, List[float]] = {}
+        for name, _, duration, _, _ in self.events:
+            durations.setdefault(name, []).append(duration / 1e6)
+        stats = {}
+        for name, times in durations.items():
+            times.sort()
+            stats[name] = {
+                "calls": len(times),
+                "total_ms": sum(times),
+                "mean_ms": sum(times) / len(times),
+                "p50_ms": times[len(times) // 2],
+                "p95_ms": times[min(len(times) - 1, int(len(times) * 0.95))],
+                "max_ms": times[-1],
+            }
+        return dict(sorted(stats.items(), key=lambda item: -item[1]["total_ms"]))
+
+    def summary(self) -> str:
+        elapsed = (perf_counter_ns() - self.origin) / 1e9
+        lines = [
+            f"profile: {len(self.events)} spans over {elapsed:.3f}s",
+            f"{'stage':<16}{'calls':>7}{'total ms':>11}{'mean ms':>10}"
+            f"{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}",
+        ]
+        for name, s in self.stages().items():
+            lines.append(
+                f"{name:<16}{s['calls']:>7}{s['total_ms']:>11.1f}{s['mean_ms']:>10.2f}"
+                f"{s['p50_ms']:>10.2f}{s['p95_ms']:>10.2f}{s['max_ms']:>10.2f}"
+            )
+        if self.counters:
+            counters = ", ".join(
+                f"{name}={value:g}" for name, value in sorted(self.counters.items())
+            )
+            lines.append(f"counters: {counters}")
+        return "\n".join(lines)
+
+    def trace(self) -> Dict[str, Any]:
+        """The recorded spans as a Chrome trace event document."""
+        pid = os.getpid()
+        events = [
+            {
+                "name": name,
+                "cat": name.partition(".")[0],
+                "ph": "X",
+                "ts": (start - self.origin) / 1000,
+                "dur": duration / 1000,
+                "pid": pid,
+                "tid": track,
+                "args": args,
+            }
+            for name, start, duration, track, args in self.events
+        ]
+        return {
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "otherData": {"counters": dict(self.counters)},
+        }
+
+    def write_trace(self, path: str | Path) -> None:
+        with open(path, "w") as handle:
+            json.dump(self.trace(), handle)
+
+
+# Set by `set_profiler` (the CLI's --profile); None keeps every hook a no-op.
+PROFILER: Optional[Profiler] = None
+
+# A reusable context manager returned by `span` while profiling is off, so a
+# disabled hook costs a global lookup and no new context manager.
+NO_SPAN = contextlib.nullcontext()
+
+
+def set_profiler(profiler: Optional[Profiler]) -> None:
+    """Enable (or with None, disable) the instrumentation hooks."""
+    global PROFILER
+    PROFILER = profiler
+
+
+def span(name: str, **args: Any):
+    """Time the enclosed block as stage `name` when profiling is on."""
+    if PROFILER is None:
+        return NO_SPAN
+    return PROFILER.span(name, **args)
+
+
+def count(name: str, n: float = 1) -> None:
+    """Add `n` to counter `name` when profiling is on."""
+    if PROFILER is not None:
+        PROFILER.count(name, n)
+
+
+def http_extensions(asynchronous: bool = False) -> Dict[str, Any]:
+    """httpx request extensions that trace connection phases when profiling is on."""
+    if PROFILER is None:
+        return {}
+    return {"trace": PROFILER.http_trace(asynchronous)}
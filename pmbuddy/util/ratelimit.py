@@ -0,0 +1,200 @@
+import asyncio
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, List, Optional
+
+import httpx
+
+from pmbuddy.config import CONFIG
+from pmbuddy.util.profile import count
+
+
+class TokenBucket:
+    """Adaptive token bucket shared by every request to NCBI.
+
+    The fill rate starts at `rate` requests per second. A 429 halves it
+    (down to `min_rate`), and every successful request nudges it back up
+    towards `rate`, so sustained load settles just below what the server
+    tolerates instead of repeatedly getting blocked.
+    """
+
+    def __init__(self, rate: float, burst: int = 1, min_rate: float = 0.1) -> None:
+        self.max_rate = rate
+        self.rate = rate
+        self.min_rate = min(min_rate, rate)
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take a token and return how long to wait before using it."""
+        with self.lock:
+            now = time.monotonic()
+            elapsed = now - self.updated
+            self.tokens = min(self.burst, self.tokens + elapsed * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0.0
+            wait = -self.tokens / self.rate
+        count("ratelimit.wait_s", wait)
+        return wait
+
+    def acquire(self) -> None:
+        time.sleep(self.reserve())
+
+    async def acquire_async(self) -> None:
+        await asyncio.sleep(self.reserve())
+
+    def penalize(self) -> None:
+        with self.lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+
+    def reward(self) -> None:
+        with self.lock:
+            self.rate = min(self.max_rate, self.rate + self.max_rate / 20)
+
+    def set_rate(self, rate: float) -> None:
+        """Change the ceiling, e.g. when the processes sharing a limit change."""
+        with self.lock:
+            # A rate backed off after a 429 stays backed off; one at the old
+            # ceiling follows the new one.
+            self.rate = rate if self.rate >= self.max_rate else min(self.rate, rate)
+            self.max_rate = rate
+            self.min_rate = min(self.min_rate, rate)
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter on transient failures."""
+
+    def __init__(
+        self,
+        max_retries: int = 5,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        statuses: Optional[List[int]] = None,
+        retry_after_max: float = 300.0,
+    ) -> None:
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_after_max = retry_after_max
+        self.statuses = set(statuses or [429, 500, 502, 503, 504])
+
+    @classmethod
+    def from_config(cls) -> "RetryPolicy":
+        return cls(**CONFIG.get("request", {}).get("retry", {}))
+
+    def delay(self, attempt: int, retry_after: Optional[str] = None) -> Optional[float]:
+        """Seconds to wait before retry number `attempt` (starting at 0).
+
+        A Retry-After from the server is honoured in full. If it asks for
+        more than `retry_after_max` seconds, returns None: the request is
+        given up rather than retried early or left waiting for minutes.
+        """
+        if retry_after:
+            seconds = parse_retry_after(retry_after)
+            if seconds is not None:
+                return seconds if seconds <= self.retry_after_max else None
+        cap = min(self.backoff_max, self.backoff_base * 2**attempt)
+        return random.uniform(0, cap)
+
+
+def parse_retry_after(value: str) -> Optional[float]:
+    """Parse a Retry-After header given either in seconds or as an HTTP date."""
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+LIMITER: Optional[TokenBucket] = None
+RETRY: Optional[RetryPolicy] = None
+
+
+def configured_rate() -> float:
+    """NCBI's request rate, the higher limit if an API key is set."""
+    request = CONFIG.get("request", {})
+    cfg = request.get("ratelimit", {})
+    if request.get("eutils", {}).get("api_key"):
+        return cfg.get("rate_with_api_key", 10.0)
+    return cfg.get("rate", 3.0)
+
+
+def get_limiter() -> TokenBucket:
+    """Return the process-wide limiter."""
+    global LIMITER
+    if LIMITER is None:
+        cfg = CONFIG.get("request", {}).get("ratelimit", {})
+        LIMITER = TokenBucket(configured_rate(), cfg.get("burst", 1))
+    return LIMITER
+
+
+def get_retry_policy() -> RetryPolicy:
+    global RETRY
+    if RETRY is None:
+        RETRY = RetryPolicy.from_config()
+    return RETRY
+
+
+def send_with_retry(send: Callable[[], httpx.Response]) -> httpx.Response:
+    """Rate limit `send` and retry it on 429/5xx responses and transport errors."""
+    limiter, policy = get_limiter(), get_retry_policy()
+    for attempt in range(policy.max_retries + 1):
+        limiter.acquire()
+        try:
+            res = send()
+        except httpx.TransportError:
+            if attempt == policy.max_retries:
+                raise
+            count("http.retries")
+            time.sleep(policy.delay(attempt))
+            continue
+        if res.status_code in policy.statuses and attempt < policy.max_retries:
+            count("http.retries")
+            if res.status_code == 429:
+                limiter.penalize()
+            delay = policy.delay(attempt, res.headers.get("Retry-After"))
+            if delay is None:
+                return res
+            time.sleep(delay)
+            continue
+        if res.status_code not in policy.statuses:
+            limiter.reward()
+        return res
+
+
+async def send_with_retry_async(
+    send: Callable[[], Awaitable[httpx.Response]],
+) -> httpx.Response:
+    """Async version of `send_with_retry`."""
+    limiter, policy = get_limiter(), get_retry_policy()
+    for attempt in range(policy.max_retries + 1):
+        await limiter.acquire_async()
+        try:
+            res = await send()
+        except httpx.TransportError:
+            if attempt == policy.max_retries:
+                raise
+            count("http.retries")
+            await asyncio.sleep(policy.delay(attempt))
+            continue
+        if res.status_code in policy.statuses and attempt < policy.max_retries:
+            count("http.retries")
+            if res.status_code == 429:
+                limiter.penalize()
+            delay = policy.delay(attempt, res.headers.get("Retry-After"))
+            if delay is None:
+                return res
+            await asyncio.sleep(delay)
+            continue
+        if res.status_code not in policy.statuses:
+            limiter.reward()
+        return res
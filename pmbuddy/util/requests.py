@@ -1,39 +1,334 @@
-from typing import List
+import asyncio
+import sys
+from itertools import islice
+from typing import (
+    TYPE_CHECKING,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
 import httpx
-from bs4 import BeautifulSoup
 from pmbuddy.models import PubmedArticle
 from pmbuddy.config import CONFIG
-from pmbuddy.util.validation import validate_pmid, validate_pmcid
+from pmbuddy.util import make_soup
+from pmbuddy.util.profile import count, http_extensions, span
+from pmbuddy.util.ratelimit import send_with_retry, send_with_retry_async
+from pmbuddy.util.validation import FormatError, validate_pmid, validate_pmcid
 
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
 
-def soup_from_url(url: str) -> BeautifulSoup:
-    """Return a soup object from a URL string."""
+    from pmbuddy.cache.pages import PageCache
+
+
+class NotModified(Exception):
+    """Raised when a revalidated page is unchanged on the server (HTTP 304)."""
+
+    pass
+
+
+# Optional store of raw pages and their validators, see `set_page_cache`.
+PAGE_CACHE: Optional["PageCache"] = None
+
+
+def set_page_cache(cache: Optional["PageCache"]) -> None:
+    """Enable (or with None, disable) conditional revalidation of fetched pages."""
+    global PAGE_CACHE
+    PAGE_CACHE = cache
+
+
+def conditional_headers(url: str, conditional: bool = True) -> Dict[str, str]:
+    global CONFIG, PAGE_CACHE
+    headers = dict(CONFIG.get("request", {}).get("headers", {}))
+    if PAGE_CACHE is not None and conditional:
+        headers.update(PAGE_CACHE.validators(url))
+    return headers
+
+
+def content_from_response(
+    url: str, res: httpx.Response, revalidate: bool
+) -> Optional[bytes]:
+    """Return the page body, falling back to the stored copy on a 304.
+
+    Returns None if the stored copy was evicted after its validators were
+    sent; the caller should then request the page unconditionally.
+    """
+    global PAGE_CACHE
+    count("http.responses")
+    if res.status_code == 304 and PAGE_CACHE is not None:
+        count("http.not_modified")
+        PAGE_CACHE.touch(url)
+        if revalidate:
+            raise NotModified(url)
+        stored = PAGE_CACHE.get(url)
+        return stored[2] if stored is not None else None
+    res.raise_for_status()
+    count("http.bytes", len(res.content))
+    if PAGE_CACHE is not None:
+        PAGE_CACHE.put(url, res.headers, res.content)
+    return res.content
+
+
+def content_from_url(url: str, revalidate: bool = False) -> bytes:
+    """Return the raw body of a URL.
+
+    When a page cache is set, stored validators are sent along and a 304
+    reuses the stored body. With `revalidate=True` a 304 raises NotModified
+    instead, so callers holding a parsed copy can skip parsing altogether.
+    """
     global CONFIG
     res = None
-    with httpx.Client() as client:
-        req_params = CONFIG.get("request")
-        if req_params:
-            res = client.get(
-                url,
-                headers=req_params.get("headers"),
-                timeout=req_params.get("timeout", 5.0),
-            )
+    content = None
+    for conditional in (True, False):
+        with span("fetch", url=url), httpx.Client() as client:
+            req_params = CONFIG.get("request")
+            if req_params:
+                res = send_with_retry(
+                    lambda: client.get(
+                        url,
+                        headers=conditional_headers(url, conditional),
+                        timeout=req_params.get("timeout", 5.0),
+                        extensions=http_extensions(),
+                    )
+                )
+            else:
+                res = send_with_retry(
+                    lambda: client.get(url, timeout=5.0, extensions=http_extensions())
+                )
+        content = content_from_response(url, res, revalidate)
+        if content is not None:
+            break
+    return content
+
+
+def content_from_pmid(pmid: str, revalidate: bool = False) -> bytes:
+    pmid = validate_pmid(pmid)
+    url = f"{CONFIG['urls']['PMID_ROOT']}/{pmid}/"
+    return content_from_url(url, revalidate)
+
+
+def content_from_pmcid(pmcid: str, revalidate: bool = False) -> bytes:
+    pmcid = validate_pmcid(pmcid)
+    url = f"{CONFIG['urls']['PMCID_ROOT']}/{pmcid}/"
+    return content_from_url(url, revalidate)
+
+
+def soup_from_url(url: str, revalidate: bool = False) -> "BeautifulSoup":
+    """Return a soup object from a URL string."""
+    return make_soup(content_from_url(url, revalidate))
+
+
+def soup_from_pmid(pmid: str, revalidate: bool = False) -> "BeautifulSoup":
+    return make_soup(content_from_pmid(pmid, revalidate))
+
+
+def soup_from_pmcid(pmcid: str, revalidate: bool = False) -> "BeautifulSoup":
+    return make_soup(content_from_pmcid(pmcid, revalidate))
+
+
+def eutils_params() -> Dict[str, str]:
+    """Return the identification parameters NCBI asks E-utilities callers to send."""
+    eutils = CONFIG.get("request", {}).get("eutils", {})
+    return {k: eutils[k] for k in ("tool", "email", "api_key") if eutils.get(k)}
+
+
+def efetch_from_pmids(pmids: List[str], client: Optional[httpx.Client] = None) -> bytes:
+    """Return the efetch XML for a batch of PMIDs in a single request."""
+    global CONFIG
+    url = f"{CONFIG['urls']['EUTILS_ROOT']}/efetch.fcgi"
+    data = {
+        "db": "pubmed",
+        "id": ",".join(validate_pmid(pmid) for pmid in pmids),
+        "retmode": "xml",
+        **eutils_params(),
+    }
+    timeout = CONFIG.get("request", {}).get("timeout", 5.0)
+    # POST keeps long ID lists out of the URL, as recommended by NCBI.
+    with span("fetch", url=url, pmids=len(pmids)):
+        if client is None:
+            with httpx.Client(timeout=timeout) as client:
+                res = send_with_retry(
+                    lambda: client.post(url, data=data, extensions=http_extensions())
+                )
         else:
-            res = client.get(url, timeout=5.0)
-        res.raise_for_status()
-    return BeautifulSoup(res.content, "html.parser")
+            res = send_with_retry(
+                lambda: client.post(
+                    url, data=data, timeout=timeout, extensions=http_extensions()
+                )
+            )
+    res.raise_for_status()
+    count("http.bytes", len(res.content))
+    return res.content
+
 
+async def elink_from_pmids_async(
+    pmids: List[str], linkname: str, client: httpx.AsyncClient
+) -> bytes:
+    """Return the elink XML listing `linkname` links for each PMID in a batch.
 
-def soup_from_pmid(pmid: str) -> BeautifulSoup:
+    Each PMID is sent as its own `id` parameter so that NCBI answers with one
+    LinkSet per PMID instead of merging the links of the whole batch.
+    """
+    url = f"{CONFIG['urls']['EUTILS_ROOT']}/elink.fcgi"
+    data = {
+        "dbfrom": "pubmed",
+        "db": "pubmed",
+        "linkname": linkname,
+        "id": [str(int(pmid)) for pmid in pmids],
+        **eutils_params(),
+    }
+    res = await send_with_retry_async(lambda: client.post(url, data=data))
+    res.raise_for_status()
+    return res.content
+
+
+async def esearch_async(
+    term: str,
+    client: httpx.AsyncClient,
+    retstart: int = 0,
+    retmax: int = 10000,
+    **params: str,
+) -> bytes:
+    """Return the esearch XML of one page of PMIDs matching a PubMed query.
+
+    Extra `params` are passed through, e.g. datetype="edat" and mindate.
+    """
+    url = f"{CONFIG['urls']['EUTILS_ROOT']}/esearch.fcgi"
+    data = {
+        "db": "pubmed",
+        "term": term,
+        "retstart": str(retstart),
+        "retmax": str(retmax),
+        **params,
+        **eutils_params(),
+    }
+    with span("fetch", url=url):
+        res = await send_with_retry_async(
+            lambda: client.post(url, data=data, extensions=http_extensions(True))
+        )
+    res.raise_for_status()
+    count("http.bytes", len(res.content))
+    return res.content
+
+
+async def idconv_async(ids: List[str], client: httpx.AsyncClient, idtype: str) -> bytes:
+    """Return the PMC ID Converter's JSON records for a batch of one ID type.
+
+    `idtype` is "pmid", "pmcid" or "doi"; the service takes 200 IDs at most.
+    """
+    url = f"{CONFIG['urls']['IDCONV_ROOT']}/"
+    params = {"ids": ",".join(ids), "idtype": idtype, "format": "json"}
+    params.update((k, v) for k, v in eutils_params().items() if k != "api_key")
+    with span("fetch", url=url, ids=len(ids)):
+        res = await send_with_retry_async(
+            lambda: client.get(url, params=params, extensions=http_extensions(True))
+        )
+    res.raise_for_status()
+    count("http.bytes", len(res.content))
+    return res.content
+
+
+async def esummary_async(pmids: List[str], client: httpx.AsyncClient) -> bytes:
+    """Return the esummary JSON of a batch of PMIDs, including their article IDs."""
+    url = f"{CONFIG['urls']['EUTILS_ROOT']}/esummary.fcgi"
+    data = {
+        "db": "pubmed",
+        "id": ",".join(pmids),
+        "retmode": "json",
+        **eutils_params(),
+    }
+    with span("fetch", url=url, pmids=len(pmids)):
+        res = await send_with_retry_async(
+            lambda: client.post(url, data=data, extensions=http_extensions(True))
+        )
+    res.raise_for_status()
+    count("http.bytes", len(res.content))
+    return res.content
+
+
+class HostLimitedTransport(httpx.AsyncHTTPTransport):
+    """Async transport that caps the number of in-flight requests per host."""
+
+    def __init__(self, max_per_host: int, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.max_per_host = max_per_host
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        if host not in self._semaphores:
+            self._semaphores[host] = asyncio.Semaphore(self.max_per_host)
+        async with self._semaphores[host]:
+            response = await super().handle_async_request(request)
+            # Read the body while holding the slot so the connection is released.
+            await response.aread()
+        return response
+
+
+def async_client(
+    max_connections: Optional[int] = None,
+    max_per_host: Optional[int] = None,
+    transport: Optional[httpx.AsyncBaseTransport] = None,
+) -> httpx.AsyncClient:
+    """Return a pooled AsyncClient configured from `config/request.toml`."""
+    global CONFIG
+    req_params = CONFIG.get("request", {})
+    limits = req_params.get("limits", {})
+    max_connections = max_connections or limits.get("max_connections", 10)
+    max_per_host = max_per_host or limits.get("max_per_host", max_connections)
+    pool_limits = httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_connections,
+        keepalive_expiry=limits.get("keepalive_expiry", 5.0),
+    )
+    if transport is None:
+        transport = HostLimitedTransport(max_per_host, limits=pool_limits)
+    return httpx.AsyncClient(
+        headers=req_params.get("headers"),
+        timeout=req_params.get("timeout", 5.0),
+        limits=pool_limits,
+        transport=transport,
+    )
+
+
+async def content_from_url_async(
+    url: str, client: httpx.AsyncClient, revalidate: bool = False
+) -> bytes:
+    """Return the raw body of a URL using a shared AsyncClient."""
+    content = None
+    for conditional in (True, False):
+        with span("fetch", url=url):
+            res = await send_with_retry_async(
+                lambda: client.get(
+                    url,
+                    headers=conditional_headers(url, conditional),
+                    extensions=http_extensions(asynchronous=True),
+                )
+            )
+        content = content_from_response(url, res, revalidate)
+        if content is not None:
+            break
+    return content
+
+
+async def content_from_pmid_async(
+    pmid: str, client: httpx.AsyncClient, revalidate: bool = False
+) -> bytes:
     pmid = validate_pmid(pmid)
     url = f"{CONFIG['urls']['PMID_ROOT']}/{pmid}/"
-    return soup_from_url(url)
+    return await content_from_url_async(url, client, revalidate)
 
 
-def soup_from_pmcid(pmcid: str) -> BeautifulSoup:
+async def content_from_pmcid_async(
+    pmcid: str, client: httpx.AsyncClient, revalidate: bool = False
+) -> bytes:
     pmcid = validate_pmcid(pmcid)
     url = f"{CONFIG['urls']['PMCID_ROOT']}/{pmcid}/"
-    return soup_from_url(url)
+    return await content_from_url_async(url, client, revalidate)
 
 
 def fetch_articles(parser, pmids: List[str]) -> List[PubmedArticle]:
@@ -44,6 +339,126 @@ def fetch_articles(parser, pmids: List[str]) -> List[PubmedArticle]:
             a = parser.fetch_article(pmid)
             articles.append(a)
         except AttributeError:
-            print(f"Failed to parse article metadata. Skipping {pmid}")
+            print(f"Failed to parse article metadata. Skipping {pmid}", file=sys.stderr)
+            continue
+        except (httpx.HTTPError, FormatError) as e:
+            print(f"Failed to fetch {pmid} ({e}). Skipping", file=sys.stderr)
             continue
     return articles
+
+
+async def fetch_articles_async(
+    parser,
+    pmids: List[str],
+    concurrency: Optional[int] = None,
+    max_per_host: Optional[int] = None,
+    client: Optional[httpx.AsyncClient] = None,
+) -> List[PubmedArticle]:
+    """Concurrently fetch journal metadata over a single pooled AsyncClient.
+
+    At most `concurrency` articles are in flight at once, and at most
+    `max_per_host` connections are opened to any one host. Results keep the
+    order of `pmids`; articles that fail to fetch or parse are skipped.
+    """
+    limits = CONFIG.get("request", {}).get("limits", {})
+    concurrency = concurrency or limits.get("concurrency", 10)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch_one(pmid: str, client: httpx.AsyncClient):
+        async with semaphore:
+            try:
+                return await parser.fetch_article_async(pmid, client)
+            except AttributeError:
+                print(
+                    f"Failed to parse article metadata. Skipping {pmid}",
+                    file=sys.stderr,
+                )
+                return None
+            except (httpx.HTTPError, FormatError) as e:
+                print(f"Failed to fetch {pmid} ({e}). Skipping", file=sys.stderr)
+                return None
+            except Exception as e:
+                # A malformed page must not abort the rest of the batch.
+                print(
+                    f"Failed to parse {pmid} ({type(e).__name__}: {e}). Skipping",
+                    file=sys.stderr,
+                )
+                return None
+
+    if client is None:
+        async with async_client(concurrency, max_per_host) as client:
+            results = await asyncio.gather(*(fetch_one(p, client) for p in pmids))
+    else:
+        results = await asyncio.gather(*(fetch_one(p, client) for p in pmids))
+    return [a for a in results if a is not None]
+
+
+async def stream_results_async(
+    parser,
+    pmids: Iterable[str],
+    concurrency: Optional[int] = None,
+    max_per_host: Optional[int] = None,
+    client: Optional[httpx.AsyncClient] = None,
+) -> AsyncIterator[Tuple[str, Optional[PubmedArticle], Optional[Exception]]]:
+    """Yield (pmid, article, error) for every PMID, in completion order.
+
+    PMIDs are pulled from `pmids` lazily and at most `concurrency` fetches
+    are pending at a time, so memory stays constant regardless of the
+    number of PMIDs. Exactly one of `article` and `error` is set.
+    """
+    limits = CONFIG.get("request", {}).get("limits", {})
+    concurrency = concurrency or limits.get("concurrency", 10)
+
+    async def fetch_one(pmid: str, client: httpx.AsyncClient):
+        try:
+            return pmid, await parser.fetch_article_async(pmid, client), None
+        except Exception as e:
+            # Unexpected parse errors are reported per PMID like fetch errors.
+            return pmid, None, e
+
+    async def run(client: httpx.AsyncClient):
+        pending = set()
+        for pmid in pmids:
+            pending.add(asyncio.create_task(fetch_one(pmid, client)))
+            if len(pending) < concurrency:
+                continue
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                yield task.result()
+        for task in asyncio.as_completed(pending):
+            yield await task
+
+    if client is None:
+        async with async_client(concurrency, max_per_host) as client:
+            async for result in run(client):
+                yield result
+    else:
+        async for result in run(client):
+            yield result
+
+
+async def stream_articles_async(
+    parser,
+    pmids: Iterable[str],
+    concurrency: Optional[int] = None,
+    max_per_host: Optional[int] = None,
+    client: Optional[httpx.AsyncClient] = None,
+) -> AsyncIterator[PubmedArticle]:
+    """Yield articles as soon as they are fetched, skipping failures."""
+    results = stream_results_async(parser, pmids, concurrency, max_per_host, client)
+    async for pmid, article, error in results:
+        if isinstance(error, AttributeError):
+            print(f"Failed to parse article metadata. Skipping {pmid}", file=sys.stderr)
+        elif error is not None:
+            print(f"Failed to fetch {pmid} ({error}). Skipping", file=sys.stderr)
+        else:
+            yield article
+
+
+def batched(pmids: Iterable[str], size: int) -> Iterator[List[str]]:
+    """Lazily split an iterable of PMIDs into lists of at most `size`."""
+    iterator = iter(pmids)
+    while batch := list(islice(iterator, size)):
+        yield batch
@@ -1,4 +1,12 @@
 import re
+from typing import Iterable, List
+
+# Prefixes and zero padding that do not change which article is meant.
+PMID_RE = re.compile(r"(?:PMID:?\s*)?0*(\d{1,8})", re.IGNORECASE)
+PMCID_RE = re.compile(r"PMC\s*(\d{7,8})", re.IGNORECASE)
+DOI_RE = re.compile(
+    r"(?:doi:\s*|https?://(?:dx\.)?doi\.org/)?(10\.\d{4,9}/\S+)", re.IGNORECASE
+)
 
 
 class FormatError(Exception):
@@ -13,11 +21,11 @@ def validate_pmid(pmid: str) -> str:
     Returns the same PMID as a string if it is valid.
     Otherwise, a ValueError is raised.
     """
-    pmid_re = r"\d{8}"
+    pmid_re = r"\b\d{1,8}\b"
     match = re.search(pmid_re, pmid)
     if match:
         return match.group(0)
-    raise FormatError("Invalid PMID: format should follow XXXXXXXX")
+    raise FormatError("Invalid PMID: format should follow XXXXXXXX (1 to 8 digits)")
 
 
 def validate_pmcid(pmcid: str) -> str:
@@ -26,8 +34,76 @@ def validate_pmcid(pmcid: str) -> str:
     Returns the same PMCID as a string if it is valid.
     Otherwise, a ValueError is raised.
     """
-    pmcid_re = r"^PMC\d{7}"
+    pmcid_re = r"^PMC\d{7,8}"
     match = re.search(pmcid_re, pmcid)
     if match:
         return match.group(0)
     raise FormatError("Invalid PMCID: format should follow PMCXXXXXXX")
+
+
+def validate_orcid(orcid: str) -> str:
+    """Validates the format of a given ORCID iD.
+
+    Returns the bare identifier, also when given as an orcid.org URL.
+    Otherwise, a FormatError is raised.
+    """
+    orcid_re = r"\d{4}-\d{4}-\d{4}-\d{3}[\dX]"
+    match = re.search(orcid_re, orcid)
+    if match:
+        return match.group(0)
+    raise FormatError("Invalid ORCID: format should follow XXXX-XXXX-XXXX-XXXX")
+
+
+def canonical_id(locator: str) -> str:
+    """Canonical form of a PMID, PMCID or article URL.
+
+    "PMID: 00123456" becomes "123456" and "pmc1234567" becomes "PMC1234567";
+    URLs are kept as given. Anything else raises a FormatError.
+    """
+    locator = locator.strip()
+    if "http" in locator:
+        return locator
+    if match := PMCID_RE.fullmatch(locator):
+        return f"PMC{match.group(1)}"
+    if (match := PMID_RE.fullmatch(locator)) and int(match.group(1)):
+        return str(int(match.group(1)))
+    raise FormatError(f"Invalid PMID or PMCID: {locator!r}")
+
+
+def canonical_doi(locator: str) -> str:
+    """A DOI without its "doi:" or doi.org prefix.
+
+    "https://doi.org/10.1038/X" becomes "10.1038/X"; DOIs are compared
+    case-insensitively but returned as given. Anything else raises a FormatError.
+    """
+    if match := DOI_RE.fullmatch(locator.strip()):
+        return match.group(1)
+    raise FormatError(f"Invalid DOI: {locator!r}")
+
+
+def normalize_ids(locators: Iterable[str]) -> List[str]:
+    """Validate, canonicalize and deduplicate identifiers in a single pass.
+
+    Blank lines are skipped and the first occurrence of each article is kept.
+    Every malformed identifier is reported in one FormatError, so a bad
+    input list is rejected before any request is sent.
+    """
+    seen = set()
+    unique: List[str] = []
+    invalid: List[str] = []
+    for number, locator in enumerate(locators, 1):
+        if not locator.strip():
+            continue
+        try:
+            key = canonical_id(locator)
+        except FormatError:
+            invalid.append(f"line {number}: {locator.strip()!r}")
+            continue
+        if key not in seen:
+            seen.add(key)
+            unique.append(key)
+    if invalid:
+        shown = ", ".join(invalid[:5])
+        more = f" and {len(invalid) - 5} more" if len(invalid) > 5 else ""
+        raise FormatError(f"Invalid PMID or PMCID on {shown}{more}")
+    return unique
@@ -0,0 +1,335 @@
+import sqlite3
+import sys
+import time
+import xml.etree.ElementTree as ET
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+import httpx
+from pydantic import BaseModel
+
+from pmbuddy.config import CONFIG
+from pmbuddy.jobs import error_category
+from pmbuddy.models import PubmedArticle
+from pmbuddy.util.requests import async_client, esearch_async, stream_results_async
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS searches (
+    name TEXT PRIMARY KEY,
+    query TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    synced_on TEXT,
+    hits INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS search_hits (
+    name TEXT NOT NULL,
+    pmid TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    PRIMARY KEY (name, pmid)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS search_retry (
+    name TEXT NOT NULL,
+    pmid TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    attempts INTEGER NOT NULL,
+    error TEXT,
+    PRIMARY KEY (name, pmid)
+) WITHOUT ROWID;
+"""
+
+# PubMed stops paging esearch results at this many hits.
+MAX_HITS = 10000
+
+# Date format of esearch's mindate and of `SavedSearch.synced_on`.
+DATE_FORMAT = "%Y/%m/%d"
+
+
+class SavedSearch(BaseModel):
+    name: str
+    query: str
+    # Day of the last complete sync; None until the first one.
+    synced_on: Optional[str] = None
+    hits: int = 0
+
+
+class SyncResult(BaseModel):
+    name: str
+    since: Optional[str] = None
+    new: int = 0
+    modified: int = 0
+    failed: int = 0
+    searched: int = 0
+    retried: int = 0
+    truncated: bool = False
+
+    def summary(self) -> str:
+        window = f"since {self.since}" if self.since else "full search"
+        retried = f", {self.retried} retried" if self.retried else ""
+        truncated = ", truncated" if self.truncated else ""
+        return (
+            f"{self.name}: {self.new} new, {self.modified} modified, "
+            f"{self.failed} failed of {self.searched} hits{retried} "
+            f"({window}{truncated})"
+        )
+
+
+def parse_esearch(content: bytes) -> Tuple[int, List[str]]:
+    """The total hit count and this page's PMIDs of an esearch response."""
+    root = ET.fromstring(content)
+    error = root.findtext("ERROR")
+    if error:
+        raise ValueError(f"esearch failed: {error}")
+    return int(root.findtext("Count") or 0), [
+        node.text for node in root.iterfind("IdList/Id") if node.text
+    ]
+
+
+async def search_pmids(
+    term: str,
+    client: httpx.AsyncClient,
+    page_size: int = 5000,
+    **params: str,
+) -> Tuple[List[str], bool]:
+    """PMIDs matching `term`, requested `page_size` at a time.
+
+    Returns the PMIDs and whether they were truncated at MAX_HITS.
+    """
+    pmids: List[str] = []
+    total = None
+    while total is None or len(pmids) < min(total, MAX_HITS):
+        retmax = min(page_size, MAX_HITS - len(pmids))
+        content = await esearch_async(term, client, len(pmids), retmax, **params)
+        total, page = parse_esearch(content)
+        if not page:
+            break
+        pmids.extend(page)
+    truncated = bool(total and total > MAX_HITS)
+    if truncated:
+        print(
+            f"Only the first {MAX_HITS} of {total} hits of {term!r} are synced; "
+            "narrow the query or save it with a later --since",
+            file=sys.stderr,
+        )
+    return pmids, truncated
+
+
+class SavedSearches:
+    """Named PubMed queries with a high-water mark, synced by fetching deltas.
+
+    The first sync of a search fetches every hit. Later syncs ask esearch only
+    for records entered (edat) or modified (mdat) since the day of the last
+    sync, minus `overlap_days`. Hits that were never fetched are fetched as new,
+    and modified hits that were fetched before are refetched past the cache.
+    Fetched hits are recorded as they arrive. PMIDs that fail are kept in a
+    retry table and fetched again by the next `max_attempts - 1` syncs, so
+    the mark advances regardless. It does not advance when a search was
+    truncated at MAX_HITS, since the hits beyond it were never seen.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str | Path] = None,
+        overlap_days: Optional[int] = None,
+        page_size: Optional[int] = None,
+        max_attempts: Optional[int] = None,
+    ) -> None:
+        cfg = CONFIG.get("watch", {})
+        self.path = Path(path or cfg.get("path", "watch.sqlite3")).expanduser()
+        self.overlap_days = (
+            overlap_days if overlap_days is not None else cfg.get("overlap_days", 1)
+        )
+        self.page_size = page_size or cfg.get("page_size", 5000)
+        self.max_attempts = max_attempts or cfg.get("max_attempts", 3)
+        if str(self.path) != ":memory:":
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def add(self, name: str, query: str, since: Optional[date] = None) -> SavedSearch:
+        """Save a query; with `since`, the first sync only fetches later records."""
+        synced_on = since.strftime(DATE_FORMAT) if since else None
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO searches (name, query, created_at, synced_on) "
+                "VALUES (?, ?, ?, ?)",
+                (name, query, time.time(), synced_on),
+            )
+            self.conn.execute("DELETE FROM search_hits WHERE name = ?", (name,))
+            self.conn.execute("DELETE FROM search_retry WHERE name = ?", (name,))
+        return SavedSearch(name=name, query=query, synced_on=synced_on)
+
+    def remove(self, name: str) -> bool:
+        with self.conn:
+            removed = self.conn.execute(
+                "DELETE FROM searches WHERE name = ?", (name,)
+            ).rowcount
+            self.conn.execute("DELETE FROM search_hits WHERE name = ?", (name,))
+            self.conn.execute("DELETE FROM search_retry WHERE name = ?", (name,))
+        return bool(removed)
+
+    def get(self, name: str) -> SavedSearch:
+        row = self.conn.execute(
+            "SELECT name, query, synced_on, hits FROM searches WHERE name = ?", (name,)
+        ).fetchone()
+        if row is None:
+            raise KeyError(f"No saved search named {name!r}")
+        return SavedSearch(name=row[0], query=row[1], synced_on=row[2], hits=row[3])
+
+    def list(self) -> List[SavedSearch]:
+        rows = self.conn.execute(
+            "SELECT name, query, synced_on, hits FROM searches ORDER BY name"
+        )
+        return [
+            SavedSearch(name=name, query=query, synced_on=synced_on, hits=hits)
+            for name, query, synced_on, hits in rows
+        ]
+
+    def fetched(self, name: str, pmids: Iterable[str]) -> Set[str]:
+        """The PMIDs among `pmids` already fetched for search `name`."""
+        pmids = list(pmids)
+        found: Set[str] = set()
+        # SQLite limits the number of bound parameters per statement.
+        for i in range(0, len(pmids), 500):
+            chunk = pmids[i : i + 500]
+            rows = self.conn.execute(
+                "SELECT pmid FROM search_hits "
+                f"WHERE name = ? AND pmid IN ({', '.join('?' * len(chunk))})",
+                [name, *chunk],
+            )
+            found.update(pmid for (pmid,) in rows)
+        return found
+
+    def retries(self, name: str) -> Dict[str, str]:
+        """PMIDs of search `name` that failed before, mapped to "new" or "modified"."""
+        rows = self.conn.execute(
+            "SELECT pmid, kind FROM search_retry WHERE name = ?", (name,)
+        )
+        return dict(rows.fetchall())
+
+    def _fetched(self, name: str, pmid: str) -> None:
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO search_hits VALUES (?, ?, ?)",
+                (name, pmid, time.time()),
+            )
+            self.conn.execute(
+                "DELETE FROM search_retry WHERE name = ? AND pmid = ?", (name, pmid)
+            )
+
+    def _failed(self, name: str, pmid: str, kind: str, error: Exception) -> None:
+        category = error_category(error)
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO search_retry VALUES (?, ?, ?, 1, ?) "
+                "ON CONFLICT (name, pmid) DO UPDATE SET "
+                "attempts = attempts + 1, error = excluded.error",
+                (name, pmid, kind, category),
+            )
+            given_up = self.conn.execute(
+                "DELETE FROM search_retry "
+                "WHERE name = ? AND pmid = ? AND attempts >= ?",
+                (name, pmid, self.max_attempts),
+            ).rowcount
+        retry = "giving up" if given_up else "will retry"
+        print(f"Failed to fetch {pmid} ({category}), {retry}", file=sys.stderr)
+
+    def since(self, search: SavedSearch) -> Optional[str]:
+        """First day of the next delta search, or None for a full search."""
+        if search.synced_on is None:
+            return None
+        synced = date(*map(int, search.synced_on.split("/")))
+        return (synced - timedelta(days=self.overlap_days)).strftime(DATE_FORMAT)
+
+    async def delta(
+        self, search: SavedSearch, client: httpx.AsyncClient
+    ) -> Tuple[List[str], List[str], int, bool]:
+        """(new, modified) PMIDs of a search, the number of hits searched and
+        whether any search was truncated at MAX_HITS."""
+        since = self.since(search)
+        if since is None:
+            entered, truncated = await search_pmids(
+                search.query, client, self.page_size
+            )
+            modified = []
+        else:
+            window = {"mindate": since, "maxdate": "3000"}
+            entered, entered_truncated = await search_pmids(
+                search.query, client, self.page_size, datetype="edat", **window
+            )
+            modified, modified_truncated = await search_pmids(
+                search.query, client, self.page_size, datetype="mdat", **window
+            )
+            truncated = entered_truncated or modified_truncated
+        hits = list(dict.fromkeys(entered + modified))
+        seen = self.fetched(search.name, hits)
+        new = [pmid for pmid in hits if pmid not in seen]
+        changed = [pmid for pmid in dict.fromkeys(modified) if pmid in seen]
+        return new, changed, len(hits), truncated
+
+    async def sync(
+        self,
+        name: str,
+        parser,
+        refresh_parser=None,
+        client: Optional[httpx.AsyncClient] = None,
+        today: Optional[date] = None,
+        on_article: Optional[Callable[[PubmedArticle], None]] = None,
+    ) -> SyncResult:
+        """Fetch the new and modified hits of a saved search.
+
+        New hits are fetched with `parser` (e.g. a CachedParser), modified ones
+        with `refresh_parser`, which should bypass the cache. PMIDs that failed
+        in earlier syncs are retried alongside them. Fetched articles are
+        passed to `on_article` as they arrive.
+        """
+        if client is None:
+            async with async_client() as client:
+                return await self.sync(
+                    name, parser, refresh_parser, client, today, on_article
+                )
+        search = self.get(name)
+        # The mark is the day the sync started, so records added while it
+        # runs are covered by the next one.
+        today = today or date.today()
+        new, modified, searched, truncated = await self.delta(search, client)
+        result = SyncResult(
+            name=name, since=self.since(search), searched=searched, truncated=truncated
+        )
+        retries = self.retries(name)
+        result.retried = len(retries)
+        new = list(dict.fromkeys(new + [p for p, k in retries.items() if k == "new"]))
+        modified = list(
+            dict.fromkeys(modified + [p for p, k in retries.items() if k == "modified"])
+        )
+        for pmids, fetcher, kind in (
+            (new, parser, "new"),
+            (modified, refresh_parser or parser, "modified"),
+        ):
+            results = stream_results_async(fetcher, pmids, client=client)
+            async for pmid, article, error in results:
+                if error is not None:
+                    self._failed(name, pmid, kind, error)
+                    result.failed += 1
+                    continue
+                setattr(result, kind, getattr(result, kind) + 1)
+                if on_article is not None:
+                    on_article(article)
+                # Recorded once delivered, so an interrupted sync at worst
+                # delivers an article twice but never skips one.
+                self._fetched(name, pmid)
+        with self.conn:
+            if not truncated:
+                self.conn.execute(
+                    "UPDATE searches SET synced_on = ? WHERE name = ?",
+                    (today.strftime(DATE_FORMAT), name),
+                )
+            self.conn.execute(
+                "UPDATE searches SET hits = "
+                "(SELECT COUNT(*) FROM search_hits WHERE name = ?) WHERE name = ?",
+                (name, name),
+            )
+        return result
@@ -18,7 +18,12 @@ setuptools.setup(
         "Programming Language :: Python :: 3.12",
     ],
     python_requires=">=3.12",
-    install_requires=["httpx", "pydantic", "pandas", "bs4"],
+    install_requires=["httpx", "pydantic", "pandas", "numpy", "bs4"],
+    extras_require={
+        "lxml": ["lxml"],
+        "store": ["pyarrow"],
+        "msgpack": ["msgpack"],
+    },
     packages=setuptools.find_packages(),
     include_package_data=True,
     entry_points={"console_scripts": ["pmb = pmbuddy.cli:main"]},
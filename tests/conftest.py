@@ -0,0 +1,13 @@
+import pytest
+
+from pmbuddy.util import ratelimit
+
+
+@pytest.fixture(autouse=True)
+def fast_rate_limit():
+    """Tests talk to in-process transports, so NCBI's rate limits do not apply."""
+    ratelimit.LIMITER = ratelimit.TokenBucket(rate=10_000, burst=10_000)
+    ratelimit.RETRY = ratelimit.RetryPolicy(max_retries=3, backoff_base=0.001)
+    yield
+    ratelimit.LIMITER = None
+    ratelimit.RETRY = None
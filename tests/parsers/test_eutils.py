@@ -0,0 +1,92 @@
+from pathlib import Path
+
+import httpx
+from pytest import raises
+
+from pmbuddy.parsers import EutilsParser
+from pmbuddy.util.validation import FormatError
+
+FIXTURES = Path(__file__).parents[1] / "fixtures"
+EFETCH = (FIXTURES / "efetch_pubmed.xml").read_bytes()
+
+
+class TestEutilsParser:
+    parser = EutilsParser()
+
+    def test_parse_efetch(self):
+        first, second = self.parser.parse_efetch(EFETCH)
+        assert first.pmid == "38697854"
+        assert first.pmcid == "PMC11065001"
+        assert first.title == "Single-cell atlas of the developing zebrafish retina."
+        assert first.authors == ["Maria A Reyes", "Kenji Tanaka", "Chidi Okafor"]
+        assert "zebrafish retina" in first.abstract
+        assert first.citation.journal == "Nat Commun"
+        assert first.citation.doi == "10.1038/s41467-024-47998-1"
+        assert first.citation.publication_date.year == 2024
+        assert first.citation.publication_date.month == "May"
+        assert first.citation.issue_num == 1
+        assert second.authors[-1] == "Mangrove Microbiome Consortium"
+        assert second.citation.pages.start == 301
+        assert second.citation.pages.end == 309
+        assert len(second.abstract.splitlines()) == 2
+
+    def test_author_records(self):
+        first, second = self.parser.parse_efetch(EFETCH)
+        reyes = first.author_records[0]
+        assert (reyes.last_name, reyes.initials, reyes.key) == (
+            "Reyes",
+            "MA",
+            "reyes ma",
+        )
+        assert reyes.orcid == "0000-0002-1825-0097"
+        assert reyes.affiliation.startswith("Department of Biology")
+        assert second.author_records[1].affiliation is None
+        assert second.author_records[-1].collective
+
+    def test_parse_pages(self):
+        assert self.parser._parse_pages("1234-9").end == 1239
+        assert self.parser._parse_pages("e1002") is None
+
+    def test_medline_dates(self):
+        """Ranged and seasonal dates keep their first year."""
+        day = b"<PubDate><Year>2024</Year><Month>May</Month><Day>02</Day></PubDate>"
+        for medline_date, year, month in (
+            (b"2024 May-Jun", 2024, "May"),
+            (b"Winter 2023", 2023, None),
+            (b"2023-2024", 2023, None),
+            (b"2023 Dec-2024 Jan", 2023, "Dec"),
+        ):
+            content = EFETCH.replace(
+                day, b"<PubDate><MedlineDate>%s</MedlineDate></PubDate>" % medline_date
+            )
+            first = self.parser.parse_efetch(content)[0]
+            date = first.citation.publication_date
+            assert (date.year, date.month) == (year, month)
+        content = EFETCH.replace(
+            day, b"<PubDate><MedlineDate>Spring</MedlineDate></PubDate>"
+        )
+        with raises(FormatError):
+            self.parser.parse_efetch(content)
+
+    def test_missing_record(self):
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, content=b"<PubmedArticleSet/>")
+
+        client = httpx.Client(transport=httpx.MockTransport(handler))
+        with raises(LookupError):
+            EutilsParser(client=client).fetch_from_id("1")
+
+    def test_batched_requests(self):
+        """PMIDs are sent in batches of `batch_size` per efetch request."""
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request)
+            return httpx.Response(200, content=EFETCH)
+
+        client = httpx.Client(transport=httpx.MockTransport(handler))
+        parser = EutilsParser(batch_size=2, client=client)
+        articles = parser.fetch_from_ids(["38697854", "39096902"] * 2)
+        assert len(calls) == 2
+        assert len(articles) == 4
+        assert b"id=38697854%2C39096902" in calls[0].content
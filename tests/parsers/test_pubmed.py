@@ -0,0 +1,68 @@
+from pathlib import Path
+
+import pytest
+
+from pmbuddy.parsers import PubmedParser
+from pmbuddy.parsers.Pubmed import author_from_listing
+from pmbuddy.util import ENGINES
+
+FIXTURES = Path(__file__).parents[1] / "fixtures"
+OVERVIEWS = sorted(FIXTURES.glob("pubmed_*.html"))
+PAGES = sorted(FIXTURES.glob("pmc_*.html"))
+
+
+class TestPubmedParser:
+    def test_parse_overview(self):
+        article = PubmedParser().parse_overview(OVERVIEWS[0].read_bytes())
+        assert article.pmid == "38697854"
+        assert article.pmcid == "PMC11065001"
+        assert article.title == "Single-cell atlas of the developing zebrafish retina"
+        assert article.citation.journal == "Nat Commun"
+        assert article.citation.publication_date.month == "May"
+
+    def test_overview_author_records(self):
+        article = PubmedParser().parse_overview(OVERVIEWS[0].read_bytes())
+        reyes, tanaka, _ = article.author_records
+        assert (reyes.last_name, reyes.fore_name, reyes.initials) == (
+            "Reyes",
+            "Maria A",
+            "MA",
+        )
+        assert tanaka.affiliation.startswith("Institute for Developmental Genetics")
+
+    def test_author_from_listing(self):
+        author = author_from_listing(
+            "Ana de la Cruz",
+            "/?term=de+la+Cruz+A",
+            None,
+            "https://orcid.org/0000-0002-1694-233X",
+        )
+        assert author.last_name == "de la Cruz"
+        assert author.key == "delacruz a"
+        assert author.orcid == "0000-0002-1694-233X"
+
+    def test_parse_page(self):
+        article = PubmedParser().parse_page(PAGES[0].read_bytes())
+        assert article.pmid == "38697854"
+        assert article.pmcid == "PMC11065001"
+        assert article.authors == ["Maria A Reyes", "Kenji Tanaka", "Chidi Okafor"]
+        assert article.citation.doi == "10.1038/s41467-024-47998-1"
+        assert article.citation.publication_date.year == 2024
+
+    @pytest.mark.parametrize("engine", ENGINES)
+    def test_engines_are_identical(self, engine):
+        """Every parsing engine builds the same articles as html.parser."""
+        if engine == "lxml":
+            pytest.importorskip("lxml")
+        reference = PubmedParser("html.parser")
+        parser = PubmedParser(engine)
+        for path in OVERVIEWS:
+            content = path.read_bytes()
+            assert parser.parse_overview(content) == reference.parse_overview(content)
+        for path in PAGES:
+            content = path.read_bytes()
+            assert parser.parse_page(content) == reference.parse_page(content)
+
+    def test_unknown_engine(self):
+        with pytest.raises(ValueError):
+            PubmedParser("regex").parse_overview(OVERVIEWS[0].read_bytes())
@@ -0,0 +1,97 @@
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+from pmbuddy import cli
+from pmbuddy.cache import ArticleCache
+from pmbuddy.cache.authors import AuthorIndex, query_key
+from pmbuddy.models import Author, author_key
+from pmbuddy.parsers import EutilsParser
+
+FIXTURES = Path(__file__).parent / "fixtures"
+ARTICLES = EutilsParser().parse_efetch((FIXTURES / "efetch_pubmed.xml").read_bytes())
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ArticleCache(tmp_path / "cache.sqlite3")
+    for article in ARTICLES:
+        cache.put(article)
+    return cache
+
+
+class TestAuthorKeys:
+    def test_author_key_normalizes(self):
+        assert author_key("Núñez-Ruiz", "J.") == author_key("Nunez Ruiz", "J")
+        assert author_key("Reyes", "MA") == "reyes ma"
+
+    def test_author_key_is_interned(self):
+        assert author_key("Reyes", "MA") is author_key("REYES", "M.A.")
+
+    def test_from_name(self):
+        author = Author.from_name("Maria A Reyes")
+        assert (author.last_name, author.initials, author.name) == (
+            "Reyes",
+            "MA",
+            "Maria A Reyes",
+        )
+
+    @pytest.mark.parametrize("query", ["Reyes MA", "Maria A Reyes", "Reyes, MA"])
+    def test_query_key(self, query):
+        assert query_key(query) == "reyes ma"
+
+
+class TestAuthorIndex:
+    def test_sync_is_incremental(self, cache):
+        index = AuthorIndex(cache)
+        assert index.sync() == len(ARTICLES)
+        assert index.sync() == 0
+        assert len(index) == 6
+
+    @pytest.mark.parametrize(
+        "query", ["Reyes MA", "Reyes M", "Reyes", "Maria A Reyes", "reyes"]
+    )
+    def test_lookup(self, cache, query):
+        index = AuthorIndex(cache)
+        index.sync()
+        assert index.lookup(query) == ["38697854"]
+
+    def test_lookup_other_authors(self, cache):
+        index = AuthorIndex(cache)
+        index.sync()
+        assert index.lookup("Fernandez L") == ["39096902"]
+        assert index.lookup("Mangrove Microbiome Consortium") == ["39096902"]
+        assert index.lookup("Reyes X") == []
+
+    def test_by_orcid(self, cache):
+        index = AuthorIndex(cache)
+        index.sync()
+        assert index.by_orcid("0000-0002-1825-0097") == ["38697854"]
+
+    def test_evicted_articles_leave_the_index(self, cache):
+        index = AuthorIndex(cache)
+        index.sync()
+        cache.clear()
+        assert index.lookup("Reyes") == []
+
+    def test_articles_without_records(self, cache):
+        legacy = ARTICLES[0].model_copy(update={"author_records": None})
+        cache.put(legacy)
+        index = AuthorIndex(cache)
+        index.sync()
+        assert index.lookup("Okafor C") == [legacy.pmid]
+
+
+class TestAuthorCommand:
+    def test_author_writes_jsonl(self, cache, monkeypatch, capsys):
+        monkeypatch.setitem(cli.CONFIG["cache"], "path", str(cache.path))
+        monkeypatch.setattr(
+            sys, "argv", ["pmb", "author", "Fernandez L", "--format", "jsonl"]
+        )
+        with pytest.raises(SystemExit) as exit:
+            cli.main()
+        assert exit.value.code == 0
+        rows = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        assert [row["pmid"] for row in rows] == ["39096902"]
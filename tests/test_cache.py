@@ -0,0 +1,183 @@
+import asyncio
+from pathlib import Path
+
+import httpx
+
+from pmbuddy.cache import ArticleCache, CachedParser
+from pmbuddy.cache.pages import PageCache
+from pmbuddy.parsers import ArticleParser, EutilsParser
+from pmbuddy.util.requests import (
+    async_client,
+    content_from_url_async,
+    fetch_articles_async,
+    set_page_cache,
+)
+
+FIXTURES = Path(__file__).parent / "fixtures"
+ARTICLES = EutilsParser().parse_efetch((FIXTURES / "efetch_pubmed.xml").read_bytes())
+
+
+class CountingParser:
+    def __init__(self):
+        self.calls = 0
+
+    def fetch_article(self, locator, revalidate=False):
+        self.calls += 1
+        return next(a for a in ARTICLES if locator in (a.pmid, a.pmcid))
+
+    def fetch_from_ids(self, ids):
+        self.calls += 1
+        return [a for a in ARTICLES if a.pmid in ids or a.pmcid in ids]
+
+
+class TestArticleCache:
+    def test_roundtrip_by_pmid_and_pmcid(self, tmp_path):
+        cache = ArticleCache(tmp_path / "cache.sqlite3")
+        cache.put(ARTICLES[0], fetch_seconds=0.5)
+        assert cache.get("38697854") == ARTICLES[0]
+        assert cache.get("PMC11065001") == ARTICLES[0]
+        assert cache.get("39096902") is None
+        assert cache.stats.hits == 2
+        assert cache.stats.misses == 1
+        assert cache.stats.saved_seconds == 1.0
+
+    def test_persists_across_instances(self, tmp_path):
+        ArticleCache(tmp_path / "cache.sqlite3").put(ARTICLES[0])
+        assert ArticleCache(tmp_path / "cache.sqlite3").get("38697854") is not None
+
+    def test_ttl_expiry(self, tmp_path):
+        cache = ArticleCache(tmp_path / "cache.sqlite3", ttl=-1)
+        cache.put(ARTICLES[0])
+        assert cache.get("38697854") is None
+        assert cache.stats.expired == 1
+
+    def test_lru_eviction(self, tmp_path):
+        cache = ArticleCache(tmp_path / "cache.sqlite3", max_entries=1)
+        cache.put(ARTICLES[0])
+        cache.put(ARTICLES[1])
+        assert len(cache) == 1
+        assert cache.get("39096902") is not None
+        assert cache.stats.evicted == 1
+
+    def test_size_checked_every_evict_interval(self, tmp_path):
+        cache = ArticleCache(
+            tmp_path / "cache.sqlite3", max_entries=1, evict_interval=3
+        )
+        copies = [ARTICLES[0].model_copy(update={"pmid": str(i)}) for i in range(1, 4)]
+        for article in copies[:2]:
+            cache.put(article)
+        assert len(cache) == 2
+        cache.put(copies[2])
+        assert len(cache) == 1
+        assert cache.stats.evicted == 2
+
+
+class TestCachedParser:
+    def test_fetch_article(self, tmp_path):
+        inner = CountingParser()
+        parser = CachedParser(inner, ArticleCache(tmp_path / "cache.sqlite3"))
+        parser.fetch_article("38697854")
+        parser.fetch_article("38697854")
+        assert inner.calls == 1
+
+    def test_refresh_bypasses_reads(self, tmp_path):
+        inner = CountingParser()
+        cache = ArticleCache(tmp_path / "cache.sqlite3")
+        CachedParser(inner, cache).fetch_article("38697854")
+        CachedParser(inner, cache, refresh=True).fetch_article("38697854")
+        assert inner.calls == 2
+
+    def test_fetch_from_ids_only_fetches_misses(self, tmp_path):
+        inner = CountingParser()
+        cache = ArticleCache(tmp_path / "cache.sqlite3")
+        cache.put(ARTICLES[0])
+        articles = CachedParser(inner, cache).fetch_from_ids(["38697854", "39096902"])
+        assert [a.pmid for a in articles] == ["38697854", "39096902"]
+        assert inner.calls == 1
+        assert cache.stats.hits == 1
+
+    def test_fetch_from_ids_returns_pmcid_misses(self, tmp_path):
+        inner = CountingParser()
+        cache = ArticleCache(tmp_path / "cache.sqlite3")
+        articles = CachedParser(inner, cache).fetch_from_ids(["PMC11302117"])
+        assert [a.pmid for a in articles] == ["39096902"]
+        assert cache.get("PMC11302117") is not None
+
+
+class TestConditionalRevalidation:
+    etag = '"v1"'
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        self.seen.append(request.headers.get("If-None-Match"))
+        if request.headers.get("If-None-Match") == self.etag:
+            return httpx.Response(304)
+        body = (FIXTURES / "pubmed_38697854.html").read_bytes()
+        return httpx.Response(200, content=body, headers={"ETag": self.etag})
+
+    def fetch(self, parser):
+        async def main():
+            transport = httpx.MockTransport(self.handler)
+            async with async_client(transport=transport) as client:
+                return await fetch_articles_async(parser, ["38697854"], client=client)
+
+        return asyncio.run(main())
+
+    def test_not_modified_reuses_cached_article(self, tmp_path):
+        self.seen = []
+        cache = ArticleCache(tmp_path / "cache.sqlite3")
+        pages = PageCache(tmp_path / "cache.sqlite3")
+        set_page_cache(pages)
+        try:
+            first = self.fetch(CachedParser(ArticleParser, cache))
+            second = self.fetch(CachedParser(ArticleParser, cache, refresh=True))
+        finally:
+            set_page_cache(None)
+        assert self.seen == [None, self.etag]
+        assert first == second
+        assert cache.stats.revalidated == 1
+        assert pages.revalidated == 1
+
+    def test_page_cache_roundtrip(self, tmp_path):
+        pages = PageCache(tmp_path / "pages.sqlite3")
+        pages.put("https://x/1/", {"ETag": '"a"', "Last-Modified": "Mon"}, b"body")
+        pages.put("https://x/2/", {}, b"no validators")
+        assert pages.get("https://x/1/") == ('"a"', "Mon", b"body")
+        assert pages.get("https://x/2/") is None
+        assert pages.validators("https://x/1/") == {
+            "If-None-Match": '"a"',
+            "If-Modified-Since": "Mon",
+        }
+
+    def test_page_cache_eviction(self, tmp_path):
+        pages = PageCache(tmp_path / "pages.sqlite3", max_entries=1)
+        pages.put("https://x/1/", {"ETag": '"a"'}, b"one")
+        pages.put("https://x/2/", {"ETag": '"b"'}, b"two")
+        assert len(pages) == 1
+        assert pages.get("https://x/1/") is None
+        assert pages.evicted == 1
+
+    def test_not_modified_after_eviction_refetches(self, tmp_path):
+        pages = PageCache(tmp_path / "pages.sqlite3")
+        url = "https://x/1/"
+        pages.put(url, {"ETag": self.etag}, b"old")
+        self.seen = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            self.seen.append(request.headers.get("If-None-Match"))
+            if request.headers.get("If-None-Match"):
+                # Another process evicts the page while the request is in flight.
+                pages.conn.execute("DELETE FROM pages")
+                return httpx.Response(304)
+            return httpx.Response(200, content=b"new", headers={"ETag": '"v2"'})
+
+        async def main():
+            transport = httpx.MockTransport(handler)
+            async with async_client(transport=transport) as client:
+                return await content_from_url_async(url, client)
+
+        set_page_cache(pages)
+        try:
+            assert asyncio.run(main()) == b"new"
+        finally:
+            set_page_cache(None)
+        assert self.seen == [self.etag, None]
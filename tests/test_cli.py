@@ -0,0 +1,139 @@
+import gzip
+import io
+import json
+import sys
+from pathlib import Path
+
+from pytest import raises
+
+from pmbuddy import cli
+from pmbuddy.models import PubmedArticle
+from pmbuddy.parsers import ArticleParser
+from pmbuddy.util import requests
+from pmbuddy.util.requests import fetch_articles
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+async def fake_content_from_url_async(url: str, client, revalidate=False) -> bytes:
+    return fake_content_from_url(url)
+
+
+def fake_content_from_url(url: str, revalidate=False) -> bytes:
+    pmid = url.rstrip("/").split("/")[-1]
+    return (FIXTURES / f"pubmed_{pmid}.html").read_bytes()
+
+
+class TestInProcessFetch:
+    pmids = ["38697854", "39096902"]
+
+    def test_fetch_articles(self, monkeypatch):
+        """Articles are parsed in-process into PubmedArticle models."""
+        monkeypatch.setattr(requests, "content_from_url", fake_content_from_url)
+        articles = fetch_articles(ArticleParser, self.pmids)
+        assert all(isinstance(a, PubmedArticle) for a in articles)
+        assert [a.pmid for a in articles] == self.pmids
+        assert articles[0].pmcid == "PMC11065001"
+        assert articles[0].authors == ["Maria A Reyes", "Kenji Tanaka", "Chidi Okafor"]
+        assert articles[0].citation.publication_date.year == 2024
+
+    def test_main_displays_table(self, monkeypatch, capsys):
+        """The CLI renders fetched articles without a temporary CSV file."""
+        monkeypatch.setattr(
+            requests, "content_from_url_async", fake_content_from_url_async
+        )
+        monkeypatch.setattr(
+            sys, "argv", ["pmb", "--no-cache", "--pmid", ",".join(self.pmids)]
+        )
+        monkeypatch.setattr(sys.stdin, "isatty", lambda: True)
+        with raises(SystemExit) as e:
+            cli.main()
+        assert e.value.code == 0
+        out = capsys.readouterr().out
+        assert "38697854" in out
+        assert "39096902" in out
+
+    def test_main_streams_jsonl(self, monkeypatch, capsys):
+        """With --format, records are written to stdout one per line."""
+        monkeypatch.setattr(
+            requests, "content_from_url_async", fake_content_from_url_async
+        )
+        argv = [
+            "pmb",
+            "--no-cache",
+            "--format",
+            "jsonl",
+            "--pmid",
+            ",".join(self.pmids),
+        ]
+        monkeypatch.setattr(sys, "argv", argv)
+        monkeypatch.setattr(sys.stdin, "isatty", lambda: True)
+        with raises(SystemExit) as e:
+            cli.main()
+        assert e.value.code == 0
+        records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        assert sorted(r["pmid"] for r in records) == sorted(self.pmids)
+
+    def test_main_streams_gzipped_bibtex(self, monkeypatch):
+        """--gzip compresses a citation format written to stdout."""
+        monkeypatch.setattr(
+            requests, "content_from_url_async", fake_content_from_url_async
+        )
+        argv = ["pmb", "--no-cache", "--format", "bibtex", "--gzip", "--pmid"]
+        monkeypatch.setattr(sys, "argv", argv + [",".join(self.pmids)])
+        monkeypatch.setattr(sys.stdin, "isatty", lambda: True)
+        stdout = io.TextIOWrapper(io.BytesIO())
+        monkeypatch.setattr(sys, "stdout", stdout)
+        with raises(SystemExit) as e:
+            cli.main()
+        assert e.value.code == 0
+        stdout.flush()
+        text = gzip.decompress(stdout.buffer.getvalue()).decode()
+        keys = sorted(entry.split(",")[0] for entry in text.split("@article{")[1:])
+        assert keys == [f"pmid{pmid}" for pmid in sorted(self.pmids)]
+
+    def test_main_rejects_unusable_output_options(self, monkeypatch, capsys):
+        monkeypatch.setattr(sys.stdin, "isatty", lambda: True)
+        for extra in (
+            ["--format", "csl-json", "--output", "articles.json"],
+            ["--gzip"],
+        ):
+            monkeypatch.setattr(sys, "argv", ["pmb", "--pmid", "38697854", *extra])
+            with raises(SystemExit) as e:
+                cli.main()
+            assert e.value.code == 2
+        err = capsys.readouterr().err
+        assert "csl-json cannot be appended" in err
+        assert "--gzip compresses" in err
+
+    def test_main_dedupes_input(self, monkeypatch, capsys):
+        """Repeated and zero-padded PMIDs are fetched and written once."""
+        fetched = []
+
+        async def counting_content(url: str, client, revalidate=False) -> bytes:
+            fetched.append(url)
+            return fake_content_from_url(url)
+
+        monkeypatch.setattr(requests, "content_from_url_async", counting_content)
+        pmids = self.pmids + ["PMID: 38697854", "039096902"]
+        argv = ["pmb", "--no-cache", "--format", "jsonl", "--pmid", ",".join(pmids)]
+        monkeypatch.setattr(sys, "argv", argv)
+        monkeypatch.setattr(sys.stdin, "isatty", lambda: True)
+        with raises(SystemExit) as e:
+            cli.main()
+        assert e.value.code == 0
+        assert len(fetched) == 2
+        assert len(capsys.readouterr().out.splitlines()) == 2
+
+    def test_main_rejects_malformed_ids_before_fetching(self, monkeypatch, capsys):
+        async def no_network(url: str, client, revalidate=False) -> bytes:
+            raise AssertionError(f"unexpected request for {url}")
+
+        monkeypatch.setattr(requests, "content_from_url_async", no_network)
+        argv = ["pmb", "--no-cache", "--pmid", "38697854,3891GH12"]
+        monkeypatch.setattr(sys, "argv", argv)
+        monkeypatch.setattr(sys.stdin, "isatty", lambda: True)
+        with raises(SystemExit) as e:
+            cli.main()
+        assert e.value.code == 2
+        assert "line 2: '3891GH12'" in capsys.readouterr().err
@@ -0,0 +1,202 @@
+import asyncio
+import io
+import sys
+from array import array
+from pathlib import Path
+from urllib.parse import parse_qs
+
+import httpx
+import pytest
+
+from pmbuddy import cli
+from pmbuddy.graph import (
+    CitationGraph,
+    GraphCrawler,
+    attach_links,
+    parse_elink,
+    seed_pmids,
+)
+from pmbuddy.parsers import EutilsParser
+from pmbuddy.util.requests import async_client
+from pmbuddy.util.validation import FormatError
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+# Synthetic citation tree: PMID n references 2n and 2n + 1.
+def references(pmid):
+    return [2 * pmid, 2 * pmid + 1]
+
+
+def cited_by(pmid):
+    return [pmid // 2] if pmid > 1 else []
+
+
+def elink_xml(links):
+    linksets = "".join(
+        f"<LinkSet><DbFrom>pubmed</DbFrom><IdList><Id>{source}</Id></IdList>"
+        "<LinkSetDb><DbTo>pubmed</DbTo>"
+        + "".join(f"<Link><Id>{pmid}</Id></Link>" for pmid in linked)
+        + "</LinkSetDb></LinkSet>"
+        for source, linked in links.items()
+    )
+    return f"<eLinkResult>{linksets}</eLinkResult>".encode()
+
+
+class ElinkHandler:
+    def __init__(self, fail=(), truncate=()):
+        self.fail = set(fail)
+        self.truncate = set(truncate)
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def __call__(self, request):
+        form = parse_qs(request.content.decode())
+        ids = [int(pmid) for pmid in form["id"]]
+        self.requests.append((form["linkname"][0], ids))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.001)
+        self.in_flight -= 1
+        if self.fail & set(ids):
+            return httpx.Response(500)
+        follow = references if form["linkname"][0].endswith("refs") else cited_by
+        content = elink_xml({i: follow(i) for i in ids})
+        if self.truncate & set(ids):
+            content = content[: len(content) // 2]
+        return httpx.Response(200, content=content)
+
+
+def crawl(handler, seeds, depth, **kwargs):
+    async def main():
+        transport = httpx.MockTransport(handler)
+        async with async_client(transport=transport) as client:
+            return await GraphCrawler(**kwargs).expand(seeds, depth, client)
+
+    return asyncio.run(main())
+
+
+class TestCitationGraph:
+    def test_from_edges_deduplicates(self):
+        graph = CitationGraph.from_edges(
+            array("q", [1, 1, 2, 1]), array("q", [2, 3, 3, 2]), nodes=[9]
+        )
+        assert list(graph.nodes) == [1, 2, 3, 9]
+        assert graph.n_edges == 3
+        assert graph.successors(1) == [2, 3]
+        assert graph.successors(9) == []
+        assert graph.successors(42) == []
+        assert 9 in graph and 42 not in graph
+
+    def test_from_no_edges(self):
+        graph = CitationGraph.from_edges(array("q"), array("q"), nodes={3, 1})
+        assert list(graph.nodes) == [1, 3]
+        assert list(graph.offsets) == [0, 0, 0]
+        assert graph.n_edges == 0
+
+    def test_roundtrip(self):
+        graph = CitationGraph.from_edges(array("q", [5, 5, 7]), array("q", [6, 7, 6]))
+        buffer = io.BytesIO()
+        graph.write(buffer)
+        buffer.seek(0)
+        loaded = CitationGraph.read(buffer)
+        assert list(loaded.edges()) == list(graph.edges())
+
+    def test_read_rejects_other_files(self):
+        with pytest.raises(ValueError):
+            CitationGraph.read(io.BytesIO(b"not a graph"))
+
+    def test_parse_elink(self):
+        assert parse_elink(elink_xml({1: [2, 3], 4: []})) == {1: [2, 3], 4: []}
+
+
+class TestGraphCrawler:
+    def test_references_to_depth(self):
+        graph = crawl(ElinkHandler(), ["1"], depth=3, direction="references")
+        assert len(graph) == 15
+        assert graph.n_edges == 14
+        assert graph.successors(2) == [4, 5]
+
+    def test_both_directions_visit_each_pmid_once(self):
+        handler = ElinkHandler()
+        graph = crawl(handler, [4, 4], depth=2, direction="both", batch_size=1)
+        # 4 cites 8, 9 and is cited by 2; then 8, 9 cite 16..19 and 2 is cited by 1
+        # and cites 5.
+        assert sorted(graph.nodes) == [1, 2, 4, 5, 8, 9, 16, 17, 18, 19]
+        pairs = [(name, pmid) for name, ids in handler.requests for pmid in ids]
+        assert len(pairs) == len(set(pairs))
+        assert sorted(pmid for name, pmid in pairs if name.endswith("refs")) == [
+            2,
+            4,
+            8,
+            9,
+        ]
+
+    def test_bounded_concurrency(self):
+        handler = ElinkHandler()
+        crawl(
+            handler, [1], depth=6, direction="references", batch_size=2, concurrency=3
+        )
+        assert handler.max_in_flight <= 3
+
+    def test_max_nodes(self):
+        graph = crawl(
+            ElinkHandler(), [1], depth=10, direction="references", max_nodes=20
+        )
+        assert len(graph) == 20
+        assert all(t in graph for _, t in graph.edges())
+
+    def test_failed_batches_are_skipped(self):
+        handler = ElinkHandler(fail={2})
+        crawler_graph = crawl(
+            handler, [1], depth=2, direction="references", batch_size=1
+        )
+        assert 4 not in crawler_graph
+        assert crawler_graph.successors(3) == [6, 7]
+
+    def test_malformed_batches_are_skipped(self):
+        crawler = GraphCrawler(direction="references", batch_size=1)
+
+        async def main():
+            transport = httpx.MockTransport(ElinkHandler(truncate={2}))
+            async with async_client(transport=transport) as client:
+                return await crawler.expand([1], 2, client)
+
+        graph = asyncio.run(main())
+        assert crawler.failed == [2]
+        assert 4 not in graph
+        assert graph.successors(3) == [6, 7]
+
+
+class TestSeeds:
+    def test_seed_pmids(self):
+        assert seed_pmids(["PMID: 038697854", 38697854, "4"]) == [38697854, 4]
+        with pytest.raises(FormatError, match="PMC11065001"):
+            seed_pmids(["38697854", "pmc11065001"])
+        with pytest.raises(FormatError, match="line 1: 'nope'"):
+            seed_pmids(["nope"])
+
+    def test_cli_rejects_pmcids(self, monkeypatch, capsys):
+        monkeypatch.setattr(sys, "argv", ["pmb", "graph", "PMC11065001"])
+        with pytest.raises(SystemExit) as e:
+            cli.main()
+        assert e.value.code == 2
+        assert "pmb convert --to pmid" in capsys.readouterr().err
+
+
+class TestAttachLinks:
+    def test_attach_links(self):
+        articles = EutilsParser().parse_efetch(
+            (FIXTURES / "efetch_pubmed.xml").read_bytes()
+        )
+
+        async def main():
+            transport = httpx.MockTransport(ElinkHandler())
+            async with async_client(transport=transport) as client:
+                return await attach_links(articles, "both", client)
+
+        first, _ = asyncio.run(main())
+        pmid = int(first.pmid)
+        assert first.citation.references == [str(p) for p in references(pmid)]
+        assert first.citation.cited_by == [str(pmid // 2)]
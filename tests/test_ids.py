@@ -0,0 +1,238 @@
+import asyncio
+import json
+import sys
+from pathlib import Path
+from urllib.parse import parse_qs
+
+import httpx
+import pytest
+from pytest import raises
+
+from pmbuddy import cli
+from pmbuddy.cache import ArticleCache
+from pmbuddy.cache.ids import (
+    IdentifierMap,
+    Identifiers,
+    identify,
+    identify_all,
+    parse_esummary,
+    parse_idconv,
+)
+from pmbuddy.parsers import EutilsParser
+from pmbuddy.util import NOT_AVAILABLE
+from pmbuddy.util.requests import async_client
+from pmbuddy.util.validation import FormatError
+
+FIXTURES = Path(__file__).parent / "fixtures"
+ARTICLES = EutilsParser().parse_efetch((FIXTURES / "efetch_pubmed.xml").read_bytes())
+
+
+class StubConverters:
+    """The PMC ID Converter and esummary over a few known records.
+
+    `pmc` holds the records in PMC; `pubmed` those only PubMed knows.
+    Every request is logged as (service, ids).
+    """
+
+    def __init__(self, pmc=(), pubmed=()):
+        self.pmc = list(pmc)
+        self.pubmed = list(pubmed)
+        self.requests = []
+
+    def idconv(self, params):
+        ids, idtype = params["ids"][0].split(","), params["idtype"][0]
+        records = []
+        for id in ids:
+            match = [
+                r for r in self.pmc if (getattr(r, idtype) or "").lower() == id.lower()
+            ]
+            if match:
+                records.append(match[0]._asdict())
+            else:
+                records.append(
+                    {"requested-id": id, "status": "error", "errmsg": "not found"}
+                )
+        return {"status": "ok", "records": records}
+
+    def esummary(self, form):
+        uids = form["id"][0].split(",")
+        result = {"uids": uids}
+        for uid in uids:
+            match = [r for r in self.pubmed if r.pmid == uid]
+            if not match:
+                result[uid] = {"uid": uid, "error": "cannot get document summary"}
+                continue
+            ids = [{"idtype": "pubmed", "value": uid}]
+            if match[0].doi:
+                ids.append({"idtype": "doi", "value": match[0].doi})
+            result[uid] = {"uid": uid, "articleids": ids}
+        return {"result": result}
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("esummary.fcgi"):
+            form = parse_qs(request.content.decode())
+            self.requests.append(("esummary", form["id"][0]))
+            return httpx.Response(200, json=self.esummary(form))
+        params = parse_qs(request.url.query.decode())
+        self.requests.append(("idconv", params["ids"][0]))
+        return httpx.Response(200, json=self.idconv(params))
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ArticleCache(tmp_path / "cache.sqlite3")
+    for article in ARTICLES:
+        cache.put(article)
+    return cache
+
+
+def resolve(id_map, stub, identified, **kwargs):
+    async def main():
+        async with async_client(transport=httpx.MockTransport(stub)) as client:
+            return await id_map.resolve_async(identified, client, **kwargs)
+
+    return asyncio.run(main())
+
+
+class TestIdentify:
+    def test_kinds(self):
+        assert identify("PMID: 038697854") == ("pmid", "38697854")
+        assert identify("pmc11065001") == ("pmcid", "PMC11065001")
+        assert identify("https://doi.org/10.1038/X") == ("doi", "10.1038/X")
+        with raises(FormatError):
+            identify("https://pubmed.ncbi.nlm.nih.gov/38697854/")
+
+    def test_identify_all_keeps_duplicates(self):
+        lines = ["38697854\n", "\n", "doi:10.1000/x", "38697854"]
+        assert identify_all(lines) == [
+            ("pmid", "38697854"),
+            ("doi", "10.1000/x"),
+            ("pmid", "38697854"),
+        ]
+        with raises(FormatError, match="line 2: 'nope'"):
+            identify_all(["1", "nope"])
+
+    def test_parse_responses(self):
+        idconv = {
+            "records": [
+                {"pmcid": "PMC1", "pmid": 23193287, "doi": "10.1/a"},
+                {"requested-id": "PMC2", "status": "error", "errmsg": "invalid"},
+            ]
+        }
+        assert parse_idconv(json.dumps(idconv).encode()) == [
+            Identifiers("23193287", "PMC1", "10.1/a")
+        ]
+        esummary = {
+            "result": {
+                "uids": ["1", "2"],
+                "1": {"articleids": [{"idtype": "doi", "value": "10.1/b"}]},
+                "2": {"error": "cannot get document summary"},
+            }
+        }
+        assert parse_esummary(json.dumps(esummary).encode()) == [
+            Identifiers("1", None, "10.1/b")
+        ]
+
+
+class TestIdentifierMap:
+    def test_filled_from_cached_articles(self, cache):
+        id_map = IdentifierMap(cache)
+        assert len(id_map) == 2
+        assert id_map.lookup("doi", ["10.1038/S41586-024-07711-8"]) == {
+            "10.1038/S41586-024-07711-8": Identifiers(
+                "39096902", "PMC11302117", "10.1038/s41586-024-07711-8"
+            )
+        }
+        # Articles cached later are added by the trigger and outlive eviction.
+        cache.put(ARTICLES[0].model_copy(update={"pmid": "1", "pmcid": None}))
+        cache.clear()
+        assert id_map.lookup("pmid", ["1"])["1"].doi == "10.1038/s41467-024-47998-1"
+
+    def test_placeholders_are_not_identifiers(self, cache):
+        id_map = IdentifierMap(cache)
+        outside_pmc = {"pmcid": NOT_AVAILABLE}
+        # A copy without a PMCID does not erase the one already known.
+        cache.put(ARTICLES[0].model_copy(update=outside_pmc))
+        cache.put(ARTICLES[0].model_copy(update={"pmid": "1", **outside_pmc}))
+        found = id_map.lookup("pmid", ["38697854", "1"])
+        assert found["38697854"].pmcid == "PMC11065001"
+        assert found["1"] == Identifiers("1", None, "10.1038/s41467-024-47998-1")
+        assert id_map.lookup("pmcid", [NOT_AVAILABLE]) == {}
+
+        id_map.add([Identifiers("2", NOT_AVAILABLE, NOT_AVAILABLE)])
+        assert id_map.lookup("pmid", ["2"])["2"] == Identifiers("2")
+
+    def test_resolves_misses_over_the_network(self, cache):
+        stub = StubConverters(
+            pmc=[Identifiers("111", "PMC1111111", "10.1/pmc")],
+            pubmed=[Identifiers("222", None, "10.1/pubmed-only")],
+        )
+        id_map = IdentifierMap(cache)
+        identified = [
+            ("pmcid", "PMC11065001"),
+            ("pmcid", "PMC1111111"),
+            ("pmid", "222"),
+            ("doi", "10.1/missing"),
+            ("pmid", "38697854"),
+        ]
+        resolved = resolve(id_map, stub, identified)
+        assert resolved[("pmcid", "PMC11065001")].pmid == "38697854"
+        assert resolved[("pmcid", "PMC1111111")].pmid == "111"
+        assert resolved[("pmid", "222")].doi == "10.1/pubmed-only"
+        assert ("doi", "10.1/missing") not in resolved
+        stats = id_map.stats
+        assert (stats.local, stats.fetched, stats.unknown) == (2, 2, 1)
+        # One request per ID type, then esummary for the PMID outside PMC.
+        assert sorted(stub.requests) == [
+            ("esummary", "222"),
+            ("idconv", "10.1/missing"),
+            ("idconv", "222"),
+            ("idconv", "PMC1111111"),
+        ]
+
+        # Everything is local now, and the unknown DOI is not asked for again.
+        stub.requests.clear()
+        resolved = resolve(id_map, stub, identified)
+        assert stub.requests == []
+        assert len(resolved) == 4
+
+    def test_offline(self, cache):
+        stub = StubConverters()
+        resolved = resolve(IdentifierMap(cache), stub, [("pmid", "5")], offline=True)
+        assert resolved == {}
+        assert stub.requests == []
+
+
+class TestConvertCommand:
+    def test_convert_to_pmcid(self, cache, monkeypatch, capsys):
+        monkeypatch.setitem(cli.CONFIG["cache"], "path", str(cache.path))
+        argv = [
+            "pmb",
+            "convert",
+            "--to",
+            "pmcid",
+            "--offline",
+            "38697854",
+            "doi:10.1038/S41586-024-07711-8",
+            "99",
+        ]
+        monkeypatch.setattr(sys, "argv", argv)
+        with raises(SystemExit) as e:
+            cli.main()
+        # 99 is unknown offline.
+        assert e.value.code == 1
+        assert capsys.readouterr().out == "PMC11065001\nPMC11302117\n\n"
+
+    def test_convert_rows(self, cache, monkeypatch, capsys):
+        monkeypatch.setitem(cli.CONFIG["cache"], "path", str(cache.path))
+        monkeypatch.setattr(sys.stdin, "isatty", lambda: True)
+        monkeypatch.setattr(
+            sys, "argv", ["pmb", "--pmid", "PMC11302117", "convert", "--format", "csv"]
+        )
+        with raises(SystemExit) as e:
+            cli.main()
+        assert e.value.code == 0
+        assert capsys.readouterr().out.splitlines() == [
+            "input,pmid,pmcid,doi",
+            "PMC11302117,39096902,PMC11302117,10.1038/s41586-024-07711-8",
+        ]
@@ -0,0 +1,145 @@
+import gzip
+import json
+from pathlib import Path
+
+import httpx
+
+from pmbuddy.jobs import BatchJob, Journal, error_category
+from pmbuddy.parsers import EutilsParser
+from pmbuddy.util.validation import FormatError
+
+FIXTURES = Path(__file__).parent / "fixtures"
+ARTICLES = {
+    a.pmid: a
+    for a in EutilsParser().parse_efetch((FIXTURES / "efetch_pubmed.xml").read_bytes())
+}
+
+
+class FlakyParser:
+    """Fails the listed PMIDs once with a 503, then succeeds.
+
+    `broken` PMIDs always fail with AttributeError, `malformed` ones with
+    the given exception.
+    """
+
+    def __init__(self, flaky=(), broken=(), malformed=None):
+        self.flaky = set(flaky)
+        self.broken = set(broken)
+        self.malformed = malformed or {}
+        self.calls = []
+
+    async def fetch_article_async(self, pmid, client):
+        self.calls.append(pmid)
+        if pmid in self.broken:
+            raise AttributeError("no article node")
+        if pmid in self.malformed:
+            raise self.malformed[pmid]
+        if pmid in self.flaky:
+            self.flaky.remove(pmid)
+            request = httpx.Request("GET", "https://pubmed")
+            response = httpx.Response(503, request=request)
+            raise httpx.HTTPStatusError("503", request=request, response=response)
+        return ARTICLES[pmid]
+
+
+def read_output(path):
+    return [json.loads(line)["pmid"] for line in path.read_text().splitlines()]
+
+
+class TestBatchJob:
+    pmids = ["38697854", "39096902"]
+
+    def test_resume_retries_only_failures(self, tmp_path):
+        output = tmp_path / "articles.jsonl"
+        parser = FlakyParser(flaky=["39096902"])
+        summary = BatchJob(output).run(parser, self.pmids)
+        assert (summary.done, summary.failed) == (1, 1)
+        assert read_output(output) == ["38697854"]
+
+        parser.calls.clear()
+        summary = BatchJob(output, resume=True).run(parser, self.pmids)
+        assert parser.calls == ["39096902"]
+        assert (summary.done, summary.skipped) == (1, 1)
+        assert sorted(read_output(output)) == sorted(self.pmids)
+
+    def test_retries_are_capped(self, tmp_path):
+        output = tmp_path / "articles.jsonl"
+        parser = FlakyParser(broken=["39096902"])
+        for _ in range(3):
+            BatchJob(output, resume=True, max_attempts=2).run(parser, self.pmids)
+        assert parser.calls.count("39096902") == 2
+        entries = Journal(tmp_path / "articles.jsonl.journal").load()
+        assert entries["39096902"].attempts == 2
+        assert entries["39096902"].error == "parse"
+
+    def test_unexpected_errors_fail_one_pmid(self, tmp_path):
+        output = tmp_path / "articles.jsonl"
+        parser = FlakyParser(
+            malformed={
+                "39096902": IndexError("list index out of range"),
+                "11111111": ValueError("invalid year"),
+            }
+        )
+        summary = BatchJob(output).run(parser, self.pmids + ["11111111"])
+        assert (summary.done, summary.failed) == (1, 2)
+        assert read_output(output) == ["38697854"]
+        entries = Journal(tmp_path / "articles.jsonl.journal").load()
+        assert entries["39096902"].error == "parse"
+        assert entries["11111111"].error == "parse"
+
+    def test_csv_header_not_repeated_on_resume(self, tmp_path):
+        output = tmp_path / "articles.csv"
+        parser = FlakyParser(flaky=["39096902"])
+        BatchJob(output, "csv").run(parser, self.pmids)
+        BatchJob(output, "csv", resume=True).run(parser, self.pmids)
+        assert output.read_text().count("pmid,pmcid") == 1
+
+    def test_gzip_output_resumes(self, tmp_path):
+        output = tmp_path / "articles.ris.gz"
+        parser = FlakyParser(flaky=["39096902"])
+        BatchJob(output, "ris").run(parser, self.pmids)
+        BatchJob(output, "ris", resume=True).run(parser, self.pmids)
+        with gzip.open(output, "rt") as handle:
+            assert handle.read().count("TY  - JOUR") == 2
+
+    def test_run_batched(self, tmp_path):
+        class BatchParser:
+            def fetch_from_ids(self, ids):
+                return [ARTICLES[id] for id in ids if id in ARTICLES]
+
+        output = tmp_path / "articles.jsonl"
+        pmids = self.pmids + ["11111111"]
+        summary = BatchJob(output).run_batched(BatchParser(), pmids, batch_size=2)
+        assert (summary.done, summary.failed) == (2, 1)
+        entries = Journal(tmp_path / "articles.jsonl.journal").load()
+        assert entries["11111111"].error == "not_found"
+
+    def test_run_batched_survives_a_malformed_batch(self, tmp_path):
+        class BatchParser:
+            def fetch_from_ids(self, ids):
+                if "39096902" in ids:
+                    raise IndexError("list index out of range")
+                return [ARTICLES[id] for id in ids]
+
+        output = tmp_path / "articles.jsonl"
+        summary = BatchJob(output).run_batched(BatchParser(), self.pmids, batch_size=1)
+        assert (summary.done, summary.failed) == (1, 1)
+        entries = Journal(tmp_path / "articles.jsonl.journal").load()
+        assert entries["39096902"].error == "parse"
+
+
+class TestErrorCategory:
+    def test_categories(self):
+        request = httpx.Request("GET", "https://pubmed")
+
+        def status(code):
+            response = httpx.Response(code, request=request)
+            return httpx.HTTPStatusError(str(code), request=request, response=response)
+
+        assert error_category(status(429)) == "rate_limited"
+        assert error_category(status(404)) == "http_4xx"
+        assert error_category(httpx.ConnectTimeout("slow")) == "timeout"
+        assert error_category(httpx.ConnectError("refused")) == "network"
+        assert error_category(FormatError("bad")) == "invalid_id"
+        assert error_category(IndexError("list index out of range")) == "parse"
+        assert error_category(LookupError("missing")) == "not_found"
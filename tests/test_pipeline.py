@@ -0,0 +1,63 @@
+import asyncio
+from pathlib import Path
+
+import httpx
+
+from pmbuddy.parsers import PubmedParser
+from pmbuddy.pipeline import PipelineParser, parse_chunk
+from pmbuddy.util.requests import async_client
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def fixture_page(request: httpx.Request) -> httpx.Response:
+    id = request.url.path.strip("/").split("/")[-1]
+    prefix = "pmc" if id.startswith("PMC") else "pubmed"
+    path = FIXTURES / f"{prefix}_{id}.html"
+    if not path.exists():
+        return httpx.Response(404)
+    return httpx.Response(200, content=path.read_bytes())
+
+
+class TestPipeline:
+    def test_parse_chunk_serializes_articles(self):
+        content = (FIXTURES / "pubmed_38697854.html").read_bytes()
+        articles = parse_chunk("html.parser", [("38697854", content), ("1", b"")])
+        assert len(articles) == 2
+        assert articles[0] == PubmedParser().parse_overview(content).model_dump()
+        assert articles[1] is None
+
+    def test_parse_chunk_skips_malformed_pages(self):
+        content = (FIXTURES / "pubmed_38697854.html").read_bytes()
+        # A citation with a year but no month fails to parse.
+        year_only = content.replace(b"2024 May 2;15(1):3707.", b"2024;15:1")
+        assert year_only != content
+        articles = parse_chunk("html.parser", [("1", year_only), ("38697854", content)])
+        assert articles[0] is None
+        assert articles[1]["pmid"] == "38697854"
+
+    def test_parse_pages_matches_sequential(self):
+        pages = [
+            (path.stem.split("_")[1], path.read_bytes())
+            for path in sorted(FIXTURES.glob("*.html"))
+        ] * 3
+        articles = PipelineParser(workers=2, chunk_size=2).parse_pages(pages)
+        parser = PubmedParser()
+        expected = [
+            parser.parse_page(c) if id.startswith("PMC") else parser.parse_overview(c)
+            for id, c in pages
+        ]
+        assert articles == expected
+
+    def test_fetch_from_ids(self):
+        ids = ["38697854", "PMC11065001", "39096902"]
+
+        async def main():
+            transport = httpx.MockTransport(fixture_page)
+            async with async_client(transport=transport) as client:
+                pipeline = PipelineParser(workers=2, chunk_size=2)
+                return await pipeline.fetch_from_ids_async(ids, client)
+
+        articles = asyncio.run(main())
+        assert [a.pmid for a in articles] == ["38697854", "38697854", "39096902"]
+        assert articles[1].pmcid == "PMC11065001"
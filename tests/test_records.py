@@ -0,0 +1,80 @@
+from pathlib import Path
+
+import pytest
+from pytest import raises
+
+from pmbuddy.cache import ArticleCache
+from pmbuddy.cli import to_dataframe
+from pmbuddy.models.records import FIELDS, ArticleBatch, ArticleRecord
+from pmbuddy.parsers import EutilsParser
+
+FIXTURES = Path(__file__).parent / "fixtures"
+ARTICLES = EutilsParser().parse_efetch((FIXTURES / "efetch_pubmed.xml").read_bytes())
+
+
+class TestArticleRecord:
+    def test_matches_flat_json(self):
+        for article in ARTICLES:
+            record = ArticleRecord.from_model(article)
+            flat = article.json()
+            assert record._asdict() == {name: flat[name] for name in FIELDS}
+
+    def test_from_dump_matches_from_model(self):
+        import json
+
+        for article in ARTICLES:
+            dump = json.loads(article.model_dump_json())
+            assert ArticleRecord.from_dump(dump) == ArticleRecord.from_model(article)
+
+    def test_to_model_validates(self):
+        record = ArticleRecord.from_model(ARTICLES[0])
+        article = record.to_model()
+        assert article.json() == ARTICLES[0].json()
+        with raises(ValueError):
+            record._replace(pub_year="unknown").to_model()
+
+
+class TestArticleBatch:
+    def test_columns_and_rows(self):
+        batch = ArticleBatch.from_models(ARTICLES)
+        assert len(batch) == len(ARTICLES)
+        assert batch.columns["pmid"] == [a.pmid for a in ARTICLES]
+        assert batch[1] == ArticleRecord.from_model(ARTICLES[1])
+        assert list(batch.rows()) == [a.json() for a in ARTICLES]
+
+    def test_append(self):
+        batch = ArticleBatch()
+        for record in ArticleBatch.from_models(ARTICLES):
+            batch.append(record)
+        assert batch == ArticleBatch.from_models(ARTICLES)
+        assert len(ArticleBatch.from_records([])) == 0
+
+    def test_dataframe_matches_models(self):
+        df = ArticleBatch.from_models(ARTICLES).to_dataframe()
+        assert df.to_dict("records") == to_dataframe(ARTICLES).to_dict("records")
+        assert list(df.columns) == list(ARTICLES[0].json())
+
+    def test_json_roundtrip(self):
+        batch = ArticleBatch.from_models(ARTICLES)
+        assert ArticleBatch.loads(batch.dumps()) == batch
+        with raises(ValueError):
+            batch.dumps("pickle")
+        with raises(ValueError):
+            ArticleBatch.loads(b'{"fields": ["pmid"], "columns": {}}')
+
+    def test_msgpack_roundtrip(self):
+        pytest.importorskip("msgpack")
+        batch = ArticleBatch.from_models(ARTICLES)
+        assert ArticleBatch.loads(batch.dumps("msgpack"), "msgpack") == batch
+
+
+class TestCacheRecords:
+    def test_bulk_load(self, tmp_path):
+        cache = ArticleCache(tmp_path / "cache.sqlite3")
+        for article in ARTICLES:
+            cache.put(article)
+        assert cache.records() == ArticleBatch.from_models(ARTICLES)
+        pmids = [ARTICLES[1].pmid, "11111111", ARTICLES[0].pmid]
+        batch = cache.records(pmids)
+        assert batch.columns["pmid"] == [ARTICLES[1].pmid, ARTICLES[0].pmid]
+        assert cache.stats.hits == cache.stats.misses == 0
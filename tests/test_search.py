@@ -0,0 +1,104 @@
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+from pmbuddy import cli
+from pmbuddy.cache import ArticleCache
+from pmbuddy.cache.search import SearchIndex, tokenize
+from pmbuddy.parsers import EutilsParser
+
+FIXTURES = Path(__file__).parent / "fixtures"
+ARTICLES = EutilsParser().parse_efetch((FIXTURES / "efetch_pubmed.xml").read_bytes())
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ArticleCache(tmp_path / "cache.sqlite3")
+    for article in ARTICLES:
+        cache.put(article)
+    return cache
+
+
+class TestTokenize:
+    def test_lowercases_and_drops_stopwords(self):
+        assert tokenize("Single-cell atlas of the Zebrafish retina") == [
+            "single",
+            "cell",
+            "atlas",
+            "zebrafish",
+            "retina",
+        ]
+
+    def test_empty(self):
+        assert tokenize(None) == []
+
+
+class TestSearchIndex:
+    def test_sync_is_incremental(self, cache):
+        index = SearchIndex(cache)
+        assert index.sync() == len(ARTICLES)
+        assert index.sync() == 0
+        assert len(index) == len(ARTICLES)
+
+    def test_ranks_matching_article_first(self, cache):
+        index = SearchIndex(cache)
+        index.sync()
+        hits = index.search("zebrafish retina")
+        assert [pmid for pmid, _ in hits] == ["38697854"]
+        assert index.search("mangrove microbiomes")[0][0] == "39096902"
+
+    def test_unknown_terms(self, cache):
+        index = SearchIndex(cache)
+        index.sync()
+        assert index.search("xylophone") == []
+        assert index.search("the of") == []
+
+    def test_reindexes_refetched_articles(self, cache):
+        index = SearchIndex(cache)
+        index.sync()
+        changed = ARTICLES[0].model_copy(update={"title": "Xylophone retina"})
+        cache.put(changed)
+        assert index.sync() == 1
+        assert index.search("xylophone")[0][0] == changed.pmid
+
+    def test_evicted_articles_leave_the_index(self, cache):
+        index = SearchIndex(cache)
+        index.sync()
+        cache.clear()
+        assert len(index) == 0
+        assert index.search("zebrafish") == []
+
+
+class TestSearchCommand:
+    def test_search_writes_jsonl(self, cache, monkeypatch, capsys):
+        monkeypatch.setitem(cli.CONFIG["cache"], "path", str(cache.path))
+        monkeypatch.setattr(
+            sys, "argv", ["pmb", "search", "mangrove", "--format", "jsonl"]
+        )
+        with pytest.raises(SystemExit) as exit:
+            cli.main()
+        assert exit.value.code == 0
+        rows = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        assert [row["pmid"] for row in rows] == ["39096902"]
+        # Rows come straight from the cache, in the same form as fetched articles.
+        assert rows[0] == json.loads(json.dumps(ARTICLES[1].json()))
+
+    def test_search_exports_bibtex(self, cache, monkeypatch, capsys):
+        monkeypatch.setitem(cli.CONFIG["cache"], "path", str(cache.path))
+        monkeypatch.setattr(
+            sys, "argv", ["pmb", "search", "mangrove", "--format", "bibtex"]
+        )
+        with pytest.raises(SystemExit) as exit:
+            cli.main()
+        assert exit.value.code == 0
+        assert capsys.readouterr().out.startswith("@article{pmid39096902,")
+
+    def test_search_displays_table(self, cache, monkeypatch, capsys):
+        monkeypatch.setitem(cli.CONFIG["cache"], "path", str(cache.path))
+        monkeypatch.setattr(sys, "argv", ["pmb", "search", "zebrafish"])
+        with pytest.raises(SystemExit) as exit:
+            cli.main()
+        assert exit.value.code == 0
+        assert "38697854" in capsys.readouterr().out
@@ -0,0 +1,184 @@
+import asyncio
+import json
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import httpx
+import pytest
+from pytest import raises
+
+from pmbuddy import cli
+from pmbuddy.cache import ArticleCache, CachedParser
+from pmbuddy.client import DaemonClient, DaemonError
+from pmbuddy.config import CONFIG
+from pmbuddy.parsers import ArticleParser
+from pmbuddy.server import ArticleServer, ArticleService
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+class StubPubmed:
+    """Serves fixture pages for PubMed URLs and 404 for anything else."""
+
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay = delay
+        self.requests = []
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        pmid = request.url.path.strip("/").split("/")[-1]
+        self.requests.append(pmid)
+        await asyncio.sleep(self.delay)
+        page = FIXTURES / f"pubmed_{pmid}.html"
+        if not page.is_file():
+            return httpx.Response(404, request=request)
+        return httpx.Response(200, content=page.read_bytes(), request=request)
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    """Yield (stub, client) for a daemon running on an ephemeral port."""
+
+    def start(delay: float = 0.0, parser=ArticleParser):
+        stub = StubPubmed(delay)
+        cache = ArticleCache(tmp_path / "cache.sqlite3")
+        service = ArticleService(
+            CachedParser(parser, cache),
+            cache,
+            transport=httpx.MockTransport(stub),
+        ).start()
+        server = ArticleServer(("127.0.0.1", 0), service)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        started.append((server, service))
+        host, port = server.server_address[:2]
+        return stub, DaemonClient(host, port)
+
+    started = []
+    yield start
+    for server, service in started:
+        server.shutdown()
+        server.server_close()
+        service.close()
+
+
+class TestArticleServer:
+    def test_get_article(self, daemon):
+        stub, client = daemon()
+        article = client.article("38697854")
+        assert article.pmid == "38697854"
+        assert article.pmcid == "PMC11065001"
+        # The second lookup is answered by the warm cache.
+        assert client.article("PMID: 38697854") == article
+        assert stub.requests == ["38697854"]
+        assert client.health()["cache"]["hits"] == 1
+
+    def test_get_errors(self, daemon):
+        stub, client = daemon()
+        with raises(DaemonError) as e:
+            client.article("3891GH12")
+        assert e.value.status == 400
+        assert e.value.category == "invalid_id"
+        with raises(DaemonError) as e:
+            client.article("11111111")
+        assert e.value.status == 404
+        assert e.value.category == "http_4xx"
+        assert client._request("GET", "/nothing")[0] == 404
+
+    def test_post_articles(self, daemon):
+        stub, client = daemon()
+        articles, errors = client.articles(
+            ["39096902", "38697854", "039096902", "11111111"]
+        )
+        assert [a.pmid for a in articles] == ["39096902", "38697854"]
+        assert list(errors) == ["11111111"]
+        assert errors["11111111"]["category"] == "http_4xx"
+        assert sorted(stub.requests) == ["11111111", "38697854", "39096902"]
+
+    def test_post_reports_unexpected_errors(self, daemon):
+        class MalformedParser:
+            async def fetch_article_async(self, pmid, client, **kwargs):
+                if pmid == "39096902":
+                    raise IndexError("list index out of range")
+                return await ArticleParser.fetch_article_async(pmid, client, **kwargs)
+
+        stub, client = daemon(parser=MalformedParser())
+        articles, errors = client.articles(["39096902", "38697854"])
+        assert [a.pmid for a in articles] == ["38697854"]
+        assert errors["39096902"]["category"] == "parse"
+        with raises(DaemonError) as e:
+            client.article("39096902")
+        assert e.value.status == 502
+
+    def test_post_rejects_malformed_ids(self, daemon):
+        stub, client = daemon()
+        with raises(DaemonError) as e:
+            client.articles(["38697854", "abc"])
+        assert e.value.status == 400
+        assert "line 2: 'abc'" in str(e.value)
+        assert stub.requests == []
+
+    def test_concurrent_requests_share_one_fetch(self, daemon):
+        stub, client = daemon(delay=0.2)
+        host, port = client.host, client.port
+
+        def lookup(_):
+            return DaemonClient(host, port).article("38697854").pmid
+
+        with ThreadPoolExecutor(5) as pool:
+            assert list(pool.map(lookup, range(5))) == ["38697854"] * 5
+        assert stub.requests == ["38697854"]
+        assert client.health()["coalesced"] >= 1
+
+
+class TestDaemonClient:
+    def test_not_running(self):
+        # Port 9 (discard) is not expected to have an HTTP server listening.
+        assert not DaemonClient("127.0.0.1", 9).running()
+
+    def test_cli_fetches_through_running_daemon(self, daemon, monkeypatch, capsys):
+        stub, client = daemon()
+
+        def in_process(args):
+            raise AssertionError("fetched in-process instead of through the daemon")
+
+        monkeypatch.setattr(cli, "build_article_parser", in_process)
+        monkeypatch.setitem(CONFIG, "server", {**CONFIG["server"], "port": client.port})
+        argv = ["pmb", "--format", "jsonl", "--pmid", "38697854,39096902"]
+        monkeypatch.setattr(sys, "argv", argv)
+        monkeypatch.setattr(sys.stdin, "isatty", lambda: True)
+        with raises(SystemExit) as e:
+            cli.main()
+        assert e.value.code == 0
+        records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        assert [r["pmid"] for r in records] == ["38697854", "39096902"]
+        assert sorted(stub.requests) == ["38697854", "39096902"]
+
+    def test_cli_reports_daemon_errors(self, daemon, monkeypatch, capsys, tmp_path):
+        stub, client = daemon()
+        monkeypatch.setitem(CONFIG, "server", {**CONFIG["server"], "port": client.port})
+        monkeypatch.setattr(sys.stdin, "isatty", lambda: True)
+        output = tmp_path / "articles.jsonl"
+        for argv in (
+            ["pmb", "--format", "jsonl", "--pmid", "38697854,11111111"],
+            ["pmb", "--output", str(output), "--pmid", "38697854,11111111"],
+        ):
+            monkeypatch.setattr(sys, "argv", argv)
+            with raises(SystemExit):
+                cli.main()
+            assert "Failed to fetch 11111111 (http_4xx" in capsys.readouterr().err
+        journal = [
+            json.loads(line)
+            for line in Path(f"{output}.journal").read_text().splitlines()
+        ]
+        assert {"pmid": "11111111", "status": "failed"}.items() <= journal[-1].items()
+        assert journal[-1]["error"] == "http_4xx"
+
+    def test_cli_skips_daemon_with_no_daemon(self, daemon, monkeypatch):
+        stub, client = daemon()
+        monkeypatch.setitem(CONFIG, "server", {**CONFIG["server"], "port": client.port})
+        args = cli.parser.parse_args(["--no-daemon", "--pmid", "38697854"])
+        assert cli.connect_daemon(args) is None
+        args = cli.parser.parse_args(["--pmid", "38697854"])
+        assert cli.connect_daemon(args).port == client.port
@@ -0,0 +1,237 @@
+import asyncio
+import gzip
+import json
+import sys
+import threading
+from collections import Counter
+from pathlib import Path
+
+import httpx
+import pytest
+from pytest import raises
+
+from pmbuddy import cli
+from pmbuddy.parsers import EutilsParser
+from pmbuddy.shards import ShardQueue, WorkerSummary
+from pmbuddy.util import ratelimit, requests
+
+FIXTURES = Path(__file__).parent / "fixtures"
+ARTICLES = EutilsParser().parse_efetch((FIXTURES / "efetch_pubmed.xml").read_bytes())
+PMIDS = [str(10_000_000 + i) for i in range(23)]
+
+
+class FakeParser:
+    """Serves a copy of a fixture article for any PMID and counts the fetches.
+
+    PMIDs in `missing` fail with a 404, those in `malformed` with an IndexError.
+    """
+
+    def __init__(self, missing=(), malformed=()):
+        self.fetched = Counter()
+        self.missing = set(missing)
+        self.malformed = set(malformed)
+        self.lock = threading.Lock()
+
+    async def fetch_article_async(self, pmid, client):
+        with self.lock:
+            self.fetched[pmid] += 1
+        await asyncio.sleep(0)
+        if pmid in self.malformed:
+            raise IndexError("list index out of range")
+        if pmid in self.missing:
+            request = httpx.Request("GET", f"https://example.org/{pmid}")
+            raise httpx.HTTPStatusError(
+                "not found", request=request, response=httpx.Response(404)
+            )
+        return ARTICLES[0].model_copy(update={"pmid": pmid})
+
+
+@pytest.fixture
+def queue(tmp_path):
+    queue = ShardQueue.create(tmp_path / "run.queue", PMIDS, shard_size=5)
+    yield queue
+    queue.close()
+
+
+def merged_pmids(path):
+    return [json.loads(line)["pmid"] for line in path.read_text().splitlines()]
+
+
+class TestLeases:
+    def test_create(self, queue, tmp_path):
+        status = queue.status()
+        assert (status.shards, status.pending, status.pmids) == (5, 5, 23)
+        with raises(FileExistsError):
+            ShardQueue.create(tmp_path / "run.queue", PMIDS)
+        with raises(ValueError):
+            ShardQueue.create(tmp_path / "other.queue", PMIDS, format="csl-json")
+
+    def test_claims_are_exclusive_until_expired(self, queue):
+        first = queue.claim("a", now=0)
+        second = queue.claim("b", now=0)
+        assert (first.shard, second.shard) == (1, 2)
+        assert first.pmids == PMIDS[:5]
+
+        # Once its lease expires, shard 1 is re-issued before pending shards.
+        later = queue.lease_seconds + 1
+        assert queue.renew(second, now=1)
+        again = queue.claim("c", now=later)
+        assert again.shard == 1
+        assert queue.status(now=later).leased == 2
+
+        # The first worker lost its lease and cannot complete the shard.
+        queue.part_path(first).write_text("stale\n")
+        assert not queue.renew(first)
+        assert not queue.complete(first, 5, [])
+        assert not queue.part_path(first).exists()
+
+        queue.part_path(again).write_text("")
+        assert queue.complete(again, 5, [])
+        assert queue.shard_path(1).exists()
+
+    def test_abandoned_after_max_attempts(self, tmp_path):
+        queue = ShardQueue.create(
+            tmp_path / "run.queue", PMIDS[:3], shard_size=5, max_attempts=2
+        )
+        expired = queue.lease_seconds + 1
+        assert queue.claim("a", now=0) is not None
+        assert queue.claim("b", now=expired) is not None
+        assert queue.claim("c", now=2 * expired) is None
+        assert queue.status(now=2 * expired).abandoned == 1
+
+    def test_workers_share_the_rate(self, tmp_path):
+        queue = ShardQueue.create(tmp_path / "run.queue", PMIDS, 5, rate=6.0)
+        assert ShardQueue(queue.path).rate == 6.0
+        assert queue.worker_rate(now=0) == 6.0
+        queue.claim("a", now=0)
+        queue.claim("b", now=0)
+        assert queue.worker_rate(now=0) == 3.0
+        # Expired leases no longer count as workers.
+        assert queue.worker_rate(now=queue.lease_seconds + 1) == 6.0
+
+        # Claimed just now, so both are live.
+        queue.claim("c")
+        lease = queue.claim("d")
+        queue.share_rate()
+        assert ratelimit.get_limiter().max_rate == 3.0
+        queue.release(lease)
+        queue.share_rate()
+        assert ratelimit.get_limiter().max_rate == 6.0
+
+    def test_release(self, queue):
+        lease = queue.claim("a")
+        queue.release(lease)
+        assert queue.status().pending == 5
+        assert queue.claim("b").shard == lease.shard
+
+
+class TestWorkers:
+    def test_workers_share_the_queue(self, queue, tmp_path):
+        parser = FakeParser(missing={PMIDS[7]})
+        summaries = []
+
+        def work(name):
+            # SQLite connections belong to the thread that opened them.
+            own = ShardQueue(queue.path)
+            summaries.append(own.work(parser, name))
+            own.close()
+
+        threads = [threading.Thread(target=work, args=(n,)) for n in "abc"]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert set(parser.fetched) == set(PMIDS)
+        assert max(parser.fetched.values()) == 1
+        assert sum(s.shards for s in summaries) == 5
+        status = queue.status()
+        assert (status.done, status.written, status.failed) == (5, 22, 1)
+        assert queue.failed_pmids() == [PMIDS[7]]
+
+        assert queue.merge(tmp_path / "merged.jsonl") == 5
+        expected = [pmid for pmid in PMIDS if pmid != PMIDS[7]]
+        assert sorted(merged_pmids(tmp_path / "merged.jsonl")) == expected
+
+    def test_lost_lease_discards_the_shard(self, queue):
+        lease = queue.claim("a", now=0)
+        # Another worker takes the shard over after the lease expired.
+        queue.claim("b", now=queue.lease_seconds + 1)
+        summary = WorkerSummary(worker="a")
+
+        async def main():
+            await queue.run_shard(lease, FakeParser(), None, summary)
+
+        asyncio.run(main())
+        assert (summary.lost, summary.done) == (1, 0)
+        assert not queue.shard_path(lease.shard).exists()
+        assert list(queue.shard_dir.iterdir()) == []
+
+    def test_unexpected_errors_fail_one_pmid(self, queue):
+        summary = queue.work(FakeParser(malformed={PMIDS[2]}), max_shards=1)
+        assert (summary.done, summary.failed) == (4, 1)
+        assert queue.failed_pmids() == [PMIDS[2]]
+
+    def test_failing_shard_is_abandoned(self, tmp_path, monkeypatch):
+        queue = ShardQueue.create(
+            tmp_path / "run.queue", PMIDS[:3], shard_size=5, max_attempts=2
+        )
+
+        # The part file cannot be written, so every run of the shard fails.
+        unwritable = tmp_path / "missing" / "shard.part"
+        monkeypatch.setattr(queue, "part_path", lambda lease: unwritable)
+        for _ in range(2):
+            with raises(OSError):
+                queue.work(FakeParser())
+        # Failed runs count as attempts, unlike an interrupted worker.
+        assert queue.claim("a") is None
+        assert queue.status().abandoned == 1
+
+
+class TestMerge:
+    def test_refuses_unfinished_shards(self, queue, tmp_path):
+        lease = queue.claim("a")
+        queue.part_path(lease).write_text("")
+        queue.complete(lease, 0, [])
+        with raises(ValueError):
+            queue.merge(tmp_path / "merged.jsonl")
+        assert queue.merge(tmp_path / "merged.jsonl", partial=True) == 1
+
+    def test_csv_keeps_one_header(self, tmp_path):
+        queue = ShardQueue.create(
+            tmp_path / "run.queue", PMIDS[:4], shard_size=2, format="csv"
+        )
+        queue.work(FakeParser())
+        queue.merge(tmp_path / "merged.csv.gz")
+        lines = gzip.open(tmp_path / "merged.csv.gz", "rt").read().splitlines()
+        assert lines[0].startswith("pmid,")
+        assert len(lines) == 5
+
+
+class TestQueueCommands:
+    def test_create_work_merge(self, tmp_path, monkeypatch, capsys):
+        async def fake_content(url, client, revalidate=False):
+            pmid = url.rstrip("/").split("/")[-1]
+            return (FIXTURES / f"pubmed_{pmid}.html").read_bytes()
+
+        monkeypatch.setattr(requests, "content_from_url_async", fake_content)
+        monkeypatch.setattr(sys.stdin, "isatty", lambda: True)
+        path = str(tmp_path / "run.queue")
+        merged = tmp_path / "merged.jsonl"
+        for argv in (
+            ["pmb", "--pmid", "38697854,39096902", "queue", "create", path],
+            ["pmb", "--no-cache", "worker", path, "--id", "w1"],
+            ["pmb", "queue", "status", path, "--failed"],
+            ["pmb", "queue", "merge", path, str(merged)],
+        ):
+            monkeypatch.setattr(sys, "argv", argv)
+            with raises(SystemExit) as e:
+                cli.main()
+            assert e.value.code == 0
+        assert "1/1 shards done" in capsys.readouterr().err
+        assert sorted(merged_pmids(merged)) == ["38697854", "39096902"]
+
+        monkeypatch.setattr(sys, "argv", ["pmb", "worker", str(tmp_path / "none")])
+        with raises(SystemExit) as e:
+            cli.main()
+        assert e.value.code == 2
@@ -0,0 +1,47 @@
+import subprocess
+import sys
+
+import pytest
+
+# Modules that must stay off the `pmb` startup path.
+HEAVY = ["pandas", "rich", "httpx", "pydantic", "bs4", "lxml", "pyarrow", "asyncio"]
+
+
+def imported_modules(module):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return {
+        line.rsplit("|", 1)[1].strip()
+        for line in result.stderr.splitlines()
+        if line.startswith("import time:") and "[us]" not in line
+    }
+
+
+class TestStartup:
+    @pytest.mark.parametrize("heavy", HEAVY)
+    def test_cli_does_not_import(self, heavy):
+        modules = imported_modules("pmbuddy.cli")
+        assert "pmbuddy.cli" in modules
+        assert heavy not in modules
+
+    def test_help(self):
+        result = subprocess.run(
+            [sys.executable, "-c", "from pmbuddy.cli import main; main()", "--help"],
+            capture_output=True,
+            text=True,
+        )
+        assert result.returncode == 0
+        assert "--pmid" in result.stdout
+
+    def test_config_loads_files_on_access(self):
+        from pmbuddy.config import CONFIG, Config
+
+        config = Config()
+        assert dict.__len__(config) == 0
+        assert "urls" in config
+        assert config["urls"] == CONFIG["urls"]
+        assert config.get("missing") is None
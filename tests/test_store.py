@@ -0,0 +1,83 @@
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+
+from pmbuddy import cli  # noqa: E402
+from pmbuddy.parsers import EutilsParser  # noqa: E402
+from pmbuddy.store import ArticleStore, to_table  # noqa: E402
+
+FIXTURES = Path(__file__).parent / "fixtures"
+ARTICLES = EutilsParser().parse_efetch((FIXTURES / "efetch_pubmed.xml").read_bytes())
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ArticleStore(tmp_path / "store")
+    store.append(ARTICLES)
+    return store
+
+
+class TestArticleStore:
+    def test_to_table_dictionary_encodes_journal(self):
+        table = to_table(ARTICLES)
+        assert pa.types.is_dictionary(table.schema.field("journal").type)
+        assert pa.types.is_list(table.schema.field("authors").type)
+        assert table.num_rows == len(ARTICLES)
+
+    def test_append_skips_known_pmids(self, store):
+        assert store.append(ARTICLES) == 0
+        assert store.pmids() == {a.pmid for a in ARTICLES}
+
+    def test_query_by_journal(self, store):
+        journal = ARTICLES[0].citation.journal
+        table = store.query(journal=journal)
+        expected = {a.pmid for a in ARTICLES if a.citation.journal == journal}
+        assert set(table.column("pmid").to_pylist()) == expected
+
+    def test_query_by_year_range(self, store):
+        year = ARTICLES[0].citation.publication_date.year
+        table = store.query(year=(year, year))
+        assert set(table.column("pub_year").to_pylist()) == {year}
+
+    def test_query_by_author(self, store):
+        author = ARTICLES[0].authors[0]
+        table = store.query(author=author.split()[-1])
+        assert ARTICLES[0].pmid in table.column("pmid").to_pylist()
+
+    def test_query_selects_columns(self, store):
+        table = store.query(columns=["pmid", "title"], limit=1)
+        assert table.column_names == ["pmid", "title"]
+        assert table.num_rows == 1
+
+    def test_empty_store(self, tmp_path):
+        store = ArticleStore(tmp_path / "empty")
+        assert store.pmids() == set()
+        assert store.query().num_rows == 0
+
+
+class TestQueryCommand:
+    def test_query_writes_jsonl(self, store, monkeypatch, capsys):
+        monkeypatch.setitem(cli.CONFIG["store"], "path", str(store.path))
+        monkeypatch.setattr(
+            sys,
+            "argv",
+            ["pmb", "query", "--columns", "pmid,title", "--format", "jsonl"],
+        )
+        with pytest.raises(SystemExit) as exit:
+            cli.main()
+        assert exit.value.code == 0
+        rows = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        assert {row["pmid"] for row in rows} == {a.pmid for a in ARTICLES}
+        assert set(rows[0]) == {"pmid", "title"}
+
+    def test_query_table_without_journal(self, store, monkeypatch, capsys):
+        monkeypatch.setitem(cli.CONFIG["store"], "path", str(store.path))
+        monkeypatch.setattr(sys, "argv", ["pmb", "query", "--columns", "pmid,title"])
+        with pytest.raises(SystemExit) as exit:
+            cli.main()
+        assert exit.value.code == 0
+        assert ARTICLES[0].pmid in capsys.readouterr().out
@@ -0,0 +1,223 @@
+import asyncio
+import sys
+from datetime import date
+from pathlib import Path
+from urllib.parse import parse_qs
+
+import httpx
+import pytest
+from pytest import raises
+
+from pmbuddy import cli, watch
+from pmbuddy.cache import ArticleCache, CachedParser
+from pmbuddy.parsers import ArticleParser
+from pmbuddy.util.requests import async_client
+from pmbuddy.watch import SavedSearches, parse_esearch, search_pmids
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+class StubEutils:
+    """esearch over a few records with entry and modification dates.
+
+    Every record matches any query. Article pages are served from the
+    fixtures, and every request is logged.
+    """
+
+    def __init__(self, records):
+        # pmid -> (edat, mdat) as YYYY/MM/DD
+        self.records = records
+        self.searches = []
+        self.pages = []
+
+    def esearch(self, form):
+        hits = sorted(self.records)
+        datetype = form.get("datetype", [None])[0]
+        if datetype is not None:
+            column = 0 if datetype == "edat" else 1
+            since = form["mindate"][0]
+            hits = [p for p in hits if self.records[p][column] >= since]
+        self.searches.append((datetype, form.get("mindate", [None])[0]))
+        start, size = int(form["retstart"][0]), int(form["retmax"][0])
+        ids = "".join(f"<Id>{pmid}</Id>" for pmid in hits[start : start + size])
+        return (
+            f"<eSearchResult><Count>{len(hits)}</Count><RetMax>{size}</RetMax>"
+            f"<IdList>{ids}</IdList></eSearchResult>"
+        ).encode()
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("esearch.fcgi"):
+            form = parse_qs(request.content.decode())
+            return httpx.Response(200, content=self.esearch(form))
+        pmid = request.url.path.strip("/").split("/")[-1]
+        self.pages.append(pmid)
+        page = FIXTURES / f"pubmed_{pmid}.html"
+        if not page.is_file():
+            return httpx.Response(404, request=request)
+        return httpx.Response(200, content=page.read_bytes(), request=request)
+
+
+@pytest.fixture
+def searches(tmp_path):
+    searches = SavedSearches(tmp_path / "watch.sqlite3", overlap_days=0)
+    yield searches
+    searches.close()
+
+
+def sync(searches, stub, name, today, cache=None, **kwargs):
+    parser = ArticleParser
+    refresh_parser = ArticleParser
+    if cache is not None:
+        parser = CachedParser(ArticleParser, cache)
+        refresh_parser = CachedParser(ArticleParser, cache, refresh=True)
+
+    async def main():
+        async with async_client(transport=httpx.MockTransport(stub)) as client:
+            return await searches.sync(
+                name, parser, refresh_parser, client, today=today, **kwargs
+            )
+
+    return asyncio.run(main())
+
+
+class TestEsearch:
+    def test_parse(self):
+        content = (
+            b"<eSearchResult><Count>3</Count><IdList><Id>1</Id><Id>2</Id>"
+            b"</IdList></eSearchResult>"
+        )
+        assert parse_esearch(content) == (3, ["1", "2"])
+        with raises(ValueError):
+            parse_esearch(b"<eSearchResult><ERROR>Invalid db</ERROR></eSearchResult>")
+
+    def test_pages(self):
+        stub = StubEutils({str(i): ("2024/01/01", "2024/01/01") for i in range(10, 35)})
+
+        async def main():
+            async with async_client(transport=httpx.MockTransport(stub)) as client:
+                return await search_pmids("q", client, page_size=10)
+
+        assert asyncio.run(main()) == ([str(i) for i in range(10, 35)], False)
+        assert len(stub.searches) == 3
+
+
+class TestSavedSearches:
+    def test_add_list_remove(self, searches):
+        searches.add("retina", "zebrafish retina")
+        searches.add("mangrove", "mangrove", since=date(2024, 5, 1))
+        assert [(s.name, s.synced_on) for s in searches.list()] == [
+            ("mangrove", "2024/05/01"),
+            ("retina", None),
+        ]
+        assert searches.remove("retina")
+        assert not searches.remove("retina")
+        with raises(KeyError):
+            searches.get("retina")
+
+    def test_delta_sync(self, searches, tmp_path):
+        stub = StubEutils({"38697854": ("2024/05/01", "2024/05/01")})
+        cache = ArticleCache(tmp_path / "cache.sqlite3")
+        searches.add("q", "anything")
+
+        # The first sync is a full search.
+        result = sync(searches, stub, "q", date(2024, 5, 2), cache)
+        assert (result.new, result.modified, result.since) == (1, 0, None)
+        assert stub.pages == ["38697854"]
+        assert searches.get("q").synced_on == "2024/05/02"
+
+        # One new record and one modified record since the last sync.
+        stub.records["39096902"] = ("2024/05/03", "2024/05/03")
+        stub.records["38697854"] = ("2024/05/01", "2024/05/03")
+        stub.pages.clear()
+        stub.searches.clear()
+        result = sync(searches, stub, "q", date(2024, 5, 4), cache)
+        assert stub.searches == [("edat", "2024/05/02"), ("mdat", "2024/05/02")]
+        assert (result.new, result.modified, result.failed) == (1, 1, 0)
+        assert sorted(stub.pages) == ["38697854", "39096902"]
+        assert searches.get("q").hits == 2
+
+        # Nothing changed: nothing is fetched.
+        stub.pages.clear()
+        result = sync(searches, stub, "q", date(2024, 5, 5), cache)
+        assert (result.new, result.modified, result.searched) == (0, 0, 0)
+        assert stub.pages == []
+
+    def test_failures_are_retried(self, searches):
+        stub = StubEutils(
+            {
+                "38697854": ("2024/05/01", "2024/05/01"),
+                "11111111": ("2024/05/01", "2024/05/01"),
+            }
+        )
+        searches = SavedSearches(searches.path, overlap_days=0, max_attempts=2)
+        searches.add("q", "anything", since=date(2024, 5, 1))
+        articles = []
+        result = sync(searches, stub, "q", date(2024, 5, 2), on_article=articles.append)
+        assert (result.new, result.failed) == (1, 1)
+        assert [a.pmid for a in articles] == ["38697854"]
+        # The mark advances; the failed PMID waits in the retry table.
+        assert searches.get("q").synced_on == "2024/05/02"
+        assert searches.retries("q") == {"11111111": "new"}
+
+        # Outside the new window, only the failed PMID is fetched again, and
+        # after its last attempt it is given up.
+        stub.pages.clear()
+        result = sync(searches, stub, "q", date(2024, 5, 3))
+        assert (result.new, result.retried, result.failed) == (0, 1, 1)
+        assert stub.pages == ["11111111"]
+        assert searches.retries("q") == {}
+
+    def test_hits_are_recorded_as_they_arrive(self, searches):
+        stub = StubEutils(
+            {
+                "38697854": ("2024/05/01", "2024/05/01"),
+                "39096902": ("2024/05/01", "2024/05/01"),
+            }
+        )
+        searches.add("q", "anything")
+        delivered = []
+
+        def interrupt(article):
+            if delivered:
+                raise KeyboardInterrupt
+            delivered.append(article.pmid)
+
+        with raises(KeyboardInterrupt):
+            sync(searches, stub, "q", date(2024, 5, 2), on_article=interrupt)
+        assert searches.fetched("q", ["38697854", "39096902"]) == set(delivered)
+        assert searches.get("q").synced_on is None
+
+    def test_truncated_search_keeps_the_mark(self, searches, monkeypatch):
+        monkeypatch.setattr(watch, "MAX_HITS", 1)
+        stub = StubEutils(
+            {
+                "38697854": ("2024/05/01", "2024/05/01"),
+                "39096902": ("2024/05/01", "2024/05/01"),
+            }
+        )
+        searches.add("q", "anything", since=date(2024, 5, 1))
+        result = sync(searches, stub, "q", date(2024, 5, 2))
+        assert result.truncated
+        assert result.new == 1
+        assert searches.get("q").synced_on == "2024/05/01"
+
+
+class TestWatchCommand:
+    def test_add_and_list(self, tmp_path, monkeypatch, capsys):
+        monkeypatch.setitem(
+            cli.CONFIG, "watch", {"path": str(tmp_path / "watch.sqlite3")}
+        )
+        for argv in (
+            ["pmb", "watch", "add", "retina", "zebrafish retina"],
+            ["pmb", "watch", "list"],
+        ):
+            monkeypatch.setattr(sys, "argv", argv)
+            with raises(SystemExit) as e:
+                cli.main()
+            assert e.value.code == 0
+        assert capsys.readouterr().out == "retina\tzebrafish retina\tnever\t0\n"
+
+        monkeypatch.setattr(sys, "argv", ["pmb", "watch", "run", "missing"])
+        with raises(SystemExit) as e:
+            cli.main()
+        assert e.value.code == 2
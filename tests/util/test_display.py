@@ -0,0 +1,100 @@
+import io
+
+import pandas as pd
+from rich.console import Console
+
+from pmbuddy.util import format_name
+from pmbuddy.util.display import (
+    display_multiple_abstracts,
+    display_single_abstract,
+    display_table,
+    format_authors,
+    pages,
+)
+
+AUTHORS = [["Steve Jobs", "Ada M Lovelace"], [], None, ["Solo"]]
+
+
+def frame(n):
+    return pd.DataFrame(
+        {
+            "pmid": [str(i) for i in range(n)],
+            "title": [f"Title {i}" for i in range(n)],
+            "authors": [["Jane Doe"]] * n,
+            "journal": ["Cell Rep"] * n,
+        }
+    )
+
+
+class TestFormatAuthors:
+    def test_matches_format_name(self):
+        expected = [", ".join(map(format_name, names or [])) for names in AUTHORS]
+        assert format_authors(pd.Series(AUTHORS)).tolist() == expected
+
+    def test_keeps_index(self):
+        series = pd.Series(AUTHORS, index=[10, 11, 12, 13])
+        assert format_authors(series).index.tolist() == [10, 11, 12, 13]
+
+    def test_no_authors(self):
+        assert format_authors(pd.Series([None, []])).tolist() == ["", ""]
+
+
+class TestDisplayTable:
+    def test_pages(self):
+        assert list(pages(5, 2)) == [slice(0, 2), slice(2, 4), slice(4, 6)]
+        assert list(pages(0, 2)) == [slice(0, 2)]
+        assert list(pages(3, None)) == [slice(0, 3)]
+
+    def test_does_not_modify_frame(self):
+        df = frame(2)
+        display_table(
+            df, ["pmid", "title", "authors", "journal"], Console(file=io.StringIO())
+        )
+        assert df["authors"][0] == ["Jane Doe"]
+
+    def test_numbers_rows_across_pages(self):
+        out = io.StringIO()
+        display_table(
+            frame(5),
+            ["pmid", "title", "authors"],
+            Console(file=out, width=120),
+            page_rows=2,
+        )
+        text = out.getvalue()
+        assert text.count("PubMed Articles") == 3
+        assert "Title 4" in text
+        assert "Doe J" in text
+
+    def test_stops_when_reader_quits(self, monkeypatch):
+        out = io.StringIO()
+        console = Console(file=out, width=120, force_terminal=True)
+        monkeypatch.setattr(console, "input", lambda prompt: "q")
+        display_table(frame(5), ["pmid", "title"], console, page_rows=2)
+        text = out.getvalue()
+        assert "Title 1" in text
+        assert "Title 2" not in text
+
+
+class TestDisplayAbstracts:
+    def abstracts(self, authors):
+        n = len(authors)
+        return pd.DataFrame(
+            {
+                "title": [f"Title {i}" for i in range(n)],
+                "authors": authors,
+                "abstract": ["Text"] * n,
+                "doi": ["10.1000/x"] * n,
+            }
+        )
+
+    def test_missing_authors(self):
+        out = io.StringIO()
+        df = self.abstracts([["Jane Doe", "John Roe"], [], None])
+        display_multiple_abstracts(df, Console(file=out, width=120))
+        text = out.getvalue()
+        assert "Jane Doe et al." in text
+        assert text.count("Unknown authors") == 2
+
+        out = io.StringIO()
+        display_single_abstract(self.abstracts([None]), Console(file=out, width=120))
+        assert "Unknown authors" in out.getvalue()
@@ -0,0 +1,139 @@
+import json
+from pathlib import Path
+
+from pmbuddy.models import Author
+from pmbuddy.parsers import EutilsParser
+from pmbuddy.util import NOT_AVAILABLE
+from pmbuddy.util.export import (
+    bibtex_entry,
+    bibtex_escape,
+    bibtex_name,
+    csl_item,
+    month_number,
+    ris_entry,
+)
+
+FIXTURES = Path(__file__).parents[1] / "fixtures"
+ARTICLES = EutilsParser().parse_efetch((FIXTURES / "efetch_pubmed.xml").read_bytes())
+
+
+def tricky_article():
+    """An article whose fields contain characters special to every format."""
+    citation = ARTICLES[1].citation.model_copy(update={"doi": "10.1000/a_b{c}"})
+    return ARTICLES[1].model_copy(
+        update={
+            "title": 'Costs & 50% of {C_2} "tax" ~ #1 \\ $x^2$',
+            "abstract": "First line.\r\nSecond  line.",
+            "citation": citation,
+        }
+    )
+
+
+def sparse_article():
+    """An article outside PMC whose page had no DOI, abstract or journal."""
+    citation = ARTICLES[0].citation.model_copy(
+        update={"doi": NOT_AVAILABLE, "journal": NOT_AVAILABLE}
+    )
+    return ARTICLES[0].model_copy(
+        update={
+            "pmcid": NOT_AVAILABLE,
+            "abstract": NOT_AVAILABLE,
+            "citation": citation,
+        }
+    )
+
+
+class TestHelpers:
+    def test_month_number(self):
+        assert month_number("May") == 5
+        assert month_number("August") == 8
+        assert month_number("08") == 8
+        assert month_number(12) == 12
+        assert month_number("Spring") is None
+        assert month_number(None) is None
+
+    def test_bibtex_escape(self):
+        assert bibtex_escape("a & b_c") == r"a \& b\_c"
+        assert bibtex_escape("{x}\n ~") == r"\{x\} \~{}"
+        assert bibtex_escape("\\") == r"\textbackslash{}"
+
+    def test_bibtex_names(self):
+        assert bibtex_name(Author.from_name("Maria A Reyes")) == "Reyes, Maria A"
+        group = Author(last_name="Smith and Jones Group", collective=True)
+        assert bibtex_name(group) == "{Smith and Jones Group}"
+        odd = Author(last_name="Sand and Stone", fore_name="Ana")
+        assert bibtex_name(odd) == "{Sand and Stone}, Ana"
+
+
+class TestBibtex:
+    def test_entry(self):
+        entry = bibtex_entry(ARTICLES[1])
+        assert entry.startswith("@article{pmid39096902,\n")
+        assert entry.endswith("}\n\n")
+        assert (
+            "  author = {Fernandez, Lucia and Mehta, Arjun and "
+            "{Mangrove Microbiome Consortium}}," in entry
+        )
+        assert "  month = aug," in entry
+        assert "  pages = {301--309}," in entry
+        assert "  pmcid = {PMC11302117}," in entry
+
+    def test_escaping(self):
+        entry = bibtex_entry(tricky_article())
+        assert (
+            r"  title = {Costs \& 50\% of \{C\_2\} "
+            r'"tax" \~{} \#1 \textbackslash{} \$x\^{}2\$},' in entry
+        )
+        assert "  doi = {10.1000/a_bc}," in entry
+        assert "  abstract = {First line. Second line.}," in entry
+        # Braces in every field value are balanced.
+        for line in entry.splitlines()[1:-2]:
+            value = line.replace("\\{", "").replace("\\}", "")
+            assert value.count("{") == value.count("}"), line
+
+
+class TestRis:
+    def test_entry(self):
+        lines = ris_entry(ARTICLES[1]).splitlines()
+        assert lines[0] == "TY  - JOUR"
+        assert lines[1:4] == [
+            "AU  - Fernandez, Lucia",
+            "AU  - Mehta, Arjun",
+            "AU  - Mangrove Microbiome Consortium",
+        ]
+        assert "DA  - 2024/08/07/" in lines
+        assert "SP  - 301" in lines
+        assert "C2  - PMC11302117" in lines
+        assert lines[-2:] == ["ER  - ", ""]
+
+    def test_values_stay_on_one_line(self):
+        lines = ris_entry(tricky_article()).splitlines()
+        assert "AB  - First line. Second line." in lines
+        assert all(line[:2].isalnum() and line[2:6] == "  - " for line in lines[:-1])
+
+
+class TestCslJson:
+    def test_item(self):
+        item = csl_item(ARTICLES[1])
+        assert item["id"] == "39096902"
+        assert item["type"] == "article-journal"
+        assert item["author"][0] == {"family": "Fernandez", "given": "Lucia"}
+        assert item["author"][2] == {"literal": "Mangrove Microbiome Consortium"}
+        assert item["issued"] == {"date-parts": [[2024, 8, 7]]}
+        assert item["page"] == "301-309"
+        assert item["DOI"] == "10.1038/s41586-024-07711-8"
+        assert json.loads(json.dumps(csl_item(tricky_article())))["title"].startswith(
+            "Costs &"
+        )
+
+
+class TestPlaceholders:
+    def test_placeholders_are_omitted(self):
+        article = sparse_article()
+        for entry in (bibtex_entry(article), ris_entry(article)):
+            assert NOT_AVAILABLE not in entry
+        assert "year = {2024}" in bibtex_entry(article)
+        assert "PY  - 2024" in ris_entry(article)
+        item = csl_item(article)
+        assert not {"DOI", "PMCID", "abstract", "container-title"} & set(item)
+        assert item["PMID"] == "38697854"
@@ -0,0 +1,141 @@
+import asyncio
+
+from pytest import raises
+
+from pmbuddy.util.inflight import CoalescingParser, InFlight
+
+
+class SlowParser:
+    """Counts fetches and holds them until `release` is set."""
+
+    def __init__(self) -> None:
+        self.calls = []
+        self.release = asyncio.Event()
+
+    async def fetch_article_async(self, locator: str, client, revalidate=False):
+        self.calls.append(locator)
+        await self.release.wait()
+        if locator == "0":
+            raise ValueError("bad article")
+        return f"article {locator}"
+
+    def fetch_from_ids(self, ids):
+        return [f"article {id}" for id in ids]
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+class TestCoalescingParser:
+    def test_concurrent_callers_share_one_fetch(self):
+        async def run():
+            parser = SlowParser()
+            coalescing = CoalescingParser(parser)
+            calls = [
+                asyncio.ensure_future(coalescing.fetch_article_async(pmid, None))
+                for pmid in ["38697854", "38697854", "39096902", "38697854"]
+            ]
+            await settle()
+            parser.release.set()
+            results = await asyncio.gather(*calls)
+            return parser, coalescing, results
+
+        parser, coalescing, results = asyncio.run(run())
+        assert parser.calls == ["38697854", "39096902"]
+        assert results[0] == results[1] == results[3] == "article 38697854"
+        assert coalescing.inflight.started == 2
+        assert coalescing.inflight.coalesced == 2
+        assert len(coalescing.inflight) == 0
+
+    def test_finished_fetches_are_not_reused(self):
+        async def run():
+            parser = SlowParser()
+            parser.release.set()
+            coalescing = CoalescingParser(parser)
+            await coalescing.fetch_article_async("38697854", None)
+            await coalescing.fetch_article_async("38697854", None)
+            return parser
+
+        assert asyncio.run(run()).calls == ["38697854", "38697854"]
+
+    def test_keyword_arguments_are_part_of_the_key(self):
+        async def run():
+            parser = SlowParser()
+            coalescing = CoalescingParser(parser)
+            calls = [
+                asyncio.ensure_future(coalescing.fetch_article_async("1", None)),
+                asyncio.ensure_future(
+                    coalescing.fetch_article_async("1", None, revalidate=True)
+                ),
+            ]
+            await settle()
+            parser.release.set()
+            await asyncio.gather(*calls)
+            return parser
+
+        assert asyncio.run(run()).calls == ["1", "1"]
+
+    def test_errors_reach_every_caller(self):
+        async def run():
+            parser = SlowParser()
+            coalescing = CoalescingParser(parser)
+            calls = [
+                asyncio.ensure_future(coalescing.fetch_article_async("0", None))
+                for _ in range(3)
+            ]
+            await settle()
+            parser.release.set()
+            return parser, await asyncio.gather(*calls, return_exceptions=True)
+
+        parser, results = asyncio.run(run())
+        assert parser.calls == ["0"]
+        assert all(isinstance(r, ValueError) for r in results)
+
+    def test_cancelled_caller_does_not_cancel_others(self):
+        async def run():
+            parser = SlowParser()
+            coalescing = CoalescingParser(parser)
+            first = asyncio.ensure_future(coalescing.fetch_article_async("1", None))
+            second = asyncio.ensure_future(coalescing.fetch_article_async("1", None))
+            await settle()
+            first.cancel()
+            await settle()
+            parser.release.set()
+            return first, await second
+
+        first, result = asyncio.run(run())
+        assert first.cancelled()
+        assert result == "article 1"
+
+    def test_other_attributes_pass_through(self):
+        assert CoalescingParser(SlowParser()).fetch_from_ids(["1"]) == ["article 1"]
+
+
+class TestInFlight:
+    def test_run_returns_the_shared_result(self):
+        async def run():
+            inflight = InFlight()
+            started = []
+
+            async def work():
+                started.append(1)
+                await asyncio.sleep(0.01)
+                return 42
+
+            results = await asyncio.gather(
+                *(inflight.run("key", work) for _ in range(10))
+            )
+            return started, results
+
+        started, results = asyncio.run(run())
+        assert started == [1]
+        assert results == [42] * 10
+
+    def test_run_propagates_exceptions(self):
+        async def fail():
+            raise KeyError("missing")
+
+        with raises(KeyError):
+            asyncio.run(InFlight().run("key", fail))
@@ -0,0 +1,78 @@
+import csv
+import gzip
+import io
+import json
+from pathlib import Path
+
+from pytest import raises
+
+from pmbuddy.parsers import EutilsParser
+from pmbuddy.util.output import FIELDS, ArticleWriter, gzip_text, open_output
+
+FIXTURES = Path(__file__).parents[1] / "fixtures"
+ARTICLES = EutilsParser().parse_efetch((FIXTURES / "efetch_pubmed.xml").read_bytes())
+
+
+class TestArticleWriter:
+    def test_jsonl(self):
+        handle = io.StringIO()
+        writer = ArticleWriter(handle, "jsonl")
+        for article in ARTICLES:
+            writer.write(article)
+        lines = handle.getvalue().splitlines()
+        assert len(lines) == writer.count == 2
+        record = json.loads(lines[0])
+        assert record["pmid"] == "38697854"
+        assert record["authors"] == ARTICLES[0].authors
+
+    def test_tsv(self):
+        handle = io.StringIO()
+        writer = ArticleWriter(handle, "tsv")
+        for article in ARTICLES:
+            writer.write(article)
+        rows = list(csv.DictReader(io.StringIO(handle.getvalue()), delimiter="\t"))
+        assert list(rows[0]) == FIELDS
+        assert rows[1]["authors"].split("; ") == ARTICLES[1].authors
+
+    def test_header_written_once(self):
+        handle = io.StringIO()
+        writer = ArticleWriter(handle, "csv")
+        writer.write(ARTICLES[0])
+        writer.write(ARTICLES[0])
+        assert handle.getvalue().count("pmid,pmcid") == 1
+
+    def test_unknown_format(self):
+        with raises(ValueError):
+            ArticleWriter(io.StringIO(), "xml")
+
+    def test_csl_json_is_one_array(self):
+        handle = io.StringIO()
+        writer = ArticleWriter(handle, "csl-json")
+        for article in ARTICLES:
+            writer.write(article)
+        writer.close()
+        items = json.loads(handle.getvalue())
+        assert [item["PMID"] for item in items] == [a.pmid for a in ARTICLES]
+
+        handle = io.StringIO()
+        ArticleWriter(handle, "csl-json").close()
+        assert json.loads(handle.getvalue()) == []
+
+    def test_citation_formats_need_articles(self):
+        writer = ArticleWriter(io.StringIO(), "bibtex")
+        with raises(ValueError):
+            writer.write_row({"pmid": "38697854"})
+
+    def test_gzip(self, tmp_path):
+        path = tmp_path / "articles.ris.gz"
+        with open(path, "wb") as raw:
+            handle = gzip_text(raw)
+            writer = ArticleWriter(handle, "ris", flush=False)
+            for article in ARTICLES:
+                writer.write(article)
+            writer.close()
+            handle.close()
+        with open_output(path, "a", compress=True) as handle:
+            ArticleWriter(handle, "ris").write(ARTICLES[0])
+        with gzip.open(path, "rt") as handle:
+            assert handle.read().count("TY  - JOUR") == 3
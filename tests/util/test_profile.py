@@ -0,0 +1,132 @@
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+import httpx
+import pytest
+from pytest import raises
+
+from pmbuddy import cli
+from pmbuddy.util import profile, requests
+from pmbuddy.util.profile import NO_SPAN, Profiler, count, set_profiler, span
+from pmbuddy.util.requests import async_client, content_from_url_async
+
+FIXTURES = Path(__file__).parents[1] / "fixtures"
+
+
+@pytest.fixture
+def profiler():
+    profiler = Profiler()
+    set_profiler(profiler)
+    yield profiler
+    set_profiler(None)
+
+
+class TestHooks:
+    def test_disabled_hooks_are_no_ops(self):
+        assert profile.PROFILER is None
+        assert span("fetch", url="x") is NO_SPAN
+        count("http.bytes", 10)
+        with span("parse.tree"):
+            pass
+
+    def test_spans_and_counters(self, profiler):
+        with span("article", id="1"):
+            with span("parse.tree"):
+                pass
+            count("http.bytes", 100)
+            count("http.bytes", 50)
+        stages = profiler.stages()
+        assert set(stages) == {"article", "parse.tree"}
+        assert stages["article"]["calls"] == 1
+        assert stages["article"]["total_ms"] >= stages["parse.tree"]["total_ms"]
+        assert profiler.counters["http.bytes"] == 150
+        summary = profiler.summary()
+        assert "parse.tree" in summary
+        assert "http.bytes=150" in summary
+
+    def test_span_records_on_error(self, profiler):
+        with raises(ValueError):
+            with span("model"):
+                raise ValueError
+        assert profiler.stages()["model"]["calls"] == 1
+
+    def test_chrome_trace(self, profiler, tmp_path):
+        with span("fetch", url="https://example.org"):
+            pass
+        count("cache.hits")
+        profiler.write_trace(tmp_path / "trace.json")
+        trace = json.loads((tmp_path / "trace.json").read_text())
+        [event] = trace["traceEvents"]
+        assert event["name"] == "fetch"
+        assert event["ph"] == "X"
+        assert event["cat"] == "fetch"
+        assert event["args"] == {"url": "https://example.org"}
+        assert event["dur"] >= 0
+        assert trace["otherData"]["counters"] == {"cache.hits": 1}
+
+    def test_http_trace_phases(self, profiler):
+        trace = profiler.http_trace()
+        for event in [
+            "connection.connect_tcp.started",
+            "connection.connect_tcp.complete",
+            "http11.receive_response_headers.started",
+            "http11.receive_response_headers.complete",
+            "http11.response_closed.started",
+            "http11.response_closed.complete",
+        ]:
+            trace(event, {})
+        assert set(profiler.stages()) == {"http.connect", "http.wait"}
+
+    def test_concurrent_tasks_get_their_own_track(self, profiler):
+        async def work():
+            with span("article"):
+                await asyncio.sleep(0.01)
+
+        async def run():
+            await asyncio.gather(work(), work())
+
+        asyncio.run(run())
+        tracks = {event["tid"] for event in profiler.trace()["traceEvents"]}
+        assert len(tracks) == 2
+
+
+class TestInstrumentedFetch:
+    def test_fetch_records_bytes_and_retries(self, profiler):
+        responses = iter([503, 200])
+
+        def server(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(next(responses), content=b"<html></html>")
+
+        async def run():
+            transport = httpx.MockTransport(server)
+            async with async_client(transport=transport) as client:
+                return await content_from_url_async("https://example.org/1/", client)
+
+        assert asyncio.run(run()) == b"<html></html>"
+        assert profiler.stages()["fetch"]["calls"] == 1
+        assert profiler.counters["http.retries"] == 1
+        assert profiler.counters["http.bytes"] == len(b"<html></html>")
+
+    def test_cli_profile(self, monkeypatch, capsys, tmp_path):
+        async def fake_content(url: str, client, revalidate=False) -> bytes:
+            pmid = url.rstrip("/").split("/")[-1]
+            return (FIXTURES / f"pubmed_{pmid}.html").read_bytes()
+
+        monkeypatch.setattr(requests, "content_from_url_async", fake_content)
+        trace = tmp_path / "trace.json"
+        argv = ["pmb", "--no-cache", "--pmid", "38697854", "--trace", str(trace)]
+        monkeypatch.setattr(sys, "argv", argv)
+        monkeypatch.setattr(sys.stdin, "isatty", lambda: True)
+        with raises(SystemExit) as e:
+            cli.main()
+        assert e.value.code == 0
+        assert profile.PROFILER is None
+        err = capsys.readouterr().err
+        for stage in ["article", "parse.tree", "parse.extract", "model", "display"]:
+            assert stage in err
+        names = {
+            event["name"] for event in json.loads(trace.read_text())["traceEvents"]
+        }
+        assert {"article", "model", "display.render"} <= names
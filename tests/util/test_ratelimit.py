@@ -0,0 +1,113 @@
+import asyncio
+import time
+
+import httpx
+from pytest import raises
+
+from pmbuddy.util import ratelimit
+from pmbuddy.util.ratelimit import (
+    RetryPolicy,
+    TokenBucket,
+    parse_retry_after,
+    send_with_retry,
+    send_with_retry_async,
+)
+
+
+class FlakyServer:
+    """Answers with the given statuses in turn, then with 200."""
+
+    def __init__(self, *statuses, headers=None):
+        self.statuses = list(statuses)
+        self.headers = headers or {}
+        self.calls = 0
+
+    def __call__(self, request):
+        self.calls += 1
+        if self.statuses:
+            return httpx.Response(self.statuses.pop(0), headers=self.headers)
+        return httpx.Response(200, text="ok")
+
+
+class TestTokenBucket:
+    def test_burst_then_wait(self):
+        bucket = TokenBucket(rate=10, burst=2)
+        assert bucket.reserve() == 0.0
+        assert bucket.reserve() == 0.0
+        assert 0.05 < bucket.reserve() <= 0.1
+
+    def test_adapts_rate(self):
+        bucket = TokenBucket(rate=10, burst=1)
+        bucket.penalize()
+        assert bucket.rate == 5
+        for _ in range(100):
+            bucket.reward()
+        assert bucket.rate == 10
+
+
+class TestRetry:
+    def test_retries_transient_errors(self):
+        server = FlakyServer(503, 429)
+        client = httpx.Client(transport=httpx.MockTransport(server))
+        res = send_with_retry(lambda: client.get("https://example.org"))
+        assert res.status_code == 200
+        assert server.calls == 3
+        assert ratelimit.LIMITER.rate < 10_000
+
+    def test_gives_up_after_max_retries(self):
+        server = FlakyServer(500, 500, 500, 500, 500)
+        client = httpx.Client(transport=httpx.MockTransport(server))
+        res = send_with_retry(lambda: client.get("https://example.org"))
+        assert res.status_code == 500
+        assert server.calls == 4
+
+    def test_does_not_retry_client_errors(self):
+        server = FlakyServer(404)
+        client = httpx.Client(transport=httpx.MockTransport(server))
+        assert send_with_retry(lambda: client.get("https://x")).status_code == 404
+        assert server.calls == 1
+
+    def test_transport_errors_reraised(self):
+        def fail(request):
+            raise httpx.ConnectError("refused")
+
+        client = httpx.Client(transport=httpx.MockTransport(fail))
+        with raises(httpx.ConnectError):
+            send_with_retry(lambda: client.get("https://example.org"))
+
+    def test_async_honours_retry_after(self):
+        server = FlakyServer(429, headers={"Retry-After": "0.05"})
+
+        async def main():
+            transport = httpx.MockTransport(server)
+            async with httpx.AsyncClient(transport=transport) as client:
+                start = time.perf_counter()
+                res = await send_with_retry_async(lambda: client.get("https://x"))
+                return res, time.perf_counter() - start
+
+        res, elapsed = asyncio.run(main())
+        assert res.status_code == 200
+        assert elapsed >= 0.05
+
+
+class TestRetryAfter:
+    def test_seconds(self):
+        assert parse_retry_after("2") == 2.0
+
+    def test_http_date(self):
+        assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+    def test_invalid(self):
+        assert parse_retry_after("soon") is None
+
+    def test_policy_caps_backoff_not_retry_after(self):
+        policy = RetryPolicy(backoff_base=1, backoff_max=4, retry_after_max=300)
+        assert policy.delay(0, "120") == 120
+        assert policy.delay(0, "3600") is None
+        assert 0 <= policy.delay(10) <= 4
+
+    def test_gives_up_on_long_retry_after(self):
+        server = FlakyServer(429, headers={"Retry-After": "3600"})
+        client = httpx.Client(transport=httpx.MockTransport(server))
+        assert send_with_retry(lambda: client.get("https://x")).status_code == 429
+        assert server.calls == 1
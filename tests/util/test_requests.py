@@ -0,0 +1,117 @@
+import asyncio
+from pathlib import Path
+
+import httpx
+
+from pmbuddy.parsers import ArticleParser
+from pmbuddy.util.requests import (
+    async_client,
+    batched,
+    fetch_articles_async,
+    stream_articles_async,
+)
+
+FIXTURES = Path(__file__).parents[1] / "fixtures"
+
+
+class FixtureHandler:
+    """Serves recorded PubMed pages and tracks peak concurrency."""
+
+    def __init__(self, delay: float = 0.01):
+        self.delay = delay
+        self.in_flight = 0
+        self.peak = 0
+        self.requests = 0
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(self.delay)
+        self.in_flight -= 1
+        pmid = request.url.path.strip("/")
+        path = FIXTURES / f"pubmed_{pmid}.html"
+        if not path.exists():
+            return httpx.Response(404)
+        return httpx.Response(200, content=path.read_bytes())
+
+
+class TestFetchArticlesAsync:
+    pmids = ["38697854", "39096902"] * 5
+
+    def run(self, handler, concurrency):
+        async def main():
+            transport = httpx.MockTransport(handler)
+            async with async_client(transport=transport) as client:
+                return await fetch_articles_async(
+                    ArticleParser, self.pmids, concurrency=concurrency, client=client
+                )
+
+        return asyncio.run(main())
+
+    def test_preserves_order(self):
+        handler = FixtureHandler()
+        articles = self.run(handler, concurrency=4)
+        assert [a.pmid for a in articles] == self.pmids
+        assert handler.requests == len(self.pmids)
+
+    def test_concurrency_limit(self):
+        """No more than `concurrency` requests are in flight at once."""
+        handler = FixtureHandler()
+        self.run(handler, concurrency=3)
+        assert handler.peak == 3
+
+    def test_malformed_page_is_skipped(self, capsys):
+        class MalformedParser:
+            async def fetch_article_async(self, pmid, client):
+                if pmid == "39096902":
+                    raise IndexError("list index out of range")
+                return await ArticleParser.fetch_article_async(pmid, client)
+
+        async def main():
+            transport = httpx.MockTransport(FixtureHandler())
+            async with async_client(transport=transport) as client:
+                return await fetch_articles_async(
+                    MalformedParser(), self.pmids, client=client
+                )
+
+        articles = asyncio.run(main())
+        assert [a.pmid for a in articles] == ["38697854"] * 5
+        assert "IndexError" in capsys.readouterr().err
+
+    def test_client_uses_config_headers(self):
+        client = async_client()
+        assert client.headers["Connection"] == "keep-alive"
+        asyncio.run(client.aclose())
+
+
+class TestStreamArticlesAsync:
+    def test_streams_lazily(self):
+        """PMIDs are consumed lazily and no more than `concurrency` are pending."""
+        handler = FixtureHandler()
+        consumed = []
+
+        def pmids():
+            for pmid in ["38697854", "39096902"] * 10:
+                consumed.append(pmid)
+                yield pmid
+
+        async def main():
+            transport = httpx.MockTransport(handler)
+            async with async_client(transport=transport) as client:
+                stream = stream_articles_async(
+                    ArticleParser, pmids(), concurrency=4, client=client
+                )
+                first = await anext(stream)
+                n_consumed = len(consumed)
+                rest = [a async for a in stream]
+                return first, n_consumed, rest
+
+        first, n_consumed, rest = asyncio.run(main())
+        assert first.pmid in ("38697854", "39096902")
+        assert n_consumed == 4
+        assert len(rest) == 19
+        assert handler.peak <= 4
+
+    def test_batched(self):
+        assert list(batched(iter("abcde"), 2)) == [["a", "b"], ["c", "d"], ["e"]]
@@ -1,6 +1,10 @@
 from pytest import raises
 from pmbuddy.util.validation import (
     FormatError,
+    canonical_doi,
+    canonical_id,
+    normalize_ids,
+    validate_orcid,
     validate_pmid,
     validate_pmcid,
 )
@@ -14,10 +18,55 @@ class TestValidation:
 
     def test_pmid_validation(self):
         assert validate_pmid(self.valid_pmid) == self.valid_pmid
+        assert validate_pmid("123456") == "123456"
         with raises(FormatError):
             validate_pmid(self.invalid_pmid)
 
     def test_pmcid_validation(self):
         assert validate_pmcid(self.valid_pmcid) == self.valid_pmcid
+        assert validate_pmcid("PMC11065001") == "PMC11065001"
         with raises(FormatError):
             validate_pmcid(self.invalid_pmcid)
+
+    def test_orcid_validation(self):
+        assert validate_orcid("0000-0002-1825-0097") == "0000-0002-1825-0097"
+        assert validate_orcid("https://orcid.org/0000-0002-1694-233X") == (
+            "0000-0002-1694-233X"
+        )
+        with raises(FormatError):
+            validate_orcid("0000-0002-1825")
+
+
+class TestNormalization:
+    def test_canonical_id(self):
+        assert canonical_id(" 38697854\n") == "38697854"
+        assert canonical_id("PMID: 38697854") == "38697854"
+        assert canonical_id("pmid38697854") == "38697854"
+        assert canonical_id("00123456") == "123456"
+        assert canonical_id("pmc11065001") == "PMC11065001"
+        url = "https://pubmed.ncbi.nlm.nih.gov/38697854/"
+        assert canonical_id(url) == url
+
+    def test_canonical_id_rejects_malformed(self):
+        for locator in ["3891GH12", "123456789", "0", "PMC12", "doi:10.1/x", ""]:
+            with raises(FormatError):
+                canonical_id(locator)
+
+    def test_canonical_doi(self):
+        assert (
+            canonical_doi("10.1038/s41586-024-07711-8") == "10.1038/s41586-024-07711-8"
+        )
+        assert canonical_doi("doi: 10.1000/ABC") == "10.1000/ABC"
+        assert canonical_doi("https://doi.org/10.1000/a(b)") == "10.1000/a(b)"
+        for locator in ["38697854", "10.12/x", "doi:", "10.1000/a b"]:
+            with raises(FormatError):
+                canonical_doi(locator)
+
+    def test_normalize_ids_dedupes_in_order(self):
+        lines = ["39096902\n", "\n", "38697854", "PMID:39096902", "  ", "038697854"]
+        assert normalize_ids(lines) == ["39096902", "38697854"]
+
+    def test_normalize_ids_reports_every_bad_line(self):
+        lines = ["38697854", "abc", "39096902", "1234-5678"]
+        with raises(FormatError, match="line 2: 'abc', line 4: '1234-5678'"):
+            normalize_ids(lines)